@@ -1,11 +1,19 @@
 from deap import base, algorithms
 from deap import creator
 from deap import tools
-import algelitism
 import random
 import matplotlib.pyplot as plt
-import numpy as np
 import gym
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+import parallel
+import checkpoint
+import evolution
+import fitnesscache
+import selection
+import streamstats
+import mountaincar
 
 env = gym.make('MountainCar-v0')
 
@@ -17,6 +25,13 @@ P_CROSSOVER = 0.9       # вероятность скрещивания
 P_MUTATION = 0.2        # вероятность мутации индивидуума
 MAX_GENERATIONS = 150    # максимальное количество поколений
 HALL_OF_FAME_SIZE = 3
+CACHE_SIZE = 10000      # количество запоминаемых результатов симуляции
+NUM_OF_PROCESSES = 1    # количество процессов для оценки приспособленности (1 - без пула процессов)
+VECTORIZED = True       # симуляция всей популяции сразу (mountaincar) вместо шагов gym для каждого индивида
+# файл снимков, например os.path.join(os.path.dirname(os.path.abspath(__file__)), "car-checkpoint.npz");
+# None - без снимков
+CHECKPOINT_FILE = None
+CHECKPOINT_FREQUENCY = 5  # количество поколений между снимками
 
 hof = tools.HallOfFame(HALL_OF_FAME_SIZE)
 
@@ -37,12 +52,14 @@ population = toolbox.populationCreator(n=POPULATION_SIZE)
 
 def getCarScore(individual):
     FLAG_LOCATION = 0.5
-    observation = env.reset()
+    # в рабочем процессе пула используется его собственная среда, в основном процессе - общая:
+    carEnv = parallel.getWorkerObject("env", env)
+    observation = carEnv.reset()
     actionCounter = 0
 
     for action in individual:
         actionCounter += 1
-        result = env.step(action)
+        result = carEnv.step(action)
         observation = result[0]
         reward = result[1]
         done = result[2]  # Если нужно
@@ -60,24 +77,61 @@ def getCarScore(individual):
 
 
 toolbox.register("evaluate", getCarScore)
-toolbox.register("select", tools.selTournament, tournsize = 2)
+toolbox.register("select", selection.selTournament, tournsize = 2)
 toolbox.register("mate", tools.cxTwoPoint)
 toolbox.register("mutate", tools.mutUniformInt, low = 0, up = 2, indpb = 1.0 / LENGTH_CHROM)
 
-stats = tools.Statistics(lambda ind: ind.fitness.values)
-stats.register("min", np.min)
-stats.register("avg", np.mean)
-
-
-#algelitism.eaSimpleElitism
+# Пакетная оценка: подменяет toolbox.map, поэтому цикл eaSimpleWithElitism не меняется, а все машины
+# с недействительной приспособленностью едут одновременно; начальные положения берутся из генератора среды
+carProblem = mountaincar.MountainCarProblem(LENGTH_CHROM)
+
+def mapCarScore(evaluate, individuals):
+    if getattr(evaluate, "func", evaluate) is not getCarScore:
+        return list(map(evaluate, individuals))
+
+    if not individuals:
+        return []
+
+    positions = carProblem.resetBatch(len(individuals), env.unwrapped.np_random)
+    return [(float(score),) for score in carProblem.getScoreBatch(individuals, positions)]
+
+# параллельная оценка: каждый рабочий процесс один раз создаёт свою среду MountainCar
+pool = None
+if VECTORIZED:
+    toolbox.register("map", mapCarScore)
+elif NUM_OF_PROCESSES > 1:
+    pool = parallel.ParallelMap(NUM_OF_PROCESSES, workerFactories = {"env": (gym.make, ('MountainCar-v0',))})
+    toolbox.register("map", pool)
+
+# кэш приспособленности: повторяющиеся последовательности действий не симулируются заново
+cache = fitnesscache.FitnessCache(CACHE_SIZE, toolbox.map)
+toolbox.register("map", cache.map)
+
+stats = streamstats.FitnessStatistics(("min", "avg"))
+cache.registerStats(stats)
+
+# снимки состояния вместе с генератором среды (от него зависит начальное положение машины при reset);
+# прерванный запуск продолжается с последнего снимка при следующем запуске сценария
+checkpointer = None
+if CHECKPOINT_FILE:
+    # снимок, сделанный в другом режиме оценки, не восстанавливается (значения приспособленности несравнимы)
+    checkpointer = checkpoint.Checkpointer(CHECKPOINT_FILE, CHECKPOINT_FREQUENCY, cache = cache,
+                                           generators = {"env": env.unwrapped.np_random},
+                                           metadata = {"vectorized": VECTORIZED})
+
+#evolution.eaSimpleWithElitism
 #algorithms.eaSimple
-population, logbook = algelitism.eaSimpleElitism(population, toolbox,
-                                                 cxpb = P_CROSSOVER,
-                                                 mutpb = P_MUTATION,
-                                                 ngen = MAX_GENERATIONS,
-                                                 halloffame = hof,
-                                                 stats = stats,
-                                                 verbose = True)
+population, logbook = evolution.eaSimpleWithElitism(population, toolbox,
+                                                    cxpb = P_CROSSOVER,
+                                                    mutpb = P_MUTATION,
+                                                    ngen = MAX_GENERATIONS,
+                                                    halloffame = hof,
+                                                    stats = stats,
+                                                    verbose = True,
+                                                    checkpointer = checkpointer)
+
+if pool is not None:
+    pool.close()
 
 maxFitnessValues, meanFitnessValues = logbook.select("min", "avg")
 
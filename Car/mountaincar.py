@@ -0,0 +1,148 @@
+import sys
+sys.stdout.reconfigure(encoding = 'utf-8')
+
+import numpy as np
+
+# Векторная реализация динамики MountainCar-v0 (как в gym.envs.classic_control.MountainCarEnv): положения
+# и скорости всех машин популяции продвигаются одновременно, один шаг numpy на действие хромосомы,
+# закончившие машины маскируются. Стоимость - та же, что у getCarScore в Code.py:
+#
+#     carProblem = mountaincar.MountainCarProblem(LENGTH_CHROM)
+#     scores = carProblem.getScoreBatch(population, carProblem.resetBatch(len(population), env.unwrapped.np_random))
+
+# Физика MountainCar-v0
+MIN_POSITION = -1.2
+MAX_POSITION = 0.6
+MAX_SPEED = 0.07
+GOAL_POSITION = 0.5
+GOAL_VELOCITY = 0.0
+FORCE = 0.001
+GRAVITY = 0.0025
+MAX_EPISODE_STEPS = 200   # ограничение длины эпизода MountainCar-v0 (TimeLimit)
+
+FLAG_LOCATION = 0.5
+
+
+def stepBatch(position, velocity, actions):
+    # Один шаг динамики для всех машин
+    # param position, velocity: векторы положений и скоростей
+    # param actions: вектор действий 0 (влево), 1 (без ускорения), 2 (вправо)
+    # return: (новые положения, новые скорости, признаки достижения цели)
+
+    velocity = velocity + (actions - 1) * FORCE + np.cos(3 * position) * (-GRAVITY)
+    velocity = np.clip(velocity, -MAX_SPEED, MAX_SPEED)
+    position = np.clip(position + velocity, MIN_POSITION, MAX_POSITION)
+    velocity = np.where((position == MIN_POSITION) & (velocity < 0), 0.0, velocity)
+
+    terminated = (position >= GOAL_POSITION) & (velocity >= GOAL_VELOCITY)
+    return position, velocity, terminated
+
+
+class MountainCarProblem:
+    # Этот класс инкапсулирует задачу MountainCar с хромосомой - последовательностью действий
+
+    def __init__(self, length, maxEpisodeSteps = MAX_EPISODE_STEPS):
+        # param length: длина хромосомы (количество действий)
+        # param maxEpisodeSteps: после этого количества шагов эпизод прерывается, как в gym
+
+        self.length = length
+        self.maxEpisodeSteps = maxEpisodeSteps
+
+    def __len__(self):
+        return self.length
+
+    def resetBatch(self, n, rng):
+        # Начальные положения машин: равномерно от -0.6 до -0.4, как env.reset() (скорость 0)
+        # param rng: генератор среды (env.unwrapped.np_random) - значения берутся из него так же, как n вызовов reset
+        # return: вектор начальных положений
+
+        return rng.uniform(low = -0.6, high = -0.4, size = n)
+
+    def rolloutBatch(self, population, positions, trajectory = False):
+        # Симулирует действия всех хромосом одновременно
+        # param population: двумерный массив (или список хромосом) действий размера (размер популяции, длина)
+        # param positions: вектор начальных положений
+        # param trajectory: сохранять положения и скорости после каждого шага
+        # return: (конечные положения, количество выполненных действий[, массив (шаги, размер популяции, 2)])
+
+        actions = np.asarray(population, dtype = np.int64)
+        position = np.array(positions, dtype = float)
+        velocity = np.zeros(len(position))
+        steps = np.zeros(len(position), dtype = np.int64)
+        running = np.ones(len(position), dtype = bool)
+        states = []
+
+        for t in range(actions.shape[1]):
+            if not running.any():
+                break
+
+            nextPosition, nextVelocity, terminated = stepBatch(position, velocity, actions[:, t])
+
+            # закончившие машины больше не двигаются
+            position = np.where(running, nextPosition, position)
+            velocity = np.where(running, nextVelocity, velocity)
+            steps += running
+            running &= ~terminated & (steps < self.maxEpisodeSteps)
+
+            if trajectory:
+                states.append(np.stack((position, velocity), axis = 1))
+
+        if trajectory:
+            return position, steps, np.array(states)
+        return position, steps
+
+    def getScoreBatch(self, population, positions):
+        # Рассчитывает стоимость сразу для всей популяции: если эпизод закончился раньше последнего действия,
+        # -(неиспользованная доля действий), иначе - расстояние от конечного положения до флага
+        # return: массив стоимостей
+
+        position, steps = self.rolloutBatch(population, positions)
+        return np.where(steps < self.length, -(self.length - steps) / self.length, np.abs(position - FLAG_LOCATION))
+
+    def getScore(self, individual, position):
+        # Рассчитывает стоимость одной хромосомы с начальным положением position
+        return float(self.getScoreBatch([individual], [position])[0])
+
+    def validate(self, env, individual):
+        # Сравнивает симуляцию с gym шаг за шагом: env.reset(), затем действия хромосомы в env.step
+        # и в rolloutBatch с тем же начальным положением (env.unwrapped.state)
+        # return: (наибольшее отклонение положения или скорости, совпало ли количество шагов)
+
+        env.reset()
+        start = float(env.unwrapped.state[0])
+
+        gymStates = []
+        for action in individual:
+            done = env.step(action)[2]
+            gymStates.append(np.array(env.unwrapped.state, dtype = float))
+            if done:
+                break
+
+        _, steps, states = self.rolloutBatch([individual], [start], trajectory = True)
+        numOfSteps = min(len(gymStates), len(states))
+        deviation = float(np.abs(states[:numOfSteps, 0] - np.array(gymStates[:numOfSteps])).max(initial = 0.0))
+
+        return deviation, int(steps[0]) == len(gymStates)
+
+
+# проверка по gym:
+def main():
+    import gym
+
+    env = gym.make('MountainCar-v0')
+    problem = MountainCarProblem(MAX_EPISODE_STEPS)
+    rng = np.random.default_rng(42)
+
+    worst = 0.0
+    for _ in range(100):
+        deviation, sameSteps = problem.validate(env, rng.integers(0, 3, size = len(problem)).tolist())
+        worst = max(worst, deviation)
+        if not sameSteps:
+            print("Количество шагов не совпало")
+
+    print("Наибольшее отклонение от gym = ", worst)
+    env.close()
+
+
+if __name__ == "__main__":
+    main()
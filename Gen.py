@@ -4,7 +4,7 @@ from deap import tools
 import time
 import random
 import matplotlib.pyplot as plt
-import numpy as np
+import streamstats
 
 # константы задачи
 ONE_MAX_LENGTH = 100    # длина подлежащей оптимизации битовой строки
@@ -41,10 +41,8 @@ toolbox.register("select", tools.selTournament, tournsize = 3)
 toolbox.register("mate", tools.cxOnePoint)
 toolbox.register("mutate", tools.mutFlipBit, indpb = 1.0/ONE_MAX_LENGTH)
 
-stats = tools.Statistics(lambda ind: ind.fitness.values)
-stats.register("max", np.max)
-stats.register("avg", np.mean)
-stats.register("values", np.array)
+# вместо приспособленности каждого индивида в журнал пишется гистограмма - по интервалу на каждое значение 0..ONE_MAX_LENGTH
+stats = streamstats.FitnessStatistics(("max", "avg"), bins = ONE_MAX_LENGTH + 1, range = (0, ONE_MAX_LENGTH + 1))
 
 population, logbook = algorithms.eaSimple(population, toolbox,
                                         cxpb = P_CROSSOVER,
@@ -53,7 +51,7 @@ population, logbook = algorithms.eaSimple(population, toolbox,
                                         stats = stats,
                                         verbose = False)
 
-maxFitnessValues, meanFitnessValues, vals = logbook.select("max", "avg", "values")
+maxFitnessValues, meanFitnessValues, histograms = logbook.select("max", "avg", "hist")
 
 # plt.plot(maxFitnessValues, color='red')
 # plt.plot(meanFitnessValues, color='green')
@@ -65,11 +63,16 @@ maxFitnessValues, meanFitnessValues, vals = logbook.select("max", "avg", "values
 plt.ion()
 fig, ax = plt.subplots()
 
-line, = ax.plot(vals[0], ' o', markersize = 1)
-ax.set_ylim(40, 110)
+# распределение приспособленности по поколениям восстанавливается из гистограмм
+bars = ax.bar(stats.edges[:-1], histograms[0], width = 1.0, align = 'edge')
+ax.set_xlim(40, 110)
+ax.set_ylim(0, max(h.max() for h in histograms) * 1.1)
+ax.set_xlabel('Приспособленность')
+ax.set_ylabel('Количество индивидуумов')
 
-for v in vals:
-    line.set_ydata(v)
+for h in histograms:
+    for bar, count in zip(bars, h):
+        bar.set_height(count)
 
     plt.draw()
     plt.gcf().canvas.flush_events()
@@ -8,11 +8,15 @@ from deap import base
 from deap import creator
 from deap import tools
 import random
-import numpy
 import matplotlib.pyplot as plt
 import seaborn as sns
 import networkx as nx
-import elitism
+import os
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+import evolution
+import islands
+import selection
+import streamstats
 import graphs
 
 
@@ -26,6 +30,9 @@ P_MUTATION = 0.1   # вероятность мутации индивида
 MAX_GENERATIONS = 100
 HALL_OF_FAME_SIZE = 5
 MAX_COLORS = 10
+NUM_OF_ISLANDS = 1       # количество островов (процессов); больше 1 - островная модель с миграцией
+MIGRATION_INTERVAL = 10  # количество поколений между обменами мигрантами
+NUM_OF_MIGRANTS = 3      # количество лучших индивидов, отправляемых островом при обмене
 
 # Устанавливаем случайное начальное значение:
 RANDOM_SEED = 42
@@ -53,36 +60,77 @@ toolbox.register("individualCreator", tools.initRepeat, creator.Individual, tool
 toolbox.register("populationCreator", tools.initRepeat, list, toolbox.individualCreator)
 
 
-# Вычисление приспособленности: стоимость предложенного решения
+# Вычисление приспособленности: стоимость предложенного решения;
+# для индивидов, изменённых мутацией ниже, стоимость берётся из их состояния за O(1):
 def getCost(individual):
-    return gcp.getCost(individual),  # возвращаем кортеж
+    return gcp.getIncrementalCost(individual),  # возвращаем кортеж
 
 
 toolbox.register("evaluate", getCost)
 
+
+# Пакетная оценка: подменяет toolbox.map, поэтому цикл eaSimpleWithElitism не меняется,
+# а все индивиды без состояния (например, потомки кроссовера) оцениваются одним проходом по рёбрам:
+def mapCost(evaluate, individuals):
+    if getattr(evaluate, "func", evaluate) is not getCost:
+        return list(map(evaluate, individuals))
+
+    fresh = [ind for ind in individuals if not gcp.hasColoringState(ind)]
+    freshCosts = iter(gcp.getCostBatch(fresh)) if fresh else iter(())
+
+    return [(gcp.getIncrementalCost(ind) if gcp.hasColoringState(ind) else int(next(freshCosts)),)
+            for ind in individuals]
+
+
+toolbox.register("map", mapCost)
+
+
+# Кроссовер меняет много узлов сразу - состояние потомков сбрасывается, и они пересчитываются полностью:
+def cxTwoPoint(ind1, ind2):
+    tools.cxTwoPoint(ind1, ind2)
+    gcp.resetColoringState(ind1)
+    gcp.resetColoringState(ind2)
+    return ind1, ind2
+
+
+# Аналог tools.mutUniformInt (с той же последовательностью случайных чисел), но каждый узел
+# перекрашивается через gcp.recolorNode, который обновляет стоимость за O(степени узла):
+def mutUniformInt(individual, low, up, indpb):
+    for i in range(len(individual)):
+        if random.random() < indpb:
+            gcp.recolorNode(individual, i, random.randint(low, up))
+    return individual,
+
+
 # Генетические операторы:
-toolbox.register("select", tools.selTournament, tournsize = 2)
-toolbox.register("mate", tools.cxTwoPoint)
-toolbox.register("mutate", tools.mutUniformInt, low = 0, up = MAX_COLORS - 1, indpb = 1.0 / len(gcp))
+toolbox.register("select", selection.selTournament, tournsize = 2)
+toolbox.register("mate", cxTwoPoint)
+toolbox.register("mutate", mutUniformInt, low = 0, up = MAX_COLORS - 1, indpb = 1.0 / len(gcp))
 
 
 # Поток генетического алгоритма:
 def main():
 
-    # Создаем начальную популяцию (поколение 0):
-    population = toolbox.populationCreator(n = POPULATION_SIZE)
-
     # Подготавливаем объект статистики:
-    stats = tools.Statistics(lambda ind: ind.fitness.values)
-    stats.register("min", numpy.min)
-    stats.register("avg", numpy.mean)
-
-    # Определяем объект зала славы:
-    hof = tools.HallOfFame(HALL_OF_FAME_SIZE)
-
-    # Выполняем генетический алгоритм с элитизмом:
-    population, logbook = elitism.eaSimpleWithElitism(population, toolbox, cxpb = P_CROSSOVER, mutpb = P_MUTATION,
-                                              ngen=MAX_GENERATIONS, stats = stats, halloffame = hof, verbose = True)
+    stats = streamstats.FitnessStatistics(("min", "avg"))
+
+    if NUM_OF_ISLANDS > 1:
+        # Островная модель: каждый остров - отдельный процесс со своей популяцией размера POPULATION_SIZE:
+        hof, logbooks = islands.eaIslands(toolbox, NUM_OF_ISLANDS, POPULATION_SIZE, cxpb = P_CROSSOVER,
+                                          mutpb = P_MUTATION, ngen = MAX_GENERATIONS,
+                                          migrationInterval = MIGRATION_INTERVAL, numOfMigrants = NUM_OF_MIGRANTS,
+                                          stats = stats, hallOfFameSize = HALL_OF_FAME_SIZE, verbose = True)
+        logbook = islands.combineLogbooks(logbooks, stats)
+    else:
+        # Создаем начальную популяцию (поколение 0):
+        population = toolbox.populationCreator(n = POPULATION_SIZE)
+
+        # Определяем объект зала славы:
+        hof = tools.HallOfFame(HALL_OF_FAME_SIZE)
+
+        # Выполняем генетический алгоритм с элитизмом:
+        population, logbook = evolution.eaSimpleWithElitism(population, toolbox, cxpb = P_CROSSOVER, mutpb = P_MUTATION,
+                                                  ngen=MAX_GENERATIONS, stats = stats, halloffame = hof, verbose = True)
 
     # Выводим информацию о лучшем решении:
     best = hof.items[0]
@@ -25,9 +25,21 @@ class GraphColoringProblem:
         # Список узлов в графе:
         self.nodeList = list(self.graph.nodes)
 
-        # Матрица смежности узлов - 
-        # matrix[i,j] равно '1', если узлы i и j соединены, или '0' в противном случае:
-        self.adjMatrix = nx.adjacency_matrix(graph).todense()
+        # Список рёбер в виде двух массивов индексов узлов (вместо плотной матрицы смежности,
+        # которая для больших разреженных графов не помещается в память):
+        # узлы edgeSources[k] и edgeTargets[k] соединены k-м ребром. Петли не учитываются.
+        nodeIndex = {node: i for i, node in enumerate(self.nodeList)}
+        edges = np.fromiter((index for u, v in self.graph.edges if u != v for index in (nodeIndex[u], nodeIndex[v])),
+                            dtype = np.int32, count = -1).reshape(-1, 2)
+        self.edgeSources = edges[:, 0].copy()
+        self.edgeTargets = edges[:, 1].copy()
+
+        # Списки соседей в формате CSR: соседи узла i - adjNodes[adjOffsets[i]:adjOffsets[i + 1]]
+        allSources = np.concatenate((self.edgeSources, self.edgeTargets))
+        allTargets = np.concatenate((self.edgeTargets, self.edgeSources))
+        self.adjNodes = allTargets[np.argsort(allSources, kind = 'stable')]
+        self.adjOffsets = np.zeros(len(self.nodeList) + 1, dtype = np.int64)
+        np.cumsum(np.bincount(allSources, minlength = len(self.nodeList)), out = self.adjOffsets[1:])
 
     def __len__(self):
         
@@ -56,18 +68,47 @@ class GraphColoringProblem:
         if len(colorArrangement) != self.__len__():
             raise ValueError("Размер раскраски должен быть равен ", self.__len__())
 
-        violations = 0
+        # Каждое ребро, соединяющее узлы одинакового цвета, считается нарушением -
+        # сравниваем цвета концов всех рёбер одной векторной операцией:
+        colors = np.asarray(colorArrangement)
+        return int(np.count_nonzero(colors[self.edgeSources] == colors[self.edgeTargets]))
 
-        # Итерируем по каждой паре узлов и проверяем, соединены ли они И имеют ли одинаковый цвет:
-        for i in range(len(colorArrangement)):
-            for j in range(i + 1, len(colorArrangement)):
+    def getViolationsCountBatch(self, population, chunkSize = 64):
+        
+        # Вычисляет количество нарушений сразу для всей популяции
+        # :param population: двумерный массив (или список индивидов) размера (размер популяции, количество узлов)
+        # :param chunkSize: количество индивидов, обрабатываемых за один проход по рёбрам
+        # (ограничивает размер промежуточного массива для графов с миллионами рёбер)
+        # :return: массив с количеством нарушений для каждого индивида
+        
+
+        population = np.asarray(population)
+        if population.ndim != 2 or population.shape[1] != self.__len__():
+            raise ValueError("Размер раскраски должен быть равен ", self.__len__())
 
-                if self.adjMatrix[i, j]:    # эти узлы соединены
-                    if colorArrangement[i] == colorArrangement[j]:
-                        violations += 1
+        violations = np.empty(len(population), dtype = np.int64)
+        for start in range(0, len(population), chunkSize):
+            chunk = population[start:start + chunkSize]
+            violations[start:start + chunkSize] = np.count_nonzero(chunk[:, self.edgeSources] == chunk[:, self.edgeTargets], axis = 1)
 
         return violations
 
+    def getCostBatch(self, population):
+        
+        # Вычисляет стоимость раскраски сразу для всей популяции
+        # :param population: двумерный массив (или список индивидов) размера (размер популяции, количество узлов)
+        # :return: массив со стоимостью для каждого индивида
+        
+
+        population = np.asarray(population)
+        violations = self.getViolationsCountBatch(population)
+
+        # количество различных цветов в каждой строке - число смен значения в отсортированной строке плюс один:
+        sortedColors = np.sort(population, axis = 1)
+        numOfColors = np.count_nonzero(np.diff(sortedColors, axis = 1), axis = 1) + 1
+
+        return self.hardConstraintPenalty * violations + numOfColors
+
     def getNumberOfColors(self, colorArrangement):
         
         # Возвращает количество различных цветов в предложенной раскраске
@@ -77,6 +118,98 @@ class GraphColoringProblem:
         
         return len(set(colorArrangement))
 
+    def initColoringState(self, individual):
+        
+        # Сохраняет в индивиде состояние для инкрементальной оценки: сколько узлов использует каждый цвет,
+        # сколько соседей каждого узла имеют тот же цвет, количество нарушений и количество цветов
+        # :param individual: индивид (объект с атрибутами, например creator.Individual)
+        # :return: стоимость раскраски
+        
+
+        colors = np.asarray(individual)
+        individual.colorCounts = np.bincount(colors)
+
+        sameColor = (colors[self.edgeSources] == colors[self.edgeTargets]).astype(np.int64)
+        individual.nodeConflicts = (np.bincount(self.edgeSources, weights = sameColor, minlength = len(colors)) +
+                                    np.bincount(self.edgeTargets, weights = sameColor, minlength = len(colors))).astype(np.int64)
+        individual.violations = int(sameColor.sum())
+        individual.numOfColors = int(np.count_nonzero(individual.colorCounts))
+
+        return self.hardConstraintPenalty * individual.violations + individual.numOfColors
+
+    def resetColoringState(self, individual):
+        
+        # Удаляет из индивида состояние инкрементальной оценки (например, после кроссовера,
+        # меняющего много узлов сразу) - следующая оценка выполнит полный пересчёт
+        # :param individual: индивид (объект с атрибутами, например creator.Individual)
+        
+
+        for name in ("colorCounts", "nodeConflicts", "violations", "numOfColors"):
+            individual.__dict__.pop(name, None)
+
+    def hasColoringState(self, individual):
+        
+        # :return: True, если индивид содержит состояние инкрементальной оценки
+        return hasattr(individual, "colorCounts")
+
+    def getIncrementalCost(self, individual):
+        
+        # Возвращает стоимость раскраски из состояния индивида за O(1);
+        # при отсутствии состояния выполняет полный пересчёт.
+        # Индивид должен изменяться только через recolorNode, иначе состояние устареет.
+        # :param individual: индивид (объект с атрибутами, например creator.Individual)
+        # :return: стоимость раскраски
+        
+
+        if not self.hasColoringState(individual):
+            return self.initColoringState(individual)
+
+        return self.hardConstraintPenalty * individual.violations + individual.numOfColors
+
+    def recolorNode(self, individual, node, newColor):
+        
+        # Меняет цвет узла и обновляет состояние индивида за O(степени узла)
+        # :param individual: индивид (объект с атрибутами, например creator.Individual)
+        # :param node: индекс перекрашиваемого узла
+        # :param newColor: новый цвет узла
+        # :return: новая стоимость раскраски
+        
+
+        if not self.hasColoringState(individual):
+            self.initColoringState(individual)
+
+        oldColor = individual[node]
+        if oldColor == newColor:
+            return self.getIncrementalCost(individual)
+
+        # соседи узла со старым и с новым цветом:
+        neighbors = self.adjNodes[self.adjOffsets[node]:self.adjOffsets[node + 1]].tolist()
+        sameOld = [k for k in neighbors if individual[k] == oldColor]
+        sameNew = [k for k in neighbors if individual[k] == newColor]
+
+        nodeConflicts = individual.nodeConflicts
+        nodeConflicts[sameOld] -= 1
+        nodeConflicts[sameNew] += 1
+        nodeConflicts[node] = len(sameNew)
+        individual.violations += len(sameNew) - len(sameOld)
+
+        # счётчики использования цветов (массив расширяется, если появился цвет с большим номером):
+        colorCounts = individual.colorCounts
+        if newColor >= len(colorCounts):
+            colorCounts = individual.colorCounts = np.concatenate((colorCounts, np.zeros(newColor + 1 - len(colorCounts), dtype = colorCounts.dtype)))
+
+        colorCounts[oldColor] -= 1
+        if colorCounts[oldColor] == 0:
+            individual.numOfColors -= 1
+
+        colorCounts[newColor] += 1
+        if colorCounts[newColor] == 1:
+            individual.numOfColors += 1
+
+        individual[node] = newColor
+
+        return self.getIncrementalCost(individual)
+
     def plotGraph(self, colorArrangement):
         
         # Строит граф с узлами, окрашенными согласно предложенной раскраске
@@ -10,8 +10,10 @@ from deap import creator
 from deap import tools
 from matplotlib.lines import Line2D
 import random
-import matplotlib.pyplot as plt
 import numpy as np
+import matplotlib.pyplot as plt
+import streamstats
+import shortestpath
 
 # Матрица расстояний между вершинами (D)
 inf = 100
@@ -25,6 +27,11 @@ D = ((0, 3, 1, 3, inf, inf),
 startV = 0              # стартовая вершина
 LENGTH_D = len(D)       # количество вершин
 LENGTH_CHROM = len(D)*len(D[0])    # длина хромосомы (общее количество возможных связей между вершинами)
+SPARSE_GRAPH = False    # хранить граф в формате CSR (элементы inf - отсутствующие рёбра со штрафом inf)
+
+# Задача: стоимости считаются выборкой из матрицы расстояний (или CSR) сразу для всей популяции
+graph = shortestpath.CSRGraph.fromDense(D, missing = inf) if SPARSE_GRAPH else D
+shortestPath = shortestpath.ShortestPathProblem(graph, startV, missingPenalty = inf)
 
 # Константы генетического алгоритма
 POPULATION_SIZE = 500   # количество индивидуумов в популяции
@@ -33,14 +40,14 @@ P_MUTATION = 0.1        # вероятность мутации индивиду
 MAX_GENERATIONS = 30    # максимальное количество поколений
 HALL_OF_FAME_SIZE = 1   # размер "Зала славы" (для элитизма)
 
-hof = tools.HallOfFame(HALL_OF_FAME_SIZE)  # Создание объекта для хранения лучших решений
+hof = tools.HallOfFame(HALL_OF_FAME_SIZE, similar = np.array_equal)  # Создание объекта для хранения лучших решений
 
 RANDOM_SEED = 42
 random.seed(RANDOM_SEED)  # Установка фиксированного начального состояния для генератора случайных чисел
 
 # Создание структуры для описания задачи минимизации
 creator.create("FitnessMin", base.Fitness, weights = (-1.0,))  # Минимизация целевой функции
-creator.create("Individual", list, fitness = creator.FitnessMin)  # Создание структуры "Индивид"
+creator.create("Individual", np.ndarray, fitness = creator.FitnessMin)  # "Индивид" - массив (LENGTH_D, LENGTH_D)
 
 toolbox = base.Toolbox()  # Создание инструментария для генетического алгоритма
 toolbox.register("randomOrder", random.sample, range(LENGTH_D), LENGTH_D)  # Генерация случайных порядков вершин
@@ -50,17 +57,20 @@ toolbox.register("populationCreator", tools.initRepeat, list, toolbox.individual
 population = toolbox.populationCreator(n=POPULATION_SIZE)  # Создание начальной популяции
 
 # Функция для вычисления "стоимости" (фитнеса) пути с использованием алгоритма Дейкстры
+# (строка n - путь из стартовой вершины до первого вхождения вершины n)
 def dikstryFitness(individual):
-    s = 0  # Инициализация стоимости пути
-    for n, path in enumerate(individual):  # Для каждого пути
-        path = path[:path.index(n) + 1]  # Обработка пути до текущей вершины
+    return shortestPath.getCost(individual),  # Возвращаем стоимость пути как кортеж (для совместимости с DEAP)
 
-        si = startV  # Начальная вершина
-        for j in path:  # Пройтись по всем вершинам пути
-            s += D[si][j]  # Суммировать расстояния
-            si = j  # Перемещаться по пути
+# Пакетная оценка: подменяет toolbox.map, поэтому цикл eaSimple не меняется,
+# а стоимости всех индивидов с недействительной приспособленностью считаются одной выборкой
+def mapDikstryFitness(evaluate, individuals):
+    if getattr(evaluate, "func", evaluate) is not dikstryFitness:
+        return list(map(evaluate, individuals))
 
-    return s,         # Возвращаем стоимость пути как кортеж (для совместимости с DEAP)
+    if not individuals:
+        return []
+
+    return [(float(cost),) for cost in shortestPath.getCostBatch(individuals)]
 
 # Функция для кроссинговера (перекрестного скрещивания) путей
 def cxOrdered(ind1, ind2):
@@ -78,14 +88,13 @@ def mutShuffleIndexes(individual, indpb):
 
 # Регистрация функций в инструменте
 toolbox.register("evaluate", dikstryFitness)  # Регистрация функции для оценки фитнеса
+toolbox.register("map", mapDikstryFitness)  # Пакетная оценка популяции
 toolbox.register("select", tools.selTournament, tournsize=3)  # Турнирный отбор
 toolbox.register("mate", cxOrdered)  # Скрещивание
 toolbox.register("mutate", mutShuffleIndexes, indpb = 1.0 / LENGTH_CHROM / 10)  # Мутация
 
 # Статистики: минимальное и среднее значение фитнеса
-stats = tools.Statistics(lambda ind: ind.fitness.values)
-stats.register("min", np.min)
-stats.register("avg", np.mean)
+stats = streamstats.FitnessStatistics(("min", "avg"))
 
 # Выполнение генетического алгоритма
 population, logbook = algorithms.eaSimple(population, toolbox,
@@ -103,6 +112,12 @@ maxFitnessValues, meanFitnessValues = logbook.select("min", "avg")
 best = hof.items[0]
 print(best)
 
+# Сравнение с точным решением (алгоритм Дейкстры)
+optimum = shortestPath.getOptimalCost()
+print("Кратчайшие расстояния = ", shortestPath.getShortestDistances())
+print("Оптимум = {}, лучшая стоимость = {}, отклонение = {:.2f}%".format(
+      optimum, best.fitness.values[0], 100.0 * (best.fitness.values[0] - optimum) / optimum))
+
 # Координаты вершин для графика
 vertex = ((0, 1), (1, 1), (0.5, 0.8), (0.1, 0.5), (0.8, 0.2), (0.4, 0))
 
@@ -129,6 +144,7 @@ def show_graph(ax, best):
             continue
 
         prev = startV
+        v = v.tolist()
         v = v[: v.index(i) + 1]
         for j in v:
             ax.add_line(Line2D((vertex[prev][0], vertex[j][0]), (vertex[prev][1], vertex[j][1]), color = 'r'))
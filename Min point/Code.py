@@ -8,12 +8,39 @@ import random
 import matplotlib.pyplot as plt
 import numpy as np
 from deap import base, tools, creator, algorithms
-import algelitism
+import os
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+import continuous
+import evolution
+import matrixga
+import niching
+import realga
+import selection
+import streamstats
 import time
 
 LOW, UP = -5, 5
 ETA = 20
 LENGTH_CHROM = 2    # длина хромосомы, подлежащей оптимизации
+# движок: "ga" - генетический алгоритм над массивом (realga), "de" - дифференциальная эволюция,
+# "cmaes" - CMA-ES, "deap" - генетический алгоритм над списками DEAP
+ENGINE = "ga"
+MATRIX_GA = ENGINE != "deap"    # популяция - массив (POPULATION_SIZE, LENGTH_CHROM), оценка векторная
+
+# константы дифференциальной эволюции и CMA-ES
+DE_F = 0.5              # коэффициент разностного вектора
+DE_CR = 0.9             # вероятность кроссовера
+CMA_SIGMA = 2.0         # начальная длина шага
+
+# нишевание для ENGINE = "ga": None, "sharing" - разделение приспособленности, "clearing" - расчистка,
+# "crowding" - детерминированное вытеснение (соседи ищутся по KD-дереву, см. niching)
+NICHING = "clearing"
+NICHE_RADIUS = 1.0      # радиус ниши
+NICHE_CAPACITY = 5      # количество индивидов, сохраняемых в нише при расчистке
+OPTIMUM_RADIUS = 0.1    # индивид в этом радиусе от минимума считается нашедшим его
+
+# известные минимумы функции Химмельблау
+PT_MINS = [[3.0, 2.0], [-2.805118, 3.131312], [-3.779310, -3.283186], [3.584458, -1.848126]]
 
 # константы генетического алгоритма
 POPULATION_SIZE = 200   # количество индивидуумов в популяции
@@ -22,10 +49,11 @@ P_MUTATION = 0.2        # вероятность мутации индивиду
 MAX_GENERATIONS = 50    # максимальное количество поколений
 HALL_OF_FAME_SIZE = 5
 
-hof = tools.HallOfFame(HALL_OF_FAME_SIZE)
+hof = matrixga.HallOfFame(HALL_OF_FAME_SIZE) if MATRIX_GA else tools.HallOfFame(HALL_OF_FAME_SIZE)
 
 RANDOM_SEED = 42
 random.seed(RANDOM_SEED)
+rng = np.random.default_rng(RANDOM_SEED)
 
 creator.create("FitnessMin", base.Fitness, weights = (-1.0,))  # Минмизация
 creator.create("Individual", list, fitness = creator.FitnessMin)
@@ -35,37 +63,42 @@ def randomPoint(a, b):
     return [random.uniform(a, b), random.uniform(a, b)]
 
 
-toolbox = base.Toolbox()
-toolbox.register("randomPoint", randomPoint, LOW, UP)
-toolbox.register("individualCreator", tools.initIterate, creator.Individual, toolbox.randomPoint)
-toolbox.register("populationCreator", tools.initRepeat, list, toolbox.individualCreator)
-
-population = toolbox.populationCreator(n=POPULATION_SIZE)
-
-
 def himmelblau(individual):
-    x, y = individual
-    f = (x ** 2 + y - 11) ** 2 + (x + y ** 2 - 7) ** 2
-    return f,
+    return float(realga.himmelblau(np.asarray(individual))),
 
 
-toolbox.register("evaluate", himmelblau)
-toolbox.register("select", tools.selTournament, tournsize = 3)
-toolbox.register("mate", tools.cxSimulatedBinaryBounded, low = LOW, up = UP, eta = ETA)
-toolbox.register("mutate", tools.mutPolynomialBounded, low = LOW, up = UP, eta = ETA, indpb = 1.0 / LENGTH_CHROM)
+toolbox = base.Toolbox()
+if MATRIX_GA:
+    # вся популяция - один массив: SBX, полиномиальная мутация и оценка выполняются над всеми строками сразу
+    toolbox.register("populationCreator", realga.randomPopulation, dimension = LENGTH_CHROM, low = LOW, up = UP, rng = rng)
+    toolbox.register("evaluate", realga.himmelblau)
+    toolbox.register("select", selection.tournament, tournsize = 3)
+    toolbox.register("mate", realga.cxSimulatedBinaryBounded, low = LOW, up = UP, eta = ETA)
+    toolbox.register("mutate", realga.mutPolynomialBounded, low = LOW, up = UP, eta = ETA, indpb = 1.0 / LENGTH_CHROM)
+
+    if NICHING == "sharing":
+        toolbox.register("niching", niching.sharedWvalues, sigma = NICHE_RADIUS)
+    elif NICHING == "clearing":
+        toolbox.register("niching", niching.clearedWvalues, radius = NICHE_RADIUS, capacity = NICHE_CAPACITY)
+else:
+    toolbox.register("randomPoint", randomPoint, LOW, UP)
+    toolbox.register("individualCreator", tools.initIterate, creator.Individual, toolbox.randomPoint)
+    toolbox.register("populationCreator", tools.initRepeat, list, toolbox.individualCreator)
+    toolbox.register("evaluate", himmelblau)
+    toolbox.register("select", selection.selTournament, tournsize = 3)
+    toolbox.register("mate", tools.cxSimulatedBinaryBounded, low = LOW, up = UP, eta = ETA)
+    toolbox.register("mutate", tools.mutPolynomialBounded, low = LOW, up = UP, eta = ETA, indpb = 1.0 / LENGTH_CHROM)
 
-stats = tools.Statistics(lambda ind: ind.fitness.values)
-stats.register("min", np.min)
-stats.register("avg", np.mean)
+population = toolbox.populationCreator(n=POPULATION_SIZE)
 
+stats = streamstats.FitnessStatistics(("min", "avg"))
 
-def show(ax, xgrid, ygrid, f):
-    ptMins = [[3.0, 2.0], [-2.805118, 3.131312], [-3.779310, -3.283186], [3.584458, -1.848126]]
 
+def show(ax, xgrid, ygrid, f, population):
     ax.clear()
     ax.contour(xgrid, ygrid, f)
-    ax.scatter(*zip(*ptMins), marker = 'X', color = 'red', zorder = 1)
-    ax.scatter(*zip(*population), color = 'green', s = 2, zorder = 0)
+    ax.scatter(*zip(*PT_MINS), marker = 'X', color = 'red', zorder = 1)
+    ax.scatter(*np.asarray(population).T, color = 'green', s = 2, zorder = 0)
 
     plt.draw()
     plt.gcf().canvas.flush_events()
@@ -76,7 +109,7 @@ x = np.arange(-5, 5, 0.1)
 y = np.arange(-5, 5, 0.1)
 xgrid, ygrid = np.meshgrid(x, y)
 
-f_himmelbalu = (xgrid**2 + ygrid - 11)**2 + (xgrid + ygrid**2 - 7)**2
+f_himmelbalu = realga.himmelblau(np.stack((xgrid, ygrid), axis = -1))
 
 plt.ion()
 fig, ax = plt.subplots()
@@ -86,19 +119,76 @@ ax.set_xlim(LOW - 3, UP + 3)
 ax.set_ylim(LOW - 3, UP + 3)
 
 # Исполнив генетический алгоритм с элитизмом
-population, logbook = algelitism.eaSimpleElitism(population, toolbox,
-                                        cxpb = P_CROSSOVER,
-                                        mutpb = P_MUTATION,
-                                        ngen = MAX_GENERATIONS,
-                                        halloffame = hof,
-                                        stats = stats,
-                                        callback = (show, (ax, xgrid, ygrid, f_himmelbalu)),
-                                        verbose = True)
+if MATRIX_GA:
+    def showPopulation(gen, population, halloffame, logbook):
+        show(ax, xgrid, ygrid, f_himmelbalu, population)
+
+if ENGINE == "de":
+    population, logbook = continuous.differentialEvolution(population, toolbox,
+                                            ngen = MAX_GENERATIONS,
+                                            low = LOW, up = UP,
+                                            F = DE_F, CR = DE_CR,
+                                            halloffame = hof,
+                                            stats = stats,
+                                            hooks = [showPopulation],
+                                            verbose = True,
+                                            weight = -1.0,
+                                            rng = rng)
+elif ENGINE == "cmaes":
+    population, logbook = continuous.cmaES(toolbox,
+                                            ngen = MAX_GENERATIONS,
+                                            low = LOW, up = UP,
+                                            dimension = LENGTH_CHROM,
+                                            sigma = CMA_SIGMA,
+                                            halloffame = hof,
+                                            stats = stats,
+                                            hooks = [showPopulation],
+                                            verbose = True,
+                                            weight = -1.0,
+                                            rng = rng)
+elif MATRIX_GA and NICHING == "crowding":
+    population, logbook = niching.eaDeterministicCrowding(population, toolbox,
+                                            cxpb = P_CROSSOVER,
+                                            mutpb = P_MUTATION,
+                                            ngen = MAX_GENERATIONS,
+                                            halloffame = hof,
+                                            stats = stats,
+                                            hooks = [showPopulation],
+                                            verbose = True,
+                                            weight = -1.0,
+                                            rng = rng)
+elif MATRIX_GA:
+    population, logbook = matrixga.eaSimpleWithElitism(population, toolbox,
+                                            cxpb = P_CROSSOVER,
+                                            mutpb = P_MUTATION,
+                                            ngen = MAX_GENERATIONS,
+                                            halloffame = hof,
+                                            stats = stats,
+                                            hooks = [showPopulation],
+                                            verbose = True,
+                                            weight = -1.0,
+                                            rng = rng,
+                                            niching = getattr(toolbox, "niching", None))
+else:
+    population, logbook = evolution.eaSimpleWithElitism(population, toolbox,
+                                            cxpb = P_CROSSOVER,
+                                            mutpb = P_MUTATION,
+                                            ngen = MAX_GENERATIONS,
+                                            halloffame = hof,
+                                            stats = stats,
+                                            callback = (show, (ax, xgrid, ygrid, f_himmelbalu, population)),
+                                            verbose = True)
 
 maxFitnessValues, meanFitnessValues = logbook.select("min", "avg")
 
-best = hof.items[0]
-print(f"Best solution: {best}, Fitness: {best.fitness.values}")
+if MATRIX_GA:
+    print(f"Best solution: {hof.items[0].tolist()}, Fitness: {hof.values[0]}")
+else:
+    best = hof.items[0]
+    print(f"Best solution: {best}, Fitness: {best.fitness.values}")
+
+# сколько известных минимумов покрывает итоговая популяция
+print(f"Minima covered: {niching.coveredOptima(np.asarray(population), PT_MINS, OPTIMUM_RADIUS)} of {len(PT_MINS)}")
 
 plt.ioff()
 plt.show()
@@ -0,0 +1,118 @@
+# Установите старую версию numpy (например, 1.21.0), где np.bool8 поддерживается:
+# pip install numpy==1.21.0
+
+import sys
+sys.stdout.reconfigure(encoding = 'utf-8')
+
+import numpy as np
+from deap import base
+import os
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+import continuous
+import matrixga
+import realga
+import selection
+import streamstats
+
+# Сравнение движков по количеству оценок до цели: для каждой задачи и движка выполняются RUNS запусков
+# до достижения значения TARGET или исчерпания MAX_EVALUATIONS оценок; выводится медиана оценок
+# по успешным запускам и их количество
+
+# Задачи: (название, функция, размерность, нижняя граница, верхняя граница, цель)
+PROBLEMS = [("Химмельблау", realga.himmelblau, 2, -5.0, 5.0, 1e-6),
+            ("Розенброк", realga.rosenbrock, 10, -2.048, 2.048, 1e-6),
+            ("Растригин", realga.rastrigin, 10, -5.12, 5.12, 1.0)]
+
+RUNS = 5
+MAX_EVALUATIONS = 200000
+RANDOM_SEED = 42
+
+# Константы генетического алгоритма (как в Code.py):
+POPULATION_SIZE = 200
+P_CROSSOVER = 0.9
+P_MUTATION = 0.2
+ETA = 20
+HALL_OF_FAME_SIZE = 5
+
+# Константы дифференциальной эволюции:
+DE_POPULATION_SIZE = 50
+DE_F = 0.5
+DE_CR = 0.9
+
+
+def createToolbox(function, dimension, low, up, rng):
+    # Создаёт набор операторов для задачи, как в Code.py (MATRIX_GA)
+
+    toolbox = base.Toolbox()
+    toolbox.register("populationCreator", realga.randomPopulation, dimension = dimension, low = low, up = up, rng = rng)
+    toolbox.register("evaluate", function)
+    toolbox.register("select", selection.tournament, tournsize = 3)
+    toolbox.register("mate", realga.cxSimulatedBinaryBounded, low = low, up = up, eta = ETA)
+    toolbox.register("mutate", realga.mutPolynomialBounded, low = low, up = up, eta = ETA, indpb = 1.0 / dimension)
+
+    return toolbox
+
+
+def runGA(toolbox, dimension, low, up, stats, stopCondition, rng):
+    population = toolbox.populationCreator(n = POPULATION_SIZE)
+    return matrixga.eaSimpleWithElitism(population, toolbox, cxpb = P_CROSSOVER, mutpb = P_MUTATION,
+                                        ngen = MAX_EVALUATIONS // POPULATION_SIZE,
+                                        halloffame = matrixga.HallOfFame(HALL_OF_FAME_SIZE), stats = stats,
+                                        verbose = False, weight = -1.0, rng = rng, stopCondition = stopCondition)
+
+
+def runDE(toolbox, dimension, low, up, stats, stopCondition, rng):
+    population = toolbox.populationCreator(n = DE_POPULATION_SIZE)
+    return continuous.differentialEvolution(population, toolbox, ngen = MAX_EVALUATIONS // DE_POPULATION_SIZE,
+                                            low = low, up = up, F = DE_F, CR = DE_CR, stats = stats, verbose = False,
+                                            weight = -1.0, rng = rng, stopCondition = stopCondition)
+
+
+def runCMAES(toolbox, dimension, low, up, stats, stopCondition, rng):
+    lambda_ = 4 + int(3 * np.log(dimension))
+    return continuous.cmaES(toolbox, ngen = MAX_EVALUATIONS // lambda_, low = low, up = up, dimension = dimension,
+                            lambda_ = lambda_, stats = stats, verbose = False, weight = -1.0, rng = rng,
+                            stopCondition = stopCondition)
+
+
+ENGINES = [("ГА", runGA), ("DE", runDE), ("CMA-ES", runCMAES)]
+
+
+def benchmark(problem, engine):
+    # Выполняет RUNS запусков движка на задаче
+    # return: список количеств оценок до цели (None - цель не достигнута)
+
+    name, function, dimension, low, up, target = problem
+    results = []
+    for run in range(RUNS):
+        rng = np.random.default_rng(RANDOM_SEED + run)
+        toolbox = createToolbox(function, dimension, low, up, rng)
+        stopCondition = continuous.stopWhenFitnessReaches(target, weight = -1.0)
+
+        stats = streamstats.FitnessStatistics(("min",))
+
+        _, logbook = engine(toolbox, dimension, low, up, stats, stopCondition, rng)
+
+        reached = logbook[-1]["min"] <= target
+        results.append(sum(logbook.select("nevals")) if reached else None)
+
+    return results
+
+
+def main():
+    print("{:>12} {:>4} ".format("задача", "D") + " ".join("{:>18}".format(name) for name, _ in ENGINES))
+
+    for problem in PROBLEMS:
+        cells = []
+        for _, engine in ENGINES:
+            evaluations = [result for result in benchmark(problem, engine) if result is not None]
+            if evaluations:
+                cells.append("{:>10.0f} ({}/{})".format(np.median(evaluations), len(evaluations), RUNS))
+            else:
+                cells.append("{:>10} ({}/{})".format("-", 0, RUNS))
+
+        print("{:>12} {:>4} ".format(problem[0], problem[2]) + " ".join("{:>18}".format(cell) for cell in cells))
+
+
+if __name__ == "__main__":
+    main()
@@ -2,6 +2,7 @@ import random
 import matplotlib.pyplot as plt
 import seaborn as sns
 from deap import base, creator, tools
+import bitgenome
 
 # Константы задачи:
 ONE_MAX_LENGTH = 100  # Длина битовой строки, которую нужно оптимизировать
@@ -19,17 +20,14 @@ random.seed(RANDOM_SEED)
 # Создаем "инструментарий" для генетического алгоритма:
 toolbox = base.Toolbox()
 
-# Оператор, который случайным образом возвращает 0 или 1:
-toolbox.register("zeroOrOne", random.randint, 0, 1)
-
 # Определение стратегии максимизации функции приспособленности:
 creator.create("FitnessMax", base.Fitness, weights = (1.0,))
 
-# Создание класса Индивидуум на основе списка:
-creator.create("Individual", list, fitness = creator.FitnessMax)
+# Создание класса Индивидуум на основе битовой строки, упакованной по 64 гена в слово:
+creator.create("Individual", bitgenome.PackedBits, fitness = creator.FitnessMax)
 
-# Оператор для создания индивидуумов:
-toolbox.register("individualCreator", tools.initRepeat, creator.Individual, toolbox.zeroOrOne, ONE_MAX_LENGTH)
+# Оператор для создания индивидуумов со случайными генами 0 или 1:
+toolbox.register("individualCreator", bitgenome.randomBits, creator.Individual, ONE_MAX_LENGTH)
 
 # Оператор для создания популяции:
 toolbox.register("populationCreator", tools.initRepeat, list, toolbox.individualCreator)
@@ -38,7 +36,7 @@ toolbox.register("populationCreator", tools.initRepeat, list, toolbox.individual
 # Возвращает количество единиц в битовой строке
 
 def oneMaxFitness(individual):
-    return sum(individual),  # Возвращаем кортеж
+    return individual.count(),  # Возвращаем кортеж (количество единиц считается по словам)
 
 toolbox.register("evaluate", oneMaxFitness)
 
@@ -48,11 +46,11 @@ toolbox.register("evaluate", oneMaxFitness)
 toolbox.register("select", tools.selTournament, tournsize = 3)
 
 # Одноточечное скрещивание:
-toolbox.register("mate", tools.cxOnePoint)
+toolbox.register("mate", bitgenome.cxOnePoint)
 
 # Мутация: инвертирование битов с вероятностью 1/ONE_MAX_LENGTH
 
-toolbox.register("mutate", tools.mutFlipBit, indpb = 1.0 / ONE_MAX_LENGTH)
+toolbox.register("mutate", bitgenome.mutFlipBit, indpb = 1.0 / ONE_MAX_LENGTH)
 
 # Основной поток генетического алгоритма:
 def main():
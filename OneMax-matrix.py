@@ -0,0 +1,58 @@
+from deap import base
+
+import time
+import matplotlib.pyplot as plt
+import numpy as np
+import matrixga
+import selection
+import streamstats
+
+# константы задачи
+ONE_MAX_LENGTH = 1000   # длина подлежащей оптимизации битовой строки
+
+# константы генетического алгоритма
+POPULATION_SIZE = 50000  # количество индивидуумов в популяции
+P_CROSSOVER = 0.9        # вероятность скрещивания
+P_MUTATION = 0.1         # вероятность мутации индивидуума
+MAX_GENERATIONS = 50     # максимальное количество поколений
+HALL_OF_FAME_SIZE = 10
+
+RANDOM_SEED = 42
+rng = np.random.default_rng(RANDOM_SEED)
+
+# популяция - один массив (POPULATION_SIZE, ONE_MAX_LENGTH), все операторы работают сразу со всей популяцией:
+toolbox = base.Toolbox()
+
+toolbox.register("populationCreator", matrixga.randomPopulation, length = ONE_MAX_LENGTH, rng = rng)
+toolbox.register("evaluate", matrixga.oneMaxFitness)
+toolbox.register("select", selection.tournament, tournsize = 3)
+toolbox.register("mate", matrixga.cxOnePoint)
+toolbox.register("mutate", matrixga.mutFlipBit, indpb = 1.0 / ONE_MAX_LENGTH)
+
+population = toolbox.populationCreator(n = POPULATION_SIZE)
+
+# статистика считается по вектору приспособленности всей популяции:
+stats = streamstats.FitnessStatistics(("max", "avg"))
+
+hof = matrixga.HallOfFame(HALL_OF_FAME_SIZE)
+
+start = time.perf_counter()
+population, logbook = matrixga.eaSimple(population, toolbox,
+                                        cxpb = P_CROSSOVER,
+                                        mutpb = P_MUTATION,
+                                        ngen = MAX_GENERATIONS,
+                                        stats = stats,
+                                        halloffame = hof,
+                                        verbose = True,
+                                        rng = rng)
+print("Время = {:.2f} с".format(time.perf_counter() - start))
+print("Лучшая приспособленность = ", hof.values[0])
+
+maxFitnessValues, meanFitnessValues = logbook.select("max", "avg")
+
+plt.plot(maxFitnessValues, color = 'red')
+plt.plot(meanFitnessValues, color = 'green')
+plt.xlabel('Поколение')
+plt.ylabel('Макс/средняя приспособленность')
+plt.title('Зависимость максимальной и средней приспособленности от поколения')
+plt.show()
@@ -3,7 +3,7 @@ from deap import creator
 from deap import tools
 from deap import algorithms
 import random
-import numpy
+import streamstats
 import matplotlib.pyplot as plt
 import seaborn as sns
 
@@ -63,9 +63,7 @@ def main():
     population = toolbox.populationCreator(n = POPULATION_SIZE)
 
     # Создаем объект для сбора статистики
-    stats = tools.Statistics(lambda ind: ind.fitness.values)
-    stats.register("max", numpy.max)
-    stats.register("avg", numpy.mean)
+    stats = streamstats.FitnessStatistics(("max", "avg"))
 
     # Создаем зал славы (Hall of Fame)
     hof = tools.HallOfFame(HALL_OF_FAME_SIZE)
@@ -3,7 +3,7 @@ from deap import creator
 from deap import tools
 from deap import algorithms
 import random
-import numpy
+import streamstats
 import matplotlib.pyplot as plt
 import seaborn as sns
 
@@ -60,9 +60,7 @@ def main():
     population = toolbox.populationCreator(n = POPULATION_SIZE)
 
     # Создание объекта для сбора статистики
-    stats = tools.Statistics(lambda ind: ind.fitness.values)
-    stats.register("max", numpy.max)
-    stats.register("avg", numpy.mean)
+    stats = streamstats.FitnessStatistics(("max", "avg"))
 
     # Запуск генетического алгоритма
     population, logbook = algorithms.eaSimple(
@@ -4,7 +4,8 @@ from deap import tools
 
 import random
 import matplotlib.pyplot as plt
-import numpy as np
+import bitgenome
+import streamstats
 
 # константы задачи
 ONE_MAX_LENGTH = 100    # длина подлежащей оптимизации битовой строки
@@ -19,27 +20,25 @@ RANDOM_SEED = 42
 random.seed(RANDOM_SEED)
 
 creator.create("FitnessMax", base.Fitness, weights = (1.0,))
-creator.create("Individual", list, fitness=creator.FitnessMax)
+# индивид - битовая строка, упакованная по 64 гена в слово:
+creator.create("Individual", bitgenome.PackedBits, fitness=creator.FitnessMax)
 
 def oneMaxFitness(individual):
-    return sum(individual), # кортеж
+    return individual.count(), # кортеж (количество единиц считается по словам)
 
 toolbox = base.Toolbox()
 
-toolbox.register("zeroOrOne", random.randint, 0, 1)
-toolbox.register("individualCreator", tools.initRepeat, creator.Individual, toolbox.zeroOrOne, ONE_MAX_LENGTH)
+toolbox.register("individualCreator", bitgenome.randomBits, creator.Individual, ONE_MAX_LENGTH)
 toolbox.register("populationCreator", tools.initRepeat, list, toolbox.individualCreator)
 
 population = toolbox.populationCreator(n = POPULATION_SIZE)
 
 toolbox.register("evaluate", oneMaxFitness)
 toolbox.register("select", tools.selTournament, tournsize = 3)
-toolbox.register("mate", tools.cxOnePoint)
-toolbox.register("mutate", tools.mutFlipBit, indpb = 1.0 / ONE_MAX_LENGTH)
+toolbox.register("mate", bitgenome.cxOnePoint)
+toolbox.register("mutate", bitgenome.mutFlipBit, indpb = 1.0 / ONE_MAX_LENGTH)
 
-stats = tools.Statistics(lambda ind: ind.fitness.values)
-stats.register("max", np.max)
-stats.register("avg", np.mean)
+stats = streamstats.FitnessStatistics(("max", "avg"))
 
 population, logbook = algorithms.eaSimple(population, toolbox,
                                           cxpb = P_CROSSOVER,
@@ -7,16 +7,21 @@ sys.stdout.reconfigure(encoding = 'utf-8')
 from deap import base, algorithms
 from deap import creator
 from deap import tools
-import algelitism
+import os
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+import evolution
+import selection
+import streamstats
+import seabattle
 from graph_show import show_graph, show_ships
 import random
 import matplotlib.pyplot as plt
-import numpy as np
 
 # Константы, определяющие размеры поля и количество кораблей
 POLE_SIZE = 7
-SHIPS = 10
-LENGTH_CHROM = 3 * SHIPS  # Длина хромосомы, подлежащей оптимизации (каждый корабль описывается тремя числами)
+SHIPS = len(seabattle.SHIP_TYPES)
+LENGTH_CHROM = SHIPS  # Длина хромосомы, подлежащей оптимизации (каждый корабль - номер допустимой расстановки)
+AVOID_OVERLAP = True  # новые расстановки выбираются без касания других кораблей (если это возможно)
 
 # Параметры генетического алгоритма
 POPULATION_SIZE = 200   # Количество индивидуумов в популяции
@@ -34,76 +39,48 @@ random.seed(RANDOM_SEED)  # Инициализация генератора сл
 creator.create("FitnessMin", base.Fitness, weights = (-1.0,))  # Минлинг задача (меньше приспособленность - лучше)
 creator.create("Individual", list, fitness = creator.FitnessMin)  # Индивидуум будет представлять собой список
 
-# Функция для случайного создания хромосомы
-def randomShip(total):
-    ships = []
-    for n in range(total):
-        # Каждое судно представляется тремя числами (позиция X, позиция Y, ориентация)
-        ships.extend([random.randint(1, POLE_SIZE), random.randint(1, POLE_SIZE), random.randint(0, 1)])
-    return creator.Individual(ships)
+# Задача расстановки: клетки кораблей и их ореолов и таблицы допустимых расстановок вычисляются один раз
+seaBattle = seabattle.SeaBattleProblem(POLE_SIZE)
 
 # Инициализация инструментария для генетического алгоритма
 toolbox = base.Toolbox()
-toolbox.register("randomShip", randomShip, SHIPS)  # Регистрация функции для создания корабля
+# Каждое судно представляется номером расстановки (позиция X, позиция Y, ориентация), при которой оно целиком на поле
+toolbox.register("randomShip", seaBattle.randomPlacement, creator.Individual, avoidOverlap = AVOID_OVERLAP)
 toolbox.register("populationCreator", tools.initRepeat, list, toolbox.randomShip)  # Регистрация функции для создания популяции
 
 # Создание начальной популяции
 population = toolbox.populationCreator(n=POPULATION_SIZE)
 
-# Функция оценки приспособленности для каждого индивидуума (т.е. корабля)
+# Функция оценки приспособленности для каждого индивидуума (т.е. расстановки кораблей)
 def shipsFitness(individual):
-    # Типы кораблей: 4, 3, 3, 2, 2, 2, 1, 1, 1, 1
-    type_ship = [4, 3, 3, 2, 2, 2, 1, 1, 1, 1]
-
-    inf = 1000
-    P0 = np.zeros((POLE_SIZE, POLE_SIZE))  # Пустое поле
-    P = np.ones((POLE_SIZE + 6, POLE_SIZE + 6)) * inf  # Рабочее поле с запасом
-    P[1:POLE_SIZE + 1, 1 : POLE_SIZE + 1] = P0  # Заполнение области, соответствующей полю
-
-    th = 0.2
-    h = np.ones((3, 6)) * th  # Для горизонтальных кораблей
-    ship_one = np.ones((1, 4))  # Единичная длина корабля
-    v = np.ones((6, 3)) * th  # Для вертикальных кораблей
-
-    # Размещение кораблей на поле
-    for *ship, t in zip(*[iter(individual)] * 3, type_ship):
-        if ship[-1] == 0:  # Горизонтальный корабль
-            sh = np.copy(h[:, : t + 2])  # Создаем копию шаблона
-            sh[1, 1 :t + 1] = ship_one[0, :t]  # Размещение корабля на поле
-            P[ship[0] - 1 :ship[0] + 2, ship[1] - 1 :ship[1] + t + 1] += sh  # Размещение на поле
-        else:  # Вертикальный корабль
-            sh = np.copy(v[:t + 2, :])  # Копируем шаблон
-            sh[1 :t + 1, 1] = ship_one[0, :t]  # Размещение корабля
-            P[ship[0]-1 :ship[0] + t + 1, ship[1] - 1 :ship[1] + 2] += sh  # Размещение на поле
-
-    # Оценка приспособленности - сумма значений на поле
-    s = np.sum(P[np.bitwise_and(P > 1, P < inf)])  # Подсчитываем значения на поле
-    s += np.sum(P[P > inf + th * 4])  # Дополнительная проверка
-
-    return s,  # Возвращаем результат как кортеж
-
-# Функция мутации для кораблей
-def mutShips(individual, indpb):
-    for i in range(len(individual)):
-        if random.random() < indpb:
-            individual[i] = random.randint(0, 1) if (i+1) % 3 == 0 else random.randint(1, POLE_SIZE)
-    return individual,
+    return seaBattle.getCost(seaBattle.decode(individual)),  # Возвращаем результат как кортеж
 
 # Регистрация операций для генетического алгоритма
 toolbox.register("evaluate", shipsFitness)  # Оценка
-toolbox.register("select", tools.selTournament, tournsize=3)  # Селекция с турниром
+toolbox.register("select", selection.selTournament, tournsize=3)  # Селекция с турниром
 toolbox.register("mate", tools.cxTwoPoint)  # Скрещивание (двухточечное)
-toolbox.register("mutate", mutShips, indpb = 1.0 / LENGTH_CHROM)  # Мутация
+toolbox.register("mutate", seaBattle.mutPlacement, indpb = 1.0 / LENGTH_CHROM, avoidOverlap = AVOID_OVERLAP)  # Мутация
+
+# Пакетная оценка: подменяет toolbox.map, поэтому цикл eaSimpleWithElitism не меняется,
+# а поля всех индивидов с недействительной приспособленностью строятся одним сложением по индексам
+def mapShipsFitness(evaluate, individuals):
+    if getattr(evaluate, "func", evaluate) is not shipsFitness:
+        return list(map(evaluate, individuals))
+
+    if not individuals:
+        return []
+
+    return [(float(cost),) for cost in seaBattle.getCostBatch(seaBattle.decodeBatch(individuals))]
+
+toolbox.register("map", mapShipsFitness)
 
 # Статистика по популяции
-stats = tools.Statistics(lambda ind: ind.fitness.values)
-stats.register("min", np.min)  # Минимальная приспособленность
-stats.register("avg", np.mean)  # Средняя приспособленность
+stats = streamstats.FitnessStatistics(("min", "avg"))
 
 # Функция для отображения кораблей на графике
 def show(ax):
     ax.clear()
-    show_ships(ax, hof.items[0], POLE_SIZE)  # Отображаем лучший индивид
+    show_ships(ax, seaBattle.decode(hof.items[0]), POLE_SIZE, seaBattle.shipTypes)  # Отображаем лучший индивид
 
     plt.draw()
     plt.gcf().canvas.flush_events()
@@ -117,19 +94,19 @@ ax.set_xlim(-2, POLE_SIZE + 3)
 ax.set_ylim(-2, POLE_SIZE + 3)
 
 # Запуск генетического алгоритма с элитизмом
-population, logbook = algelitism.eaSimpleElitism(population, toolbox,
-                                                 cxpb = P_CROSSOVER,
-                                                 mutpb = P_MUTATION,
-                                                 ngen = MAX_GENERATIONS,
-                                                 halloffame = hof,
-                                                 stats = stats,
-                                                 callback = (show, (ax, )),  # Обновление графика после каждого поколения
-                                                 verbose = True)
+population, logbook = evolution.eaSimpleWithElitism(population, toolbox,
+                                                    cxpb = P_CROSSOVER,
+                                                    mutpb = P_MUTATION,
+                                                    ngen = MAX_GENERATIONS,
+                                                    halloffame = hof,
+                                                    stats = stats,
+                                                    callback = (show, (ax, )),  # Обновление графика после каждого поколения
+                                                    verbose = True)
 
 maxFitnessValues, meanFitnessValues = logbook.select("min", "avg")
 
 best = hof.items[0]
-print(best)  # Вывод лучшего индивидуума
+print(seaBattle.decode(best))  # Вывод лучшего индивидуума (тройки X, Y, ориентация)
 
 # Выключаем интерактивный режим и показываем график
 plt.ioff()
@@ -40,12 +40,10 @@ def show_graph(ax, best):
     ax.plot(vx, vy, ' ob', markersize = 15)
 
 # Начальные данные для кораблей
-v_ship = np.array([0, 1, 2, 3])
-h_ship = np.array([0, 0, 0, 0])
 type_ship = [4, 3, 3, 2, 2, 2, 1, 1, 1, 1]
 colors = ['g', 'b', 'm', 'y']
 
-def show_ships(ax, best, pole_size):
+def show_ships(ax, best, pole_size, ship_types = type_ship):
     # Добавляем прямоугольник, представляющий поле
     rect = Rectangle((0, 0), pole_size + 1, pole_size + 1, fill = None, edgecolor = 'r')
 
@@ -54,15 +52,18 @@ def show_ships(ax, best, pole_size):
         x = best[i]
         y = best[i + 1]
         r = best[i + 2]
-        t = type_ship[t_n]
+        t = ship_types[t_n]
         t_n += 1
+        v_ship = np.arange(t)
+        h_ship = np.zeros(t, dtype = int)
+        color = colors[(t - 1) % len(colors)]
 
         if r == 1:
             # Рисуем вертикальные корабли
-            ax.plot(v_ship[:t] + x, h_ship[:t] + y, ' sb', markersize = 18, alpha = 0.8, markerfacecolor = colors[t - 1])
+            ax.plot(v_ship + x, h_ship + y, ' sb', markersize = 18, alpha = 0.8, markerfacecolor = color)
         else:
             # Рисуем горизонтальные корабли
-            ax.plot(h_ship[:t] + x, v_ship[:t] + y, ' sb', markersize = 18, alpha = 0.8, markerfacecolor = colors[t - 1])
+            ax.plot(h_ship + x, v_ship + y, ' sb', markersize = 18, alpha = 0.8, markerfacecolor = color)
 
     # Добавляем прямоугольник на поле
     ax.add_patch(rect)
@@ -0,0 +1,244 @@
+# Установите старую версию numpy (например, 1.21.0), где np.bool8 поддерживается:
+# pip install numpy==1.21.0
+
+import sys
+sys.stdout.reconfigure(encoding = 'utf-8')
+
+import random
+import numpy as np
+
+# Хромосома задаётся либо тройками координат (см. SeaBattleProblem), либо номерами расстановок: для каждой длины
+# корабля есть таблица legalPlacements[t] всех расстановок (X, Y, ориентация), при которых корабль целиком
+# на поле, и ген корабля - номер строки в таблице его длины. Такие хромосомы создаются и мутируют только
+# в допустимые расстановки (при avoidOverlap - ещё и без пересечений с ореолами других кораблей):
+#
+#     creator.create("Individual", list, fitness = creator.FitnessMin)
+#     toolbox.register("individualCreator", seaBattle.randomPlacement, creator.Individual, avoidOverlap = True)
+#     toolbox.register("mutate", seaBattle.mutPlacement, indpb = 1.0 / len(seabattle.SHIP_TYPES), avoidOverlap = True)
+#     costs = seaBattle.getCostBatch(seaBattle.decodeBatch(population))
+
+# Длины кораблей флота: 4, 3, 3, 2, 2, 2, 1, 1, 1, 1
+SHIP_TYPES = (4, 3, 3, 2, 2, 2, 1, 1, 1, 1)
+
+# Значения клеток рабочего поля в целых единицах (1 единица = 0.2): клетка корабля - 1, клетка ореола вокруг
+# корабля - 0.2, клетка вне поля - 1000. Целые единицы не зависят от порядка сложения кораблей.
+SHIP_UNITS = 5
+HALO_UNITS = 1
+INF_UNITS = 5000
+OUTSIDE_HALO_LIMIT = 4  # количество клеток ореола вне поля, которое не штрафуется
+
+
+class SeaBattleProblem:
+    # Этот класс инкапсулирует задачу расстановки кораблей морского боя. Хромосома - тройки
+    # (строка X, столбец Y, ориентация) для каждого корабля: X и Y от 1 до poleSize, ориентация 0 - горизонтальный,
+    # 1 - вертикальный. Стоимость - сумма значений клеток рабочего поля, где корабли или их ореолы пересекаются,
+    # плюс клетки вне поля, занятые кораблём (или более чем OUTSIDE_HALO_LIMIT ореолами)
+
+    def __init__(self, poleSize, shipTypes = SHIP_TYPES):
+        # param poleSize: размер стороны поля
+        # param shipTypes: длины кораблей флота
+
+        self.poleSize = poleSize
+        self.shipTypes = list(shipTypes)
+        if not self.shipTypes or min(self.shipTypes) < 1:
+            raise ValueError("Длины кораблей должны быть положительными: ", self.shipTypes)
+
+        # рабочее поле с запасом: клетки 1..poleSize - поле, остальные - вне поля; запас вмещает самый длинный
+        # корабль с ореолом, поставленный у края поля (индексы клеток не выходят за строку и за поле)
+        self.fieldSize = poleSize + max(self.shipTypes) + 2
+        field = np.full((self.fieldSize, self.fieldSize), INF_UNITS, dtype = np.int64)
+        field[1:poleSize + 1, 1:poleSize + 1] = 0
+        self.emptyField = field.ravel()
+
+        self.initPlacementIndex()
+
+    def __len__(self):
+        # return: длина хромосомы
+        return 3 * len(self.shipTypes)
+
+    def initPlacementIndex(self):
+        # Заранее вычисляет для каждой длины корабля и каждой расстановки (X, Y, ориентация) индексы клеток
+        # рабочего поля (в развёрнутом виде), занятых кораблём и его ореолом, и их значения в единицах:
+        # placementCells[t] - массив (poleSize + 1, poleSize + 1, 2, 3 * (t + 2)), placementUnits[t] - (2, 3 * (t + 2))
+
+        self.placementCells = {}
+        self.placementUnits = {}
+
+        coordinates = np.arange(self.poleSize + 1)
+        for t in sorted(set(self.shipTypes)):
+            # прямоугольник 3 x (t + 2) вокруг горизонтального корабля (для вертикального - транспонированный)
+            rows, cols = np.meshgrid(np.arange(3), np.arange(t + 2), indexing = 'ij')
+            rows, cols = rows.ravel(), cols.ravel()
+            units = np.where((rows == 1) & (cols >= 1) & (cols <= t), SHIP_UNITS, HALO_UNITS)
+
+            offsets = np.stack([(rows - 1) * self.fieldSize + (cols - 1),    # горизонтальный
+                                (cols - 1) * self.fieldSize + (rows - 1)])   # вертикальный
+            origins = coordinates[:, None] * self.fieldSize + coordinates[None, :]
+
+            cells = origins[:, :, None, None] + offsets[None, None, :, :]
+            cells[0, :] = cells[:, 0] = 0  # координаты 0 в хромосоме не встречаются
+
+            self.placementCells[t] = cells
+            self.placementUnits[t] = np.stack([units, units])
+
+        self.shipsOfLength = {t: np.array([k for k, length in enumerate(self.shipTypes) if length == t])
+                              for t in self.placementCells}
+
+        self.initLegalPlacements()
+
+    def initLegalPlacements(self):
+        # Составляет для каждой длины корабля таблицу расстановок, при которых корабль целиком на поле:
+        # legalPlacements[t] - массив (количество расстановок, 3) троек (X, Y, ориентация),
+        # legalShipCells[t] - индексы клеток рабочего поля, занятых самим кораблём (без ореола)
+
+        self.legalPlacements = {}
+        self.legalShipCells = {}
+
+        for t in self.placementCells:
+            x, y, orientation = np.meshgrid(np.arange(1, self.poleSize + 1), np.arange(1, self.poleSize + 1),
+                                            np.arange(2), indexing = 'ij')
+            x, y, orientation = x.ravel(), y.ravel(), orientation.ravel()
+
+            # горизонтальный корабль занимает столбцы y..y+t-1, вертикальный - строки x..x+t-1
+            inBounds = np.where(orientation == 0, y, x) + t - 1 <= self.poleSize
+            placements = np.stack([x, y, orientation], axis = 1)[inBounds]
+
+            steps = np.arange(t)
+            origins = placements[:, 0] * self.fieldSize + placements[:, 1]
+            strides = np.where(placements[:, 2] == 0, 1, self.fieldSize)
+
+            self.legalPlacements[t] = placements
+            self.legalShipCells[t] = origins[:, None] + strides[:, None] * steps[None, :]
+
+    def decodeBatch(self, population):
+        # Переводит хромосомы из номеров расстановок в тройки координат
+        # param population: двумерный массив (или список хромосом) номеров размера (размер популяции, количество кораблей)
+        # return: массив размера (размер популяции, len(self)) для getCostBatch
+
+        population = np.asarray(population, dtype = np.int64)
+        if population.ndim != 2 or population.shape[1] != len(self.shipTypes):
+            raise ValueError("Размер хромосомы должен быть равен ", len(self.shipTypes))
+
+        ships = np.empty((len(population), len(self.shipTypes), 3), dtype = np.int64)
+        for t, shipIndices in self.shipsOfLength.items():
+            ships[:, shipIndices] = self.legalPlacements[t][population[:, shipIndices]]
+
+        return ships.reshape(len(population), -1)
+
+    def decode(self, individual):
+        # return: список троек координат для хромосомы из номеров расстановок
+        return self.decodeBatch([individual])[0].tolist()
+
+    def choosePlacement(self, ship, blocked = None):
+        # Выбирает случайную допустимую расстановку корабля
+        # param ship: номер корабля во флоте
+        # param blocked: логическая маска клеток рабочего поля, занятых другими кораблями и их ореолами
+        # (None - без проверки); если свободных расстановок нет, выбирается любая
+        # return: номер расстановки в таблице длины корабля
+
+        t = self.shipTypes[ship]
+        if blocked is not None:
+            free = np.flatnonzero(~blocked[self.legalShipCells[t]].any(axis = 1))
+            if len(free):
+                return int(free[random.randrange(len(free))])
+
+        return random.randrange(len(self.legalPlacements[t]))
+
+    def blockPlacement(self, blocked, ship, index):
+        # Отмечает в маске клетки корабля и его ореола
+        x, y, orientation = self.legalPlacements[self.shipTypes[ship]][index]
+        blocked[self.placementCells[self.shipTypes[ship]][x, y, orientation]] = True
+
+    def randomPlacement(self, container, avoidOverlap = False):
+        # Создаёт хромосому из номеров случайных допустимых расстановок
+        # param container: класс индивида (список)
+        # param avoidOverlap: корабли расставляются по очереди, не касаясь уже поставленных
+
+        blocked = np.zeros(self.fieldSize * self.fieldSize, dtype = bool) if avoidOverlap else None
+        genes = []
+        for ship in range(len(self.shipTypes)):
+            genes.append(self.choosePlacement(ship, blocked))
+            if avoidOverlap:
+                self.blockPlacement(blocked, ship, genes[-1])
+
+        return container(genes)
+
+    def mutPlacement(self, individual, indpb, avoidOverlap = False):
+        # Мутация: каждый корабль с вероятностью indpb получает новую случайную допустимую расстановку
+        # param avoidOverlap: новая расстановка не касается остальных кораблей (если это возможно)
+
+        for ship in range(len(individual)):
+            if random.random() < indpb:
+                blocked = None
+                if avoidOverlap:
+                    blocked = np.zeros(self.fieldSize * self.fieldSize, dtype = bool)
+                    for other, index in enumerate(individual):
+                        if other != ship:
+                            self.blockPlacement(blocked, other, index)
+                individual[ship] = self.choosePlacement(ship, blocked)
+
+        return individual,
+
+    def getFieldBatch(self, population):
+        # Строит рабочие поля сразу для всей популяции: индексы клеток всех кораблей берутся из таблиц
+        # расстановок и складываются одним np.bincount в тензор (размер популяции, клетки поля)
+        # param population: двумерный массив (или список хромосом) размера (размер популяции, len(self))
+        # return: массив numpy.int64 размера (размер популяции, fieldSize * fieldSize) в единицах
+
+        population = np.asarray(population, dtype = np.int64)
+        if population.ndim != 2 or population.shape[1] != len(self):
+            raise ValueError("Размер хромосомы должен быть равен ", len(self))
+
+        numOfCells = self.fieldSize * self.fieldSize
+        ships = population.reshape(len(population), len(self.shipTypes), 3)
+        rowOffsets = (np.arange(len(population)) * numOfCells)[:, None, None]
+
+        indices = []
+        weights = []
+        for t, shipIndices in self.shipsOfLength.items():
+            genes = ships[:, shipIndices]
+            x, y, orientation = genes[..., 0], genes[..., 1], genes[..., 2]
+            indices.append((self.placementCells[t][x, y, orientation] + rowOffsets).ravel())
+            weights.append(self.placementUnits[t][orientation].ravel())
+
+        counts = np.bincount(np.concatenate(indices), weights = np.concatenate(weights),
+                             minlength = len(population) * numOfCells)
+
+        return counts.reshape(len(population), numOfCells).astype(np.int64) + self.emptyField
+
+    def getCostBatch(self, population):
+        # Рассчитывает стоимость сразу для всей популяции
+        # param population: двумерный массив (или список хромосом) размера (размер популяции, len(self))
+        # return: массив с рассчитанной стоимостью для каждой хромосомы
+
+        field = self.getFieldBatch(population)
+
+        # пересечения на поле и занятые клетки вне поля:
+        overlaps = (field > SHIP_UNITS) & (field < INF_UNITS)
+        outside = field > INF_UNITS + OUTSIDE_HALO_LIMIT * HALO_UNITS
+        total = np.where(overlaps | outside, field, 0).sum(axis = 1)
+
+        return total / SHIP_UNITS
+
+    def getCost(self, individual):
+        # Рассчитывает стоимость расстановки одной хромосомы
+        # param individual: список троек (X, Y, ориентация)
+        # return: рассчитанная стоимость
+
+        return float(self.getCostBatch([individual])[0])
+
+
+# тестирование класса:
+def main():
+    problem = SeaBattleProblem(7)
+
+    randomSolution = np.stack([np.random.randint(1, 8, size = len(SHIP_TYPES)),
+                               np.random.randint(1, 8, size = len(SHIP_TYPES)),
+                               np.random.randint(0, 2, size = len(SHIP_TYPES))], axis = 1).ravel()
+    print("Случайное решение = ")
+    print(randomSolution)
+    print("Стоимость = ", problem.getCost(randomSolution))
+
+
+if __name__ == "__main__":
+    main()
@@ -9,14 +9,22 @@ from deap import base
 from deap import creator
 from deap import tools
 import random
-import numpy
 import matplotlib.pyplot as plt
 import seaborn as sns
-import elitism
+import os
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+import bitgenome
+import checkpoint
+import evolution
+import fitnesscache
+import islands
+import selection
+import streamstats
 import nurses
 
 # Константы задачи:
 HARD_CONSTRAINT_PENALTY = 10  # коэффициент штрафа за нарушение жестких ограничений
+INSTANCE_FILE = None  # файл экземпляра задачи (.json или .npz); None - встроенный экземпляр из восьми медсестёр
 
 # Константы генетического алгоритма:
 POPULATION_SIZE = 300
@@ -24,6 +32,14 @@ P_CROSSOVER = 0.9  # вероятность кроссовера
 P_MUTATION = 0.1   # вероятность мутации индивидуума
 MAX_GENERATIONS = 200
 HALL_OF_FAME_SIZE = 30
+CACHE_SIZE = 100000  # количество запоминаемых значений приспособленности
+NUM_OF_ISLANDS = 1       # количество островов (процессов); больше 1 - островная модель с миграцией
+MIGRATION_INTERVAL = 10  # количество поколений между обменами мигрантами
+NUM_OF_MIGRANTS = 3      # количество лучших индивидов, отправляемых островом при обмене
+# файл снимков, например os.path.join(os.path.dirname(os.path.abspath(__file__)), "nurses-checkpoint.npz");
+# None - без снимков
+CHECKPOINT_FILE = None
+CHECKPOINT_FREQUENCY = 10  # количество поколений между снимками
 
 # Устанавливаем начальное значение случайного зерна:
 RANDOM_SEED = 42
@@ -32,19 +48,19 @@ random.seed(RANDOM_SEED)
 toolbox = base.Toolbox()
 
 # Создаем экземпляр задачи расписания медсестер:
-nsp = nurses.NurseSchedulingProblem(HARD_CONSTRAINT_PENALTY)
+if INSTANCE_FILE:
+    nsp = nurses.loadProblem(INSTANCE_FILE, HARD_CONSTRAINT_PENALTY)
+else:
+    nsp = nurses.NurseSchedulingProblem(HARD_CONSTRAINT_PENALTY)
 
 # Определяем единственную цель, максимизируя приспособленность:
 creator.create("FitnessMin", base.Fitness, weights = (-1.0,))
 
-# Создаем класс Individual на основе списка:
-creator.create("Individual", list, fitness = creator.FitnessMin)
+# Создаем класс Individual на основе битовой строки, упакованной по 64 смены в слово:
+creator.create("Individual", bitgenome.PackedBits, fitness = creator.FitnessMin)
 
-# Создаем оператор, который случайным образом возвращает 0 или 1:
-toolbox.register("zeroOrOne", random.randint, 0, 1)
-
-# Создаем оператор для заполнения экземпляра Individual:
-toolbox.register("individualCreator", tools.initRepeat, creator.Individual, toolbox.zeroOrOne, len(nsp))
+# Создаем оператор для заполнения экземпляра Individual случайными сменами 0 или 1:
+toolbox.register("individualCreator", bitgenome.randomBits, creator.Individual, len(nsp))
 
 # Создаем оператор для популяции, чтобы генерировать список индивидов:
 toolbox.register("populationCreator", tools.initRepeat, list, toolbox.individualCreator)
@@ -55,29 +71,63 @@ def getCost(individual):
 
 toolbox.register("evaluate", getCost)
 
+# Пакетная оценка: подменяет toolbox.map, поэтому цикл eaSimpleWithElitism не меняется,
+# а все индивиды с недействительной приспособленностью оцениваются одним векторным расчётом:
+def mapCost(evaluate, individuals):
+    if getattr(evaluate, "func", evaluate) is not getCost:
+        return list(map(evaluate, individuals))
+
+    if not individuals:
+        return []
+
+    # расписания распаковываются одним вызовом для всей пачки:
+    return [(int(cost),) for cost in nsp.getCostBatch(bitgenome.unpackPopulation(individuals))]
+
+toolbox.register("map", mapCost)
+
+# Кэш приспособленности поверх пакетной оценки: в пакет попадают только ещё не встречавшиеся расписания
+cache = fitnesscache.FitnessCache(CACHE_SIZE, toolbox.map, binary = True)
+toolbox.register("map", cache.map)
+
 # Генетические операторы:
-toolbox.register("select", tools.selTournament, tournsize = 2)
-toolbox.register("mate", tools.cxTwoPoint)
-toolbox.register("mutate", tools.mutFlipBit, indpb = 1.0 / len(nsp))
+toolbox.register("select", selection.selTournament, tournsize = 2)
+toolbox.register("mate", bitgenome.cxTwoPoint)
+toolbox.register("mutate", bitgenome.mutFlipBit, indpb = 1.0 / len(nsp))
 
 
 # Основной процесс генетического алгоритма:
 def main():
 
-    # Создаем начальную популяцию (поколение 0):
-    population = toolbox.populationCreator(n = POPULATION_SIZE)
-
     # Подготавливаем объект статистики:
-    stats = tools.Statistics(lambda ind: ind.fitness.values)
-    stats.register("min", numpy.min)
-    stats.register("avg", numpy.mean)
-
-    # Определяем объект hall-of-fame:
-    hof = tools.HallOfFame(HALL_OF_FAME_SIZE)
-
-    # Выполняем генетический алгоритм с добавленной функцией hall-of-fame:
-    population, logbook = elitism.eaSimpleWithElitism(population, toolbox, cxpb = P_CROSSOVER, mutpb = P_MUTATION,
-                                              ngen = MAX_GENERATIONS, stats = stats, halloffame = hof, verbose = True)
+    stats = streamstats.FitnessStatistics(("min", "avg"))
+    cache.registerStats(stats)
+
+    if NUM_OF_ISLANDS > 1:
+        # Островная модель: каждый остров - отдельный процесс со своей популяцией и своей копией кэша:
+        hof, logbooks = islands.eaIslands(toolbox, NUM_OF_ISLANDS, POPULATION_SIZE, cxpb = P_CROSSOVER,
+                                          mutpb = P_MUTATION, ngen = MAX_GENERATIONS,
+                                          migrationInterval = MIGRATION_INTERVAL, numOfMigrants = NUM_OF_MIGRANTS,
+                                          stats = stats, hallOfFameSize = HALL_OF_FAME_SIZE, verbose = True)
+        logbook = islands.combineLogbooks(logbooks, stats)
+    else:
+        # Создаем начальную популяцию (поколение 0):
+        population = toolbox.populationCreator(n = POPULATION_SIZE)
+
+        # Определяем объект hall-of-fame:
+        hof = tools.HallOfFame(HALL_OF_FAME_SIZE)
+
+        # Снимки состояния: прерванный запуск продолжается с последнего снимка при следующем запуске сценария
+        checkpointer = None
+        if CHECKPOINT_FILE:
+            # снимок другого экземпляра или штрафа не восстанавливается
+            checkpointer = checkpoint.Checkpointer(CHECKPOINT_FILE, CHECKPOINT_FREQUENCY, cache = cache,
+                                                   metadata = {"instance": os.path.abspath(INSTANCE_FILE) if INSTANCE_FILE else None,
+                                                               "penalty": HARD_CONSTRAINT_PENALTY})
+
+        # Выполняем генетический алгоритм с добавленной функцией hall-of-fame:
+        population, logbook = evolution.eaSimpleWithElitism(population, toolbox, cxpb = P_CROSSOVER, mutpb = P_MUTATION,
+                                                  ngen = MAX_GENERATIONS, stats = stats, halloffame = hof, verbose = True,
+                                                  checkpointer = checkpointer)
 
     # Печатаем лучшее найденное решение:
     best = hof.items[0]
@@ -0,0 +1,106 @@
+# Установите старую версию numpy (например, 1.21.0), где np.bool8 поддерживается:
+# pip install numpy==1.21.0
+
+import sys
+sys.stdout.reconfigure(encoding = 'utf-8')
+
+from deap import base
+from deap import creator
+from deap import tools
+import random
+import time
+import os
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+import evolution
+import selection
+import nurses
+
+# Замер производительности расчёта стоимости и генетического алгоритма
+# на синтетических экземплярах задачи с растущим количеством медсестёр и недель
+
+# Константы задачи:
+HARD_CONSTRAINT_PENALTY = 10
+
+# Размеры экземпляров (количество медсестёр, количество недель):
+SIZES = [(8, 1), (25, 2), (50, 4), (100, 4), (200, 8)]
+
+# Константы замера:
+POPULATION_SIZE = 300
+GENERATIONS = 3        # количество поколений генетического алгоритма для замера
+HALL_OF_FAME_SIZE = 30
+P_CROSSOVER = 0.9
+P_MUTATION = 0.1
+COST_SAMPLES = 20      # количество индивидов для замера getCost по одному
+
+RANDOM_SEED = 42
+
+creator.create("FitnessMin", base.Fitness, weights = (-1.0,))
+creator.create("Individual", list, fitness = creator.FitnessMin)
+
+
+def createToolbox(nsp):
+    # Создаёт набор операторов генетического алгоритма для данного экземпляра задачи,
+    # как в Code.py, с пакетной оценкой популяции
+
+    toolbox = base.Toolbox()
+    toolbox.register("zeroOrOne", random.randint, 0, 1)
+    toolbox.register("individualCreator", tools.initRepeat, creator.Individual, toolbox.zeroOrOne, len(nsp))
+    toolbox.register("populationCreator", tools.initRepeat, list, toolbox.individualCreator)
+
+    def getCost(individual):
+        return nsp.getCost(individual),
+
+    def mapCost(evaluate, individuals):
+        if not individuals:
+            return []
+        return [(int(cost),) for cost in nsp.getCostBatch(individuals)]
+
+    toolbox.register("evaluate", getCost)
+    toolbox.register("map", mapCost)
+    toolbox.register("select", selection.selTournament, tournsize = 2)
+    toolbox.register("mate", tools.cxTwoPoint)
+    toolbox.register("mutate", tools.mutFlipBit, indpb = 1.0 / len(nsp))
+
+    return toolbox
+
+
+def benchmark(numOfNurses, weeks):
+    # Замеряет время getCost на одно расписание, getCostBatch на популяцию и одного поколения ГА
+    # return: словарь с результатами замера в секундах
+
+    random.seed(RANDOM_SEED)
+    nsp = nurses.generateProblem(numOfNurses, weeks, HARD_CONSTRAINT_PENALTY, seed = RANDOM_SEED)
+    toolbox = createToolbox(nsp)
+    population = toolbox.populationCreator(n = POPULATION_SIZE)
+
+    start = time.perf_counter()
+    for individual in population[:COST_SAMPLES]:
+        nsp.getCost(individual)
+    costTime = (time.perf_counter() - start) / COST_SAMPLES
+
+    start = time.perf_counter()
+    nsp.getCostBatch(population)
+    batchTime = time.perf_counter() - start
+
+    hof = tools.HallOfFame(HALL_OF_FAME_SIZE)
+    start = time.perf_counter()
+    evolution.eaSimpleWithElitism(population, toolbox, cxpb = P_CROSSOVER, mutpb = P_MUTATION,
+                                  ngen = GENERATIONS, halloffame = hof, verbose = False)
+    generationTime = (time.perf_counter() - start) / (GENERATIONS + 1)  # поколение 0 тоже оценивается
+
+    return {"nurses": numOfNurses, "weeks": weeks, "genes": len(nsp),
+            "cost": costTime, "batch": batchTime, "generation": generationTime}
+
+
+def main():
+    print("{:>10} {:>6} {:>8} {:>14} {:>16} {:>14}".format(
+        "медсёстры", "недели", "гены", "getCost, мс", "getCostBatch, мс", "поколение, мс"))
+
+    for numOfNurses, weeks in SIZES:
+        result = benchmark(numOfNurses, weeks)
+        print("{nurses:>10} {weeks:>6} {genes:>8} {cost:>14.3f} {batch:>16.3f} {generation:>14.3f}".format(
+            **{key: value * 1000 if isinstance(value, float) else value for key, value in result.items()}))
+
+
+if __name__ == "__main__":
+    main()
@@ -3,36 +3,63 @@
 
 import sys
 sys.stdout.reconfigure(encoding = 'utf-8')
+import json
 import numpy as np
 
 class NurseSchedulingProblem:
     # Этот класс инкапсулирует задачу планирования смен медсестёр
 
-    def __init__(self, hardConstraintPenalty):
+    def __init__(self, hardConstraintPenalty, nurses = None, shiftPreference = None, shiftMin = None, shiftMax = None,
+                 maxShiftsPerWeek = 5, weeks = 1):
         # param hardConstraintPenalty: коэффициент штрафа за нарушение жёсткого ограничения
+        # param nurses: список имён медсестёр (по умолчанию - восемь медсестёр 'A'..'H')
+        # param shiftPreference: предпочтения каждой медсестры по сменам дня (1 - смена желательна)
+        # param shiftMin, shiftMax: минимальное и максимальное количество медсестёр на каждую смену дня
+        # param maxShiftsPerWeek: максимальное количество смен в неделю для каждой медсестры
+        # param weeks: количество недель, для которых создаётся расписание
+        # Экземпляры большего размера можно загрузить из файла (loadProblem) или сгенерировать (generateProblem)
         
         self.hardConstraintPenalty = hardConstraintPenalty
 
         # список медсестёр:
-        self.nurses = ['A', 'B', 'C', 'D', 'E', 'F', 'G', 'H']
+        self.nurses = list(nurses) if nurses is not None else ['A', 'B', 'C', 'D', 'E', 'F', 'G', 'H']
 
         # предпочтения медсестёр по сменам - утренним, вечерним, ночным:
-        self.shiftPreference = [[1, 0, 0], [1, 1, 0], [0, 0, 1], [0, 1, 0], [0, 0, 1], [1, 1, 1], [0, 1, 1], [1, 1, 1]]
+        if shiftPreference is None:
+            shiftPreference = [[1, 0, 0], [1, 1, 0], [0, 0, 1], [0, 1, 0], [0, 0, 1], [1, 1, 1], [0, 1, 1], [1, 1, 1]]
+        self.shiftPreference = [[int(pref) for pref in nursePreference] for nursePreference in shiftPreference]
 
         # минимальное и максимальное количество медсестёр на каждую смену - утреннюю, вечернюю, ночную:
-        self.shiftMin = [2, 2, 1]
-        self.shiftMax = [3, 4, 2]
+        self.shiftMin = [int(n) for n in shiftMin] if shiftMin is not None else [2, 2, 1]
+        self.shiftMax = [int(n) for n in shiftMax] if shiftMax is not None else [3, 4, 2]
 
         # максимальное количество смен в неделю для каждой медсестры
-        self.maxShiftsPerWeek = 5
+        self.maxShiftsPerWeek = int(maxShiftsPerWeek)
 
         # количество недель, для которых создаётся расписание:
-        self.weeks = 1
+        self.weeks = int(weeks)
+
+        if len(self.shiftMin) != len(self.shiftMax):
+            raise ValueError("Количество смен в shiftMin и shiftMax должно совпадать")
+        if len(self.shiftPreference) != len(self.nurses) or any(len(p) != len(self.shiftMin) for p in self.shiftPreference):
+            raise ValueError("Предпочтения должны быть заданы для каждой медсестры и каждой смены дня")
 
         # полезные значения:
         self.shiftPerDay = len(self.shiftMin)
         self.shiftsPerWeek = 7 * self.shiftPerDay
 
+        # массивы для векторизованного расчёта стоимости:
+        self.initCostArrays()
+
+    def initCostArrays(self):
+        # Готовит массивы, используемые getCostBatch: маску нежелательных смен для каждой медсестры
+        # и минимальное/максимальное количество медсестёр для каждой смены недели
+
+        daysPerWeek = self.shiftsPerWeek // self.shiftPerDay
+        self.unwantedShiftMask = np.tile(np.asarray(self.shiftPreference, dtype = np.int8) == 0, (1, daysPerWeek))
+        self.weeklyShiftMin = np.tile(np.asarray(self.shiftMin), daysPerWeek)
+        self.weeklyShiftMax = np.tile(np.asarray(self.shiftMax), daysPerWeek)
+
     def __len__(self):
         # return: количество смен в расписании
         return len(self.nurses) * self.shiftsPerWeek * self.weeks
@@ -46,14 +73,35 @@ class NurseSchedulingProblem:
         if len(schedule) != self.__len__():
             raise ValueError("Размер списка расписания должен быть равен ", self.__len__())
 
-        # преобразуем всё расписание в словарь с отдельным расписанием для каждой медсестры:
-        nurseShiftsDict = self.getNurseShifts(schedule)
+        return int(self.getCostBatch([schedule])[0])
 
-        # считаем различные нарушения:
-        consecutiveShiftViolations = self.countConsecutiveShiftViolations(nurseShiftsDict)
-        shiftsPerWeekViolations = self.countShiftsPerWeekViolations(nurseShiftsDict)[1]
-        nursesPerShiftViolations = self.countNursesPerShiftViolations(nurseShiftsDict)[1]
-        shiftPreferenceViolations = self.countShiftPreferenceViolations(nurseShiftsDict)
+    def getCostBatch(self, population):
+        # Рассчитывает стоимость сразу для всей популяции: популяция один раз приводится к массиву
+        # (популяция, медсёстры, недели, смены в неделю), и все четыре вида нарушений считаются векторно
+        # param population: двумерный массив (или список расписаний) размера (размер популяции, len(self))
+        # return: массив с рассчитанной стоимостью для каждого расписания
+
+        population = np.asarray(population, dtype = np.int8)
+        if population.ndim != 2 or population.shape[1] != self.__len__():
+            raise ValueError("Размер списка расписания должен быть равен ", self.__len__())
+
+        shifts = population.reshape(len(population), len(self.nurses), self.weeks, self.shiftsPerWeek)
+        nurseShifts = shifts.reshape(len(population), len(self.nurses), -1)
+
+        # две последовательные смены одной медсестры (в том числе на стыке недель):
+        consecutiveShiftViolations = np.count_nonzero(nurseShifts[:, :, :-1] & nurseShifts[:, :, 1:], axis = (1, 2))
+
+        # превышение максимального количества смен в неделю:
+        weeklyShifts = shifts.sum(axis = 3, dtype = np.int32)
+        shiftsPerWeekViolations = np.maximum(weeklyShifts - self.maxShiftsPerWeek, 0).sum(axis = (1, 2))
+
+        # количество медсестёр на каждой смене вне допустимого диапазона:
+        nursesPerShift = shifts.sum(axis = 1, dtype = np.int32)
+        nursesPerShiftViolations = (np.maximum(nursesPerShift - self.weeklyShiftMax, 0) +
+                                    np.maximum(self.weeklyShiftMin - nursesPerShift, 0)).sum(axis = (1, 2))
+
+        # смены, назначенные медсестре вопреки её предпочтениям:
+        shiftPreferenceViolations = np.count_nonzero(shifts & self.unwantedShiftMask[:, np.newaxis, :], axis = (1, 2, 3))
 
         # рассчитываем стоимость нарушений:
         hardContstraintViolations = consecutiveShiftViolations + nursesPerShiftViolations + shiftsPerWeekViolations
@@ -135,8 +183,8 @@ class NurseSchedulingProblem:
         
         violations = 0
         for nurseIndex, shiftPreference in enumerate(self.shiftPreference):
-            # дублируем предпочтения по сменам на дни периода
-            preference = shiftPreference * (self.shiftsPerWeek // self.shiftPerDay)
+            # дублируем предпочтения по сменам на дни всех недель периода
+            preference = shiftPreference * (self.shiftsPerWeek // self.shiftPerDay) * self.weeks
             # проходим по сменам и сравниваем с предпочтениями:
             shifts = nurseShiftsDict[self.nurses[nurseIndex]]
             for pref, shift in zip(preference, shifts):
@@ -173,6 +221,76 @@ class NurseSchedulingProblem:
         print()
 
 
+def loadProblem(path, hardConstraintPenalty):
+    # Загружает экземпляр задачи из файла JSON или NPZ с ключами nurses, shiftPreference,
+    # shiftMin, shiftMax и (необязательно) maxShiftsPerWeek, weeks
+    # param path: путь к файлу (.json или .npz)
+    # param hardConstraintPenalty: коэффициент штрафа за нарушение жёсткого ограничения
+    # return: экземпляр NurseSchedulingProblem
+
+    if str(path).endswith(".npz"):
+        with np.load(path) as data:
+            instance = {key: data[key].tolist() for key in data.files}
+    else:
+        with open(path, encoding = 'utf-8') as file:
+            instance = json.load(file)
+
+    return NurseSchedulingProblem(hardConstraintPenalty, **instance)
+
+
+def saveProblem(problem, path):
+    # Сохраняет экземпляр задачи в файл JSON или NPZ (формат выбирается по расширению)
+    # param problem: экземпляр NurseSchedulingProblem
+    # param path: путь к файлу (.json или .npz)
+
+    instance = {
+        "nurses": problem.nurses,
+        "shiftPreference": problem.shiftPreference,
+        "shiftMin": problem.shiftMin,
+        "shiftMax": problem.shiftMax,
+        "maxShiftsPerWeek": problem.maxShiftsPerWeek,
+        "weeks": problem.weeks,
+    }
+
+    if str(path).endswith(".npz"):
+        np.savez_compressed(path, nurses = np.array(problem.nurses, dtype = str),
+                            shiftPreference = np.array(problem.shiftPreference, dtype = np.int8),
+                            **{key: np.array(value) for key, value in instance.items() if key not in ("nurses", "shiftPreference")})
+    else:
+        with open(path, "w", encoding = 'utf-8') as file:
+            json.dump(instance, file, ensure_ascii = False)
+
+
+def generateProblem(numOfNurses, weeks, hardConstraintPenalty, maxShiftsPerWeek = 5, seed = None):
+    # Генерирует синтетический экземпляр задачи произвольного размера.
+    # Требования к количеству медсестёр на смену масштабируются так, чтобы суммарная потребность
+    # была выполнима: в среднем на смену приходится numOfNurses * maxShiftsPerWeek / 21 медсестёр.
+    # param numOfNurses: количество медсестёр
+    # param weeks: количество недель
+    # param hardConstraintPenalty: коэффициент штрафа за нарушение жёсткого ограничения
+    # param maxShiftsPerWeek: максимальное количество смен в неделю для каждой медсестры
+    # param seed: начальное значение генератора случайных чисел
+    # return: экземпляр NurseSchedulingProblem
+
+    rng = np.random.default_rng(seed)
+    shiftPerDay = 3
+
+    # случайные предпочтения, у каждой медсестры хотя бы одна желательная смена:
+    shiftPreference = rng.integers(0, 2, size = (numOfNurses, shiftPerDay))
+    shiftPreference[np.arange(numOfNurses), rng.integers(0, shiftPerDay, size = numOfNurses)] = 1
+
+    # средняя загрузка смены и её распределение между утренней, вечерней и ночной сменами:
+    averageLoad = numOfNurses * maxShiftsPerWeek / (7 * shiftPerDay)
+    shiftLoad = averageLoad * rng.uniform(0.7, 1.0, size = shiftPerDay)
+    shiftMin = np.maximum(1, np.floor(0.7 * shiftLoad)).astype(int)
+    shiftMax = np.maximum(shiftMin + 1, np.ceil(1.3 * shiftLoad)).astype(int)
+
+    nurses = ["N{}".format(i) for i in range(numOfNurses)]
+
+    return NurseSchedulingProblem(hardConstraintPenalty, nurses, shiftPreference.tolist(), shiftMin.tolist(),
+                                  shiftMax.tolist(), maxShiftsPerWeek, weeks)
+
+
 # тестирование класса:
 def main():
     # создаём экземпляр задачи:
@@ -0,0 +1,229 @@
+# Установите старую версию numpy (например, 1.21.0), где np.bool8 поддерживается:
+# pip install numpy==1.21.0
+
+import sys
+sys.stdout.reconfigure(encoding = 'utf-8')
+
+import math
+import random
+import numpy as np
+
+# Бинарный геном, упакованный по 64 гена в слово numpy.uint64 (ген i - бит i & 63 слова i >> 6).
+# Вместо списка Python (указатель на объект int для каждого гена) геном занимает 1 бит на ген,
+# поэтому популяции из сотен тысяч индивидов с десятками тысяч генов помещаются в память.
+#
+#     creator.create("Individual", bitgenome.PackedBits, fitness = creator.FitnessMax)
+#     toolbox.register("individualCreator", bitgenome.randomBits, creator.Individual, ONE_MAX_LENGTH)
+#     toolbox.register("evaluate", bitgenome.oneMaxFitness)
+#     toolbox.register("mate", bitgenome.cxTwoPoint)
+#     toolbox.register("mutate", bitgenome.mutFlipBit, indpb = 1.0 / ONE_MAX_LENGTH)
+
+WORD_BITS = 64
+
+# количество единиц в каждом значении байта - для numpy без np.bitwise_count:
+POPCOUNT_TABLE = np.array([bin(i).count("1") for i in range(256)], dtype = np.uint8)
+
+
+def popcount(words):
+    # Считает количество единичных битов в массиве слов
+    # param words: массив numpy.uint64 (последняя ось - слова одного генома)
+    # return: количество единиц по последней оси
+
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count(words).sum(axis = -1, dtype = np.int64)
+
+    bytesView = np.ascontiguousarray(words).view(np.uint8)
+    return POPCOUNT_TABLE[bytesView].sum(axis = -1, dtype = np.int64)
+
+
+def rangeMask(start, stop):
+    # Строит маски слов для генов [start, stop)
+    # return: (индекс первого слова, массив масок для слов от первого до последнего затронутого)
+
+    first, last = start // WORD_BITS, (stop - 1) // WORD_BITS
+    mask = np.full(last - first + 1, np.iinfo(np.uint64).max, dtype = np.uint64)
+    mask[0] &= np.uint64(~((1 << (start % WORD_BITS)) - 1) & 0xFFFFFFFFFFFFFFFF)
+    if stop % WORD_BITS:
+        mask[-1] &= np.uint64((1 << (stop % WORD_BITS)) - 1)
+
+    return first, mask
+
+
+class PackedBits:
+    # Бинарный геном фиксированной длины, хранящийся в массиве numpy.uint64
+
+    def __init__(self, bits = ()):
+        # param bits: последовательность значений 0/1
+
+        bits = np.asarray(list(bits) if not hasattr(bits, "__len__") else bits, dtype = np.uint8).ravel()
+        self.length = len(bits)
+        self.words = np.zeros(-(-self.length // WORD_BITS), dtype = np.uint64)
+        packed = np.packbits(bits, bitorder = 'little')
+        self.words.view(np.uint8)[:len(packed)] = packed
+
+    def __len__(self):
+        # return: количество генов
+        return self.length
+
+    def __getitem__(self, index):
+        # Возвращает ген (для целого индекса) или список генов 0/1 (для среза, как у генома-списка)
+
+        if isinstance(index, slice):
+            return self.unpack()[index].tolist()
+
+        if index < 0:
+            index += self.length
+        if not 0 <= index < self.length:
+            raise IndexError("индекс гена вне генома")
+
+        return int(self.words[index // WORD_BITS] >> np.uint64(index % WORD_BITS)) & 1
+
+    def __setitem__(self, index, value):
+        # Устанавливает ген с целым индексом в значение 0/1
+
+        if index < 0:
+            index += self.length
+        if not 0 <= index < self.length:
+            raise IndexError("индекс гена вне генома")
+
+        bit = np.uint64(1 << (index % WORD_BITS))
+        if value:
+            self.words[index // WORD_BITS] |= bit
+        else:
+            self.words[index // WORD_BITS] &= ~bit
+
+    def __iter__(self):
+        return iter(self.unpack().tolist())
+
+    def __array__(self, dtype = None, copy = None):
+        bits = self.unpack()
+        return bits if dtype is None else bits.astype(dtype)
+
+    def __eq__(self, other):
+        if isinstance(other, PackedBits):
+            return self.length == other.length and np.array_equal(self.words, other.words)
+        return NotImplemented
+
+    def __ne__(self, other):
+        result = self.__eq__(other)
+        return result if result is NotImplemented else not result
+
+    __hash__ = None
+
+    def __repr__(self):
+        return "{}({})".format(type(self).__name__, "".join(map(str, self.unpack())))
+
+    def unpack(self):
+        # return: массив numpy.uint8 со значениями генов 0/1
+        return np.unpackbits(self.words.astype('<u8').view(np.uint8), count = self.length, bitorder = 'little')
+
+    def packedBytes(self):
+        # return: байты упакованного генома (компактный ключ, например для кэша приспособленности)
+        return self.words.tobytes()
+
+    def count(self):
+        # return: количество единичных генов
+        return int(popcount(self.words))
+
+
+def randomBits(container, length):
+    # Создаёт случайный геном заданной длины (аналог tools.initRepeat с random.randint(0, 1))
+    # param container: класс индивида, производный от PackedBits
+    # param length: количество генов
+    # return: индивид
+
+    individual = container()
+    individual.length = length
+    numOfWords = -(-length // WORD_BITS)
+    individual.words = np.array([random.getrandbits(WORD_BITS) for _ in range(numOfWords)], dtype = np.uint64)
+    if length % WORD_BITS:
+        individual.words[-1] &= np.uint64((1 << (length % WORD_BITS)) - 1)
+
+    return individual
+
+
+def oneMaxFitness(individual):
+    # Приспособленность для OneMax - количество единиц, считается по словам
+    return individual.count(),  # кортеж
+
+
+def swapRange(ind1, ind2, start, stop):
+    # Обменивает гены [start, stop) двух индивидов целыми словами с масками на границах
+
+    if start >= stop:
+        return
+
+    first, mask = rangeMask(start, stop)
+    words1 = ind1.words[first:first + len(mask)]
+    words2 = ind2.words[first:first + len(mask)]
+    difference = (words1 ^ words2) & mask
+    words1 ^= difference
+    words2 ^= difference
+
+
+def cxOnePoint(ind1, ind2):
+    # Одноточечный кроссовер - аналог tools.cxOnePoint (с той же последовательностью случайных чисел)
+
+    size = min(len(ind1), len(ind2))
+    cxpoint = random.randint(1, size - 1)
+    swapRange(ind1, ind2, cxpoint, size)
+
+    return ind1, ind2
+
+
+def cxTwoPoint(ind1, ind2):
+    # Двухточечный кроссовер - аналог tools.cxTwoPoint (с той же последовательностью случайных чисел)
+
+    size = min(len(ind1), len(ind2))
+    cxpoint1 = random.randint(1, size)
+    cxpoint2 = random.randint(1, size - 1)
+    if cxpoint2 >= cxpoint1:
+        cxpoint2 += 1
+    else:
+        cxpoint1, cxpoint2 = cxpoint2, cxpoint1
+
+    swapRange(ind1, ind2, cxpoint1, cxpoint2)
+
+    return ind1, ind2
+
+
+def mutFlipBit(individual, indpb):
+    # Побитовая мутация: каждый ген инвертируется с вероятностью indpb.
+    # Позиции инвертируемых генов выбираются геометрическими пропусками, поэтому
+    # число случайных чисел пропорционально числу мутаций, а не длине генома.
+
+    if indpb <= 0:
+        return individual,
+
+    positions = []
+    if indpb >= 1:
+        positions = range(individual.length)
+    else:
+        logSkip = math.log(1.0 - indpb)
+        position = -1
+        while True:
+            position += 1 + int(math.log(1.0 - random.random()) / logSkip)
+            if position >= individual.length:
+                break
+            positions.append(position)
+
+    if positions:
+        positions = np.asarray(positions, dtype = np.uint64)
+        np.bitwise_xor.at(individual.words, (positions // np.uint64(WORD_BITS)).astype(np.intp),
+                          np.left_shift(np.uint64(1), positions % np.uint64(WORD_BITS)))
+
+    return individual,
+
+
+def stackWords(population):
+    # Собирает слова всех индивидов в двумерный массив (размер популяции, слова генома)
+    return np.stack([ind.words for ind in population])
+
+
+def unpackPopulation(population):
+    # Распаковывает популяцию в двумерный массив генов 0/1 (размер популяции, длина генома)
+    # для пакетных функций оценки
+
+    length = len(population[0])
+    words = stackWords(population).astype('<u8')
+    return np.unpackbits(words.view(np.uint8), axis = 1, count = length, bitorder = 'little')
@@ -0,0 +1,265 @@
+# Установите старую версию numpy (например, 1.21.0), где np.bool8 поддерживается:
+# pip install numpy==1.21.0
+
+import sys
+sys.stdout.reconfigure(encoding = 'utf-8')
+
+import json
+import os
+import random
+import numpy as np
+
+from deap import tools
+
+# Контрольные точки для долгих запусков evolution.eaSimpleWithElitism. Снимок - один файл .npz без сжатия
+# (без pickle): геномы популяции и зала славы в виде двумерных массивов, значения приспособленности,
+# журнал по полям, состояния генераторов random и numpy.random и, если передан, кэш приспособленности.
+#
+#     checkpointer = checkpoint.Checkpointer("nurses.npz", frequency = 10, cache = cache)
+#     population, logbook = evolution.eaSimpleWithElitism(population, toolbox, ..., checkpointer = checkpointer)
+#
+# Если файл уже есть, запуск продолжается с сохранённого поколения и совпадает с непрерывным запуском
+# (при последовательной оценке; состояние условий ранней остановки и рабочих процессов пула не сохраняется).
+# Снимок хранит описание запуска - размер популяции, форму генома, ngen и metadata сценария (файл экземпляра,
+# режим оценки); снимок другого запуска не восстанавливается (ValueError), а снимок завершённого запуска
+# (сохранённое поколение не меньше ngen) пропускается - запуск начинается заново.
+
+FORMAT_VERSION = 2
+
+
+def packGenomes(individuals):
+    # Собирает геномы индивидов в двумерный массив
+    # return: (массив геномов, массив длин геномов для bitgenome.PackedBits или None)
+
+    if hasattr(individuals[0], "words"):  # геном упакован по 64 гена в слово (bitgenome.PackedBits)
+        return np.stack([ind.words for ind in individuals]), np.array([len(ind) for ind in individuals])
+
+    return np.asarray([list(ind) for ind in individuals]), None
+
+
+def unpackGenomes(container, genomes, lengths):
+    # Восстанавливает индивидов класса container из массива геномов (обратное к packGenomes)
+
+    if lengths is None:
+        return [container(genome) for genome in genomes.tolist()]
+
+    individuals = []
+    for words, length in zip(genomes, lengths.tolist()):
+        ind = container()
+        ind.length = length
+        ind.words = words.copy()
+        individuals.append(ind)
+
+    return individuals
+
+
+def fitnessArrays(individuals):
+    # return: (взвешенные значения приспособленности, признаки действительности); для недействительных - NaN
+
+    numOfObjectives = len(individuals[0].fitness.weights)
+    wvalues = np.full((len(individuals), numOfObjectives), np.nan)
+    valid = np.zeros(len(individuals), dtype = bool)
+    for i, ind in enumerate(individuals):
+        if ind.fitness.valid:
+            wvalues[i] = ind.fitness.wvalues
+            valid[i] = True
+
+    return wvalues, valid
+
+
+def setFitness(individuals, wvalues, valid):
+    # Записывает сохранённые взвешенные значения приспособленности без пересчёта (бит в бит)
+
+    for ind, values, isValid in zip(individuals, wvalues.tolist(), valid.tolist()):
+        if isValid:
+            ind.fitness.wvalues = tuple(values)
+
+
+def encodeState(state):
+    # Кодирует состояние генератора numpy (словарь со скалярами и массивами) в массив байтов JSON
+    text = json.dumps(state, default = lambda value: value.tolist())
+    return np.frombuffer(text.encode('utf-8'), dtype = np.uint8)
+
+
+def generatorState(generator):
+    # return: состояние numpy.random.Generator или numpy.random.RandomState в виде словаря
+    if hasattr(generator, "bit_generator"):
+        return generator.bit_generator.state
+    return generator.get_state(legacy = False)
+
+
+def setGeneratorState(generator, state):
+    if hasattr(generator, "bit_generator"):
+        generator.bit_generator.state = state
+    else:
+        state["state"]["key"] = np.asarray(state["state"]["key"], dtype = np.uint32)
+        generator.set_state(state)
+
+
+def runDescription(population, metadata = None):
+    # Описание запуска, с которым сверяется снимок: размер популяции, форма генома и metadata
+    # return: словарь имя -> строка
+
+    genomes, lengths = packGenomes(population)
+    description = {"populationSize": str(len(population)), "genomeShape": str(list(genomes.shape[1:]))}
+    if lengths is not None:
+        description["genomeLengths"] = str(sorted(set(lengths.tolist())))
+    for name, value in (metadata or {}).items():
+        description[name] = str(value)
+
+    return description
+
+
+def checkDescription(path, data, population, metadata = None):
+    # Сверяет описание запуска, сохранённое в снимке, с текущим
+    # raise ValueError: снимок сделан для другого запуска (экземпляра, генома, режима оценки)
+
+    saved = {name[len("meta/"):]: str(data[name]) for name in data.files if name.startswith("meta/")}
+    for name, value in runDescription(population, metadata).items():
+        if saved.get(name) != value:
+            raise ValueError("контрольная точка {} сделана для другого запуска: {} = {}, ожидается {} "
+                             "(удалите файл, чтобы начать заново)".format(path, name, saved.get(name), value))
+
+
+def saveCheckpoint(path, gen, population, halloffame, logbook, eliteSize, cache = None, generators = None,
+                   metadata = None):
+    # Записывает снимок состояния алгоритма после поколения gen (через временный файл, поэтому
+    # прерывание во время записи не портит предыдущий снимок)
+    # param eliteSize: количество мест элиты в популяции (hof_size цикла eaSimpleWithElitism)
+    # param cache: fitnesscache.FitnessCache или None
+    # param generators: словарь имя -> numpy.random.Generator/RandomState (например, генератор среды gym)
+    # param metadata: словарь имя -> значение, описывающий запуск (сверяется при восстановлении)
+
+    arrays = {"version": np.array(FORMAT_VERSION), "gen": np.array(gen), "eliteSize": np.array(eliteSize)}
+    for name, value in runDescription(population, metadata).items():
+        arrays["meta/" + name] = np.array(value)
+
+    arrays["genomes"], lengths = packGenomes(population)
+    if lengths is not None:
+        arrays["lengths"] = lengths
+    arrays["wvalues"], arrays["valid"] = fitnessArrays(population)
+
+    if halloffame is not None and len(halloffame):
+        arrays["hofGenomes"], lengths = packGenomes(halloffame.items)
+        if lengths is not None:
+            arrays["hofLengths"] = lengths
+        arrays["hofWvalues"], _ = fitnessArrays(halloffame.items)
+
+    # журнал хранится по полям: одно поле - один массив значений по поколениям
+    fields = list(logbook[0].keys()) if logbook else []
+    arrays["logHeader"] = np.array(logbook.header or [], dtype = str)
+    arrays["logFields"] = np.array(fields, dtype = str)
+    for field in fields:
+        arrays["log/" + field] = np.asarray([record[field] for record in logbook])
+
+    version, internalState, gaussNext = random.getstate()
+    arrays["randomState"] = np.array(internalState, dtype = np.uint32)
+    arrays["randomGauss"] = np.array([] if gaussNext is None else [gaussNext])
+
+    _, keys, pos, hasGauss, cachedGaussian = np.random.get_state()
+    arrays["numpyRandomKeys"] = keys
+    arrays["numpyRandomPos"] = np.array([pos, hasGauss])
+    arrays["numpyRandomGauss"] = np.array(cachedGaussian)
+
+    for name, generator in (generators or {}).items():
+        arrays["generator/" + name] = encodeState(generatorState(generator))
+
+    if cache is not None:
+        arrays["cacheKeys"], arrays["cacheValues"] = cache.toArrays()
+
+    temporaryPath = path + ".tmp"
+    with open(temporaryPath, "wb") as file:
+        np.savez(file, **arrays)
+    os.replace(temporaryPath, path)
+
+
+def loadCheckpoint(path, population, halloffame, cache = None, generators = None, metadata = None):
+    # Восстанавливает снимок: популяция и зал славы заменяются на месте (класс индивидов берётся
+    # из population[0]), генераторы random, numpy.random и generators получают сохранённые состояния
+    # param metadata: описание запуска, которое должно совпасть с сохранённым (см. checkDescription)
+    # return: (журнал, количество мест элиты)
+
+    with np.load(path) as data:
+        if int(data["version"]) != FORMAT_VERSION:
+            raise ValueError("неподдерживаемая версия контрольной точки: {}".format(int(data["version"])))
+        checkDescription(path, data, population, metadata)
+
+        container = type(population[0])
+
+        restored = unpackGenomes(container, data["genomes"], data["lengths"] if "lengths" in data else None)
+        setFitness(restored, data["wvalues"], data["valid"])
+        population[:] = restored
+
+        if halloffame is not None:
+            halloffame.clear()
+            if "hofGenomes" in data:
+                items = unpackGenomes(container, data["hofGenomes"],
+                                      data["hofLengths"] if "hofLengths" in data else None)
+                setFitness(items, data["hofWvalues"], np.ones(len(items), dtype = bool))
+                # items упорядочены от лучшего к худшему, keys - в обратном порядке (как в HallOfFame.insert)
+                halloffame.items = items
+                halloffame.keys = [ind.fitness for ind in reversed(items)]
+
+        logbook = tools.Logbook()
+        logbook.header = data["logHeader"].tolist() or None
+        fields = data["logFields"].tolist()
+        columns = {}
+        for field in fields:
+            column = data["log/" + field]
+            # целые поля (gen, nevals, счётчики кэша) - как int, остальные - как скаляры и массивы numpy из stats
+            columns[field] = column.tolist() if column.ndim == 1 and column.dtype.kind in "iub" else list(column)
+        for i in range(len(columns[fields[0]]) if fields else 0):
+            logbook.record(**{field: columns[field][i] for field in fields})
+
+        internalState = tuple(data["randomState"].tolist())
+        gaussNext = data["randomGauss"].tolist()
+        random.setstate((3, internalState, gaussNext[0] if gaussNext else None))
+
+        pos, hasGauss = data["numpyRandomPos"].tolist()
+        np.random.set_state(("MT19937", data["numpyRandomKeys"], pos, hasGauss, float(data["numpyRandomGauss"])))
+
+        for name, generator in (generators or {}).items():
+            setGeneratorState(generator, json.loads(data["generator/" + name].tobytes().decode('utf-8')))
+
+        if cache is not None and "cacheKeys" in data:
+            cache.loadArrays(data["cacheKeys"], data["cacheValues"])
+
+        eliteSize = int(data["eliteSize"])
+
+    return logbook, eliteSize
+
+
+class Checkpointer:
+    # Периодическое сохранение и продолжение запуска для eaSimpleWithElitism (параметр checkpointer)
+
+    def __init__(self, path, frequency = 10, cache = None, generators = None, metadata = None):
+        # param path: файл снимка (.npz); если он существует и запуск в нём не завершён, запуск продолжается с него
+        # param frequency: снимок записывается каждые frequency поколений и после последнего поколения
+        # param cache: fitnesscache.FitnessCache, сохраняемый вместе со снимком
+        # param generators: словарь имя -> генератор numpy, состояние которого тоже сохраняется
+        # param metadata: словарь имя -> значение, описывающий задачу и режим оценки (например, файл экземпляра);
+        # снимок с другим описанием не восстанавливается
+
+        self.path = path
+        self.frequency = frequency
+        self.cache = cache
+        self.generators = generators
+        self.metadata = metadata or {}
+
+    def restore(self, population, halloffame, ngen):
+        # return: (журнал, количество мест элиты) или None, если снимка нет или он сделан после последнего поколения
+        if not os.path.exists(self.path):
+            return None
+
+        with np.load(self.path) as data:
+            if int(data["gen"]) >= ngen:
+                return None
+
+        return loadCheckpoint(self.path, population, halloffame, self.cache, self.generators,
+                              dict(self.metadata, ngen = ngen))
+
+    def update(self, gen, ngen, population, halloffame, logbook, eliteSize):
+        # Вызывается после каждого поколения; записывает снимок, если пора
+        if gen % self.frequency == 0 or gen == ngen:
+            saveCheckpoint(self.path, gen, population, halloffame, logbook, eliteSize, self.cache, self.generators,
+                           dict(self.metadata, ngen = ngen))
@@ -0,0 +1,214 @@
+# Установите старую версию numpy (например, 1.21.0), где np.bool8 поддерживается:
+# pip install numpy==1.21.0
+
+import sys
+sys.stdout.reconfigure(encoding = 'utf-8')
+
+import numpy as np
+
+from deap import tools
+import matrixga
+
+# Движки для гладких непрерывных задач рядом с генетическим алгоритмом matrixga + realga: дифференциальная
+# эволюция DE/rand/1/bin и CMA-ES. Задача задаётся так же - toolbox.evaluate получает массив точек
+# (размер популяции, размерность) и возвращает вектор значений (например, realga.himmelblau), границы - LOW, UP.
+# Зал славы (matrixga.HallOfFame), журнал, callback и hooks - как в matrixga.eaSimple:
+#
+#     population = toolbox.populationCreator(n = POPULATION_SIZE)
+#     population, logbook = continuous.differentialEvolution(population, toolbox, ngen = 50, low = LOW, up = UP,
+#                                                            halloffame = hof, stats = stats, weight = -1.0)
+#     population, logbook = continuous.cmaES(toolbox, ngen = 50, low = LOW, up = UP, dimension = 2,
+#                                            halloffame = hof, stats = stats, weight = -1.0)
+#
+# param stopCondition обоих движков (и matrixga.eaSimple): функция (gen, population, fitness, logbook) -> bool
+# для ранней остановки, где fitness - вектор значений текущего поколения (см. stopWhenFitnessReaches)
+
+
+def stopWhenFitnessReaches(target, weight = 1.0):
+    # Условие ранней остановки для движков над популяцией-массивом: лучшее значение достигло target
+    # param weight: вес цели, как в base.Fitness: 1.0 - максимизация, -1.0 - минимизация
+
+    def stopCondition(gen, population, fitness, logbook):
+        return (fitness * weight).max() >= target * weight
+
+    return stopCondition
+
+
+class Generations:
+    # Общая часть цикла движков: журнал, зал славы, вывод, callback, hooks и условие остановки
+
+    def __init__(self, stats, halloffame, verbose, weight, callback, hooks, stopCondition):
+        self.stats = stats
+        self.halloffame = halloffame
+        self.verbose = verbose
+        self.weight = weight
+        self.callback = callback
+        self.hooks = hooks
+        self.stopCondition = stopCondition
+
+        self.logbook = tools.Logbook()
+        self.logbook.header = ['gen', 'nevals'] + (stats.fields if stats else [])
+
+    def record(self, gen, population, fitness, nevals):
+        # Записывает поколение в журнал и вызывает callback, hooks и условие остановки
+        # param population: оценённые точки поколения
+        # param fitness: их значения
+        # return: True, если нужно остановиться
+
+        if self.halloffame is not None:
+            self.halloffame.update(population, fitness, fitness * self.weight)
+
+        self.logbook.record(gen = gen, nevals = nevals, **matrixga.compileStats(self.stats, fitness))
+        if self.verbose:
+            print(self.logbook.stream)
+
+        if gen == 0:
+            return False
+
+        if self.callback:
+            self.callback[0](*self.callback[1])
+
+        for hook in self.hooks:
+            hook(gen, population, self.halloffame, self.logbook)
+
+        return self.stopCondition is not None and self.stopCondition(gen, population, fitness, self.logbook)
+
+
+def randomOthers(n, count, rng):
+    # Для каждой строки i выбирает count различных номеров строк, отличных от i
+    # return: массив размера (n, count)
+
+    # номера выбираются среди n - 1 строк без строки i: k-й номер - среди n - 1 - k ещё не выбранных,
+    # затем сдвигается за уже выбранные номера (по возрастанию)
+    others = np.empty((n, count), dtype = np.int64)
+    for k in range(count):
+        choice = rng.integers(0, n - 1 - k, size = n)
+        for taken in np.sort(others[:, :k], axis = 1).T:
+            choice += choice >= taken
+        others[:, k] = choice
+
+    return others + (others >= np.arange(n)[:, None])
+
+
+def differentialEvolution(population, toolbox, ngen, low, up, F = 0.5, CR = 0.9, stats = None, halloffame = None,
+                          verbose = __debug__, weight = 1.0, rng = None, callback = None, hooks = (),
+                          stopCondition = None):
+    # Дифференциальная эволюция DE/rand/1/bin: мутант строки i - x[r1] + F * (x[r2] - x[r3]) для трёх различных
+    # строк, отличных от i; пробная точка берёт гены мутанта с вероятностью CR (один ген - всегда)
+    # и заменяет строку, если не хуже её
+    # param population: начальный массив (размер популяции не меньше 4, размерность)
+    # param toolbox: набор операторов с зарегистрированным evaluate
+    # param low, up: границы (числа или векторы длины размерности); пробные точки обрезаются по ним
+    # param F: коэффициент разностного вектора
+    # param CR: вероятность кроссовера
+    # param weight: вес цели, как в base.Fitness: 1.0 - максимизация, -1.0 - минимизация
+    # param rng: генератор numpy.random.Generator
+    # return: итоговая популяция и журнал
+
+    rng = rng or np.random.default_rng()
+    population = np.array(population, dtype = float)
+    n, dimension = population.shape
+
+    generations = Generations(stats, halloffame, verbose, weight, callback, hooks, stopCondition)
+    fitness = np.asarray(toolbox.evaluate(population), dtype = float)
+    generations.record(0, population, fitness, n)
+
+    rows = np.arange(n)
+    for gen in range(1, ngen + 1):
+        r = randomOthers(n, 3, rng)
+        mutants = population[r[:, 0]] + F * (population[r[:, 1]] - population[r[:, 2]])
+
+        crossed = rng.random((n, dimension)) < CR
+        crossed[rows, rng.integers(0, dimension, size = n)] = True
+        trials = np.clip(np.where(crossed, mutants, population), low, up)
+
+        trialFitness = np.asarray(toolbox.evaluate(trials), dtype = float)
+        better = trialFitness * weight >= fitness * weight
+        population[better] = trials[better]
+        fitness[better] = trialFitness[better]
+
+        if generations.record(gen, population, fitness, n):
+            break
+
+    return population, generations.logbook
+
+
+def cmaES(toolbox, ngen, low, up, dimension = None, mean = None, sigma = None, lambda_ = None, stats = None,
+          halloffame = None, verbose = __debug__, weight = 1.0, rng = None, callback = None, hooks = (),
+          stopCondition = None):
+    # CMA-ES (mu/mu_w, lambda) с весами рекомбинации, путями эволюции и адаптацией длины шага (по Хансену).
+    # Поколение - lambda_ точек mean + sigma * B D z, обрезанных по границам и оценённых одним вызовом evaluate
+    # param toolbox: набор операторов с зарегистрированным evaluate
+    # param low, up: границы (числа или векторы длины размерности)
+    # param dimension: размерность (если не задано mean)
+    # param mean: начальный центр (по умолчанию - случайная точка между границами)
+    # param sigma: начальная длина шага (по умолчанию - 0.3 ширины области)
+    # param lambda_: размер поколения (по умолчанию 4 + 3 ln(размерность))
+    # param weight: вес цели, как в base.Fitness: 1.0 - максимизация, -1.0 - минимизация
+    # param rng: генератор numpy.random.Generator
+    # return: последнее поколение и журнал
+
+    rng = rng or np.random.default_rng()
+    if mean is None:
+        mean = rng.uniform(np.broadcast_to(low, (dimension,)), np.broadcast_to(up, (dimension,)))
+    mean = np.array(mean, dtype = float)
+    dimension = len(mean)
+    if sigma is None:
+        sigma = 0.3 * float(np.max(np.broadcast_to(np.subtract(up, low), (dimension,))))
+
+    # параметры стратегии
+    lambda_ = lambda_ or 4 + int(3 * np.log(dimension))
+    mu = lambda_ // 2
+    weights = np.log(mu + 0.5) - np.log(np.arange(1, mu + 1))
+    weights /= weights.sum()
+    mueff = 1.0 / (weights ** 2).sum()
+
+    cc = (4 + mueff / dimension) / (dimension + 4 + 2 * mueff / dimension)
+    cs = (mueff + 2) / (dimension + mueff + 5)
+    c1 = 2 / ((dimension + 1.3) ** 2 + mueff)
+    cmu = min(1 - c1, 2 * (mueff - 2 + 1 / mueff) / ((dimension + 2) ** 2 + mueff))
+    damps = 1 + 2 * max(0.0, np.sqrt((mueff - 1) / (dimension + 1)) - 1) + cs
+    chiN = np.sqrt(dimension) * (1 - 1 / (4 * dimension) + 1 / (21 * dimension ** 2))
+
+    # состояние
+    pc = np.zeros(dimension)
+    ps = np.zeros(dimension)
+    C = np.eye(dimension)
+
+    generations = Generations(stats, halloffame, verbose, weight, callback, hooks, stopCondition)
+    population = np.clip(mean[None, :], low, up)
+    fitness = np.asarray(toolbox.evaluate(population), dtype = float)
+    generations.record(0, population, fitness, 1)
+
+    for gen in range(1, ngen + 1):
+        eigenvalues, B = np.linalg.eigh(C)
+        scales = np.sqrt(np.maximum(eigenvalues, 1e-20))
+
+        z = rng.standard_normal((lambda_, dimension))
+        population = np.clip(mean + sigma * (z * scales) @ B.T, low, up)
+        steps = (population - mean) / sigma  # шаги после обрезки по границам
+
+        fitness = np.asarray(toolbox.evaluate(population), dtype = float)
+        best = np.argsort(-fitness * weight, kind = 'stable')[:mu]
+
+        # новый центр и пути эволюции
+        stepW = weights @ steps[best]
+        mean = mean + sigma * stepW
+
+        invSqrtC = (B / scales) @ B.T
+        ps = (1 - cs) * ps + np.sqrt(cs * (2 - cs) * mueff) * (invSqrtC @ stepW)
+        hsig = np.linalg.norm(ps) / np.sqrt(1 - (1 - cs) ** (2 * gen)) / chiN < 1.4 + 2 / (dimension + 1)
+        pc = (1 - cc) * pc + hsig * np.sqrt(cc * (2 - cc) * mueff) * stepW
+
+        # ранг-1 и ранг-mu обновление ковариации, адаптация длины шага
+        selected = steps[best]
+        C = ((1 - c1 - cmu) * C
+             + c1 * (np.outer(pc, pc) + (1 - hsig) * cc * (2 - cc) * C)
+             + cmu * (selected.T * weights) @ selected)
+        C = (C + C.T) / 2
+        sigma *= np.exp((cs / damps) * (np.linalg.norm(ps) / chiN - 1))
+
+        if generations.record(gen, population, fitness, lambda_):
+            break
+
+    return population, generations.logbook
@@ -0,0 +1,177 @@
+# Установите старую версию numpy (например, 1.21.0), где np.bool8 поддерживается:
+# pip install numpy==1.21.0
+
+import sys
+sys.stdout.reconfigure(encoding = 'utf-8')
+
+import numpy as np
+
+from deap import tools
+from deap import algorithms
+
+# Общий элитистский генетический алгоритм для всех задач репозитория (раскраска графа, расписание медсестёр,
+# N ферзей, MountainCar, морской бой, минимум функции). Сценарии подключают его так:
+#
+#     sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+#     import evolution
+
+
+def evaluateInvalid(individuals, toolbox, invalid):
+    # Оценивает индивидов с недействительной приспособленностью через toolbox.map
+    # param individuals: список индивидов
+    # param toolbox: набор операторов с зарегистрированными evaluate и map
+    # param invalid: переиспользуемый список, в который собираются оцениваемые индивиды
+    # return: количество оценённых индивидов
+
+    invalid.clear()
+    invalid.extend(ind for ind in individuals if not ind.fitness.valid)
+
+    fitnesses = toolbox.map(toolbox.evaluate, invalid)
+    for ind, fit in zip(invalid, fitnesses):
+        ind.fitness.values = fit
+
+    return len(invalid)
+
+
+def fillFitnessValues(population, fitnessValues):
+    # Записывает значения приспособленности популяции в заранее выделенный массив
+    # (массив пересоздаётся, только если изменился размер популяции)
+    # param population: список индивидов
+    # param fitnessValues: массив размера (размер популяции, количество целей) или None
+    # return: заполненный массив
+
+    numOfObjectives = len(population[0].fitness.values)
+    if fitnessValues is None or fitnessValues.shape != (len(population), numOfObjectives):
+        fitnessValues = np.empty((len(population), numOfObjectives))
+
+    for i, ind in enumerate(population):
+        fitnessValues[i] = ind.fitness.values
+
+    return fitnessValues
+
+
+def stopWhenFitnessReaches(target):
+    # Условие ранней остановки: лучшая приспособленность (по первой цели) достигла target
+    # с учётом направления оптимизации (минимизация или максимизация)
+
+    def stopCondition(gen, population, fitnessValues, logbook):
+        if population[0].fitness.weights[0] < 0:
+            return fitnessValues[:, 0].min() <= target
+        return fitnessValues[:, 0].max() >= target
+
+    return stopCondition
+
+
+def stopOnStagnation(generations):
+    # Условие ранней остановки: лучшая приспособленность (по первой цели) не улучшалась
+    # заданное количество поколений подряд
+
+    state = {"best": None, "stagnant": 0}
+
+    def stopCondition(gen, population, fitnessValues, logbook):
+        if population[0].fitness.weights[0] < 0:
+            best = -fitnessValues[:, 0].min()
+        else:
+            best = fitnessValues[:, 0].max()
+
+        if state["best"] is None or best > state["best"]:
+            state["best"], state["stagnant"] = best, 0
+        else:
+            state["stagnant"] += 1
+
+        return state["stagnant"] >= generations
+
+    return stopCondition
+
+
+def eaSimpleWithElitism(population, toolbox, cxpb, mutpb, ngen, stats = None, halloffame = None,
+                        verbose = __debug__, callback = None, hooks = (), stopCondition = None,
+                        select = None, vary = algorithms.varAnd, evaluate = evaluateInvalid, checkpointer = None):
+    # Этот алгоритм похож на алгоритм DEAP eaSimple(), с модификацией, что используется halloffame
+    # для реализации механизма элитизма. Индивиды, содержащиеся в halloffame, напрямую включаются
+    # в следующее поколение и не подвергаются генетическим операторам выбора, кроссовера и мутации.
+    # Без halloffame алгоритм работает как eaSimple() без элитизма.
+    # param callback: кортеж (функция, аргументы), вызываемый после каждого поколения
+    # param hooks: функции hook(gen, population, halloffame, logbook), вызываемые после каждого поколения
+    # param stopCondition: функция (gen, population, fitnessValues, logbook) -> bool для ранней остановки,
+    # где fitnessValues - массив приспособленности популяции (см. stopWhenFitnessReaches, stopOnStagnation)
+    # param select: оператор отбора (по умолчанию toolbox.select)
+    # param vary: оператор варьирования (offspring, toolbox, cxpb, mutpb) -> offspring (по умолчанию varAnd)
+    # param evaluate: функция оценки (individuals, toolbox, invalid) -> количество оценок
+    # (по умолчанию evaluateInvalid - оценка через toolbox.map, который можно заменить на пул процессов)
+    # param checkpointer: checkpoint.Checkpointer - периодические снимки состояния; если снимок уже есть,
+    # популяция, зал славы, журнал и генераторы случайных чисел восстанавливаются и запуск продолжается с него
+    # (снимок завершённого запуска пропускается, снимок другого запуска - ValueError)
+    # return: итоговая популяция и журнал
+
+    select = select or toolbox.select
+
+    # переиспользуемые между поколениями список оцениваемых индивидов и массив приспособленности:
+    invalid = []
+    fitnessValues = None
+
+    resumed = checkpointer.restore(population, halloffame, ngen) if checkpointer is not None else None
+    if resumed is not None:
+        # Продолжение прерванного запуска со следующего после сохранённого поколения
+        logbook, hof_size = resumed
+        startGen = logbook[-1]["gen"] + 1
+        if verbose:
+            print(logbook.stream)
+    else:
+        logbook = tools.Logbook()
+        logbook.header = ['gen', 'nevals'] + (stats.fields if stats else [])
+
+        # Оценка индивидуумов с недействительной приспособленностью
+        nevals = evaluate(population, toolbox, invalid)
+
+        if halloffame is not None:
+            halloffame.update(population)
+        hof_size = len(halloffame.items) if halloffame is not None else 0
+
+        record = stats.compile(population) if stats else {}
+        logbook.record(gen = 0, nevals = nevals, **record)
+        if verbose:
+            print(logbook.stream)
+        startGen = 1
+
+    # Начало процесса поколений
+    for gen in range(startGen, ngen + 1):
+
+        # Выбор индивидуумов для следующего поколения
+        offspring = select(population, len(population) - hof_size)
+
+        # Мутация и кроссовер в группе индивидов
+        offspring = vary(offspring, toolbox, cxpb, mutpb)
+
+        # Оценка индивидуумов с недействительной приспособленностью
+        nevals = evaluate(offspring, toolbox, invalid)
+
+        # Добавляем лучших обратно в популяцию и обновляем halloffame:
+        if halloffame is not None:
+            offspring.extend(halloffame.items)
+            halloffame.update(offspring)
+
+        # Замена текущей популяции на потомков
+        population[:] = offspring
+
+        # Добавление статистики текущего поколения в журнал
+        record = stats.compile(population) if stats else {}
+        logbook.record(gen = gen, nevals = nevals, **record)
+        if verbose:
+            print(logbook.stream)
+
+        if callback:
+            callback[0](*callback[1])
+
+        for hook in hooks:
+            hook(gen, population, halloffame, logbook)
+
+        if checkpointer is not None:
+            checkpointer.update(gen, ngen, population, halloffame, logbook, hof_size)
+
+        if stopCondition is not None:
+            fitnessValues = fillFitnessValues(population, fitnessValues)
+            if stopCondition(gen, population, fitnessValues, logbook):
+                break
+
+    return population, logbook
@@ -0,0 +1,123 @@
+# Установите старую версию numpy (например, 1.21.0), где np.bool8 поддерживается:
+# pip install numpy==1.21.0
+
+import sys
+sys.stdout.reconfigure(encoding = 'utf-8')
+
+import collections
+import hashlib
+import numpy as np
+
+KEY_SIZE = 16  # размер ключа кэша (хэша генома) в байтах
+
+
+class FitnessCache:
+    # Кэш значений приспособленности, ключ - хэш генома. Потомки, совпавшие с уже оценённым индивидом
+    # (частый результат varAnd для бинарных и перестановочных задач), не оцениваются повторно.
+    # Кэш подменяет toolbox.map и передаёт промахи исходному map (последовательному, пакетному или пулу процессов):
+    #
+    #     cache = fitnesscache.FitnessCache(maxSize = 100000, mapFunction = toolbox.map, binary = True)
+    #     toolbox.register("map", cache.map)
+    #     cache.registerStats(stats)  # счётчики попаданий и промахов попадают в журнал
+    #
+    # При переполнении вытесняются давно не использованные записи (LRU).
+
+    def __init__(self, maxSize = 100000, mapFunction = map, binary = False):
+        # param maxSize: максимальное количество хранимых значений приспособленности
+        # param mapFunction: функция map, которой оцениваются промахи кэша
+        # param binary: геном состоит из 0/1 - перед хэшированием он упаковывается по 8 генов в байт
+
+        self.maxSize = maxSize
+        self.mapFunction = mapFunction
+        self.binary = binary
+        self.cache = collections.OrderedDict()
+
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        # return: количество хранимых значений
+        return len(self.cache)
+
+    def getKey(self, individual):
+        # Вычисляет компактный ключ генома: 16-байтовый хэш байтов упакованного массива
+        # param individual: индивид (последовательность генов)
+        # return: ключ кэша
+
+        if hasattr(individual, "packedBytes"):  # геном уже упакован (bitgenome.PackedBits)
+            return hashlib.blake2b(individual.packedBytes(), digest_size = KEY_SIZE).digest()
+
+        genome = np.asarray(individual)
+        if self.binary:
+            genome = np.packbits(genome.astype(bool))
+
+        return hashlib.blake2b(genome.tobytes(), digest_size = KEY_SIZE).digest()
+
+    def map(self, function, individuals):
+        # Замена toolbox.map: значения для найденных в кэше геномов берутся из кэша,
+        # остальные (каждый уникальный геном - один раз) оцениваются через mapFunction
+        # param function: функция оценки
+        # param individuals: список индивидов
+        # return: список значений приспособленности в порядке индивидов
+
+        individuals = list(individuals)
+        keys = [self.getKey(ind) for ind in individuals]
+
+        # значения, известные для этого вызова: из кэша или (для повторов внутри вызова) свежие
+        known = {}
+        missing = []
+        for i, key in enumerate(keys):
+            if key in known:
+                self.hits += 1
+            elif key in self.cache:
+                self.cache.move_to_end(key)
+                known[key] = self.cache[key]
+                self.hits += 1
+            else:
+                known[key] = None
+                missing.append(i)
+                self.misses += 1
+
+        if missing:
+            for i, fitness in zip(missing, self.mapFunction(function, [individuals[i] for i in missing])):
+                known[keys[i]] = fitness
+                self.cache[keys[i]] = fitness
+
+            while len(self.cache) > self.maxSize:
+                self.cache.popitem(last = False)
+
+        return [known[key] for key in keys]
+
+    def toArrays(self):
+        # Представляет содержимое кэша массивами (в порядке от давно использованных к недавним) для контрольных точек
+        # return: (ключи - массив байтов размера (количество записей, 16), значения приспособленности)
+
+        keys = np.frombuffer(b"".join(self.cache.keys()), dtype = np.uint8).reshape(-1, KEY_SIZE)
+        values = np.array(list(self.cache.values()), dtype = np.float64)
+
+        return keys, values
+
+    def loadArrays(self, keys, values):
+        # Заменяет содержимое кэша массивами, полученными из toArrays; счётчики попаданий и промахов
+        # обнуляются (registerStats записывает в журнал их приращения за поколение)
+
+        self.cache = collections.OrderedDict(zip((key.tobytes() for key in keys), map(tuple, values.tolist())))
+        self.hits = 0
+        self.misses = 0
+
+    def registerStats(self, stats):
+        # Добавляет в объект статистики поля hits и misses - количество попаданий и промахов кэша
+        # за поколение (с момента предыдущего вызова stats.compile), чтобы они записывались в журнал
+        # param stats: объект tools.Statistics или streamstats.FitnessStatistics
+
+        lastCounts = {"hits": 0, "misses": 0}
+
+        def generationCount(name):
+            def count(values):
+                total = getattr(self, name)
+                delta, lastCounts[name] = total - lastCounts[name], total
+                return delta
+            return count
+
+        stats.register("hits", generationCount("hits"))
+        stats.register("misses", generationCount("misses"))
@@ -0,0 +1,222 @@
+# Установите старую версию numpy (например, 1.21.0), где np.bool8 поддерживается:
+# pip install numpy==1.21.0
+
+import sys
+sys.stdout.reconfigure(encoding = 'utf-8')
+
+import multiprocessing
+import random
+import numpy as np
+
+from deap import tools
+import evolution
+import streamstats
+
+# Островная модель: несколько популяций (островов), каждая в своём процессе со своим залом славы,
+# развиваются независимо циклом evolution.eaSimpleWithElitism. Каждые migrationInterval поколений
+# острова обмениваются numOfMigrants лучшими индивидами по кольцу или случайной топологии;
+# мигранты заменяют худших индивидов острова-получателя.
+#
+#     hof, logbooks = islands.eaIslands(toolbox, numOfIslands = 4, populationSize = POPULATION_SIZE, ...)
+#     logbook = islands.combineLogbooks(logbooks, stats)
+#
+# Процессы запускаются способом 'fork': toolbox и объекты задачи наследуются островами без сериализации,
+# по каналам передаются только мигранты (одним сообщением на остров за обмен) и записи журнала.
+
+TOPOLOGIES = ("ring", "random")
+SUMMED_FIELDS = ("hits", "misses", "hist")  # поля журнала - счётчики, которые при сведении островов складываются
+
+
+def replaceWorst(population, immigrants):
+    # Заменяет худших индивидов популяции мигрантами (приспособленность мигрантов уже вычислена)
+
+    if not immigrants:
+        return
+
+    order = sorted(range(len(population)), key = lambda i: population[i].fitness)
+    for i, immigrant in zip(order, immigrants):
+        population[i] = immigrant
+
+
+def runIsland(connection, toolbox, populationSize, cxpb, mutpb, ngen, migrationInterval,
+              numOfMigrants, stats, hallOfFameSize, seed):
+    # Цикл одного острова (выполняется в отдельном процессе): эпохи по migrationInterval поколений,
+    # после каждой эпохи лучшие индивиды отправляются в основной процесс, а в ответ приходят мигранты
+    # (None - конец работы, тогда отправляется зал славы острова)
+
+    random.seed(seed)
+    np.random.seed(seed % 2 ** 32)
+
+    population = toolbox.populationCreator(n = populationSize)
+    hof = tools.HallOfFame(hallOfFameSize)
+
+    gen = 0
+    while True:
+        numOfGenerations = min(migrationInterval, ngen - gen)
+        population, logbook = evolution.eaSimpleWithElitism(population, toolbox, cxpb = cxpb, mutpb = mutpb,
+                                                            ngen = numOfGenerations, stats = stats, halloffame = hof,
+                                                            verbose = False)
+
+        # записи журнала с номерами поколений от начала работы острова (нулевое поколение - только в первой эпохе):
+        records = [dict(record, gen = gen + record["gen"]) for record in logbook if gen == 0 or record["gen"] > 0]
+        gen += numOfGenerations
+
+        connection.send((records, tools.selBest(population, numOfMigrants)))
+        immigrants = connection.recv()
+        if immigrants is None:
+            break
+
+        replaceWorst(population, immigrants)
+
+    connection.send(hof.items)
+    connection.close()
+
+
+def migrationTargets(numOfIslands, topology, rng):
+    # Возвращает для каждого острова номер острова-получателя его мигрантов
+
+    if topology == "ring":
+        return [(i + 1) % numOfIslands for i in range(numOfIslands)]
+
+    # случайная топология: каждый остров отправляет мигрантов случайному другому острову
+    targets = rng.integers(0, numOfIslands - 1, size = numOfIslands)
+    return [int(target + (target >= i)) for i, target in enumerate(targets)]
+
+
+def combineLogbooks(logbooks, stats = None):
+    # Сводит журналы островов в один журнал по поколениям: nevals и счётчики SUMMED_FIELDS (попадания
+    # и промахи кэша, гистограмма hist - у островов общие интервалы, см. eaIslands) суммируются, поля min
+    # и max берутся по всем островам, std - общее стандартное отклонение по avg и std островов, остальные
+    # поля усредняются (размеры популяций островов равны, поэтому среднее средних - среднее по всем островам)
+    # param stats: объект статистики, переданный в eaIslands; с ним квантили оцениваются заново по общей
+    # гистограмме. Без него квантили островов усредняются - это лишь приближение квантили всей популяции
+    # return: журнал той же формы, что и у eaSimpleWithElitism
+
+    logbook = tools.Logbook()
+    logbook.header = logbooks[0].header
+
+    # поля записей, включая не входящие в заголовок (гистограмма hist)
+    fields = [field for field in logbooks[0][0] if field not in ("gen", "nevals")] if len(logbooks[0]) else []
+    quantiles = {}
+    if getattr(stats, "quantiles", ()) and "hist" in fields:
+        quantiles = {streamstats.quantileName(q): i for i, q in enumerate(stats.quantiles)}
+
+    for records in zip(*logbooks):
+        combined = {"gen": records[0]["gen"], "nevals": sum(record["nevals"] for record in records)}
+        for field in fields:
+            values = [record[field] for record in records]
+            if field in SUMMED_FIELDS:
+                combined[field] = np.sum(values, axis = 0)
+            elif field == "min":
+                combined[field] = np.min(values)
+            elif field == "max":
+                combined[field] = np.max(values)
+            elif field == "std" and "avg" in records[0]:
+                # дисперсия объединения равных частей: среднее (std^2 + avg^2) минус квадрат общего среднего
+                averages = np.array([record["avg"] for record in records])
+                variance = np.mean(np.square(values) + averages ** 2) - np.mean(averages) ** 2
+                combined[field] = np.sqrt(max(variance, 0.0))
+            elif field not in quantiles:
+                combined[field] = np.mean(values)
+
+        if quantiles:
+            low = combined.get("min", stats.edges[0])
+            high = combined.get("max", stats.edges[-1])
+            estimates = stats.estimateQuantiles(combined["hist"], low, high)
+            for name, i in quantiles.items():
+                combined[name] = estimates[i]
+
+        logbook.record(**combined)
+
+    return logbook
+
+
+def eaIslands(toolbox, numOfIslands, populationSize, cxpb, mutpb, ngen, migrationInterval = 10, numOfMigrants = 3,
+              topology = "ring", stats = None, hallOfFameSize = 1, seed = None, verbose = __debug__):
+    # Запускает островной генетический алгоритм
+    # param toolbox: набор операторов с зарегистрированным populationCreator (как для eaSimpleWithElitism)
+    # param numOfIslands: количество островов (процессов)
+    # param populationSize: размер популяции каждого острова
+    # param migrationInterval: количество поколений между обменами мигрантами
+    # param numOfMigrants: количество лучших индивидов, отправляемых островом при обмене
+    # param topology: "ring" - остров i отправляет мигрантов острову i + 1, "random" - случайному другому острову
+    # param hallOfFameSize: размер зала славы каждого острова и итогового зала славы
+    # param seed: начальное значение случайного зерна (острову i достаётся seed + i); None - из модуля random
+    # return: общий зал славы и список журналов островов
+
+    if topology not in TOPOLOGIES:
+        raise ValueError("неизвестная топология миграции: {}".format(topology))
+    if numOfIslands < 2 and topology == "random":
+        topology = "ring"
+    # гистограммы островов складываются в combineLogbooks, поэтому интервалы должны быть общими, а не
+    # выбираться каждым островом по своему нулевому поколению
+    if getattr(stats, "bins", None) and stats.range is None:
+        raise ValueError("для гистограммы островов задайте границы range в FitnessStatistics")
+
+    if seed is None:
+        seed = random.getrandbits(32)
+    rng = np.random.default_rng(seed)
+
+    context = multiprocessing.get_context("fork")
+    connections = []
+    processes = []
+    for i in range(numOfIslands):
+        parentConnection, childConnection = context.Pipe()
+        process = context.Process(target = runIsland,
+                                  args = (childConnection, toolbox, populationSize, cxpb, mutpb, ngen,
+                                          migrationInterval, numOfMigrants, stats, hallOfFameSize, seed + i),
+                                  daemon = True)
+        process.start()
+        childConnection.close()
+        connections.append(parentConnection)
+        processes.append(process)
+
+    logbooks = []
+    for _ in range(numOfIslands):
+        logbook = tools.Logbook()
+        logbook.header = ['gen', 'nevals'] + (stats.fields if stats else [])
+        logbooks.append(logbook)
+
+    hof = tools.HallOfFame(hallOfFameSize)
+
+    try:
+        gen = 0
+        while True:
+            gen = min(gen + migrationInterval, ngen)
+
+            emigrants = []
+            for logbook, connection in zip(logbooks, connections):
+                records, best = connection.recv()
+                for record in records:
+                    logbook.record(**record)
+                emigrants.append(best)
+
+            if verbose:
+                print("Поколение {}: лучшая приспособленность островов = {}".format(
+                    gen, [best[0].fitness.values[0] for best in emigrants]))
+
+            if gen >= ngen:
+                break
+
+            immigrants = [[] for _ in range(numOfIslands)]
+            for source, target in enumerate(migrationTargets(numOfIslands, topology, rng)):
+                immigrants[target].extend(emigrants[source])
+
+            for connection, batch in zip(connections, immigrants):
+                connection.send(batch)
+
+        for connection in connections:
+            connection.send(None)
+        for connection in connections:
+            hof.update(connection.recv())
+
+    except BaseException:
+        for process in processes:
+            process.terminate()
+        raise
+
+    finally:
+        for process in processes:
+            process.join()
+
+    return hof, logbooks
@@ -0,0 +1,246 @@
+# Установите старую версию numpy (например, 1.21.0), где np.bool8 поддерживается:
+# pip install numpy==1.21.0
+
+import sys
+sys.stdout.reconfigure(encoding = 'utf-8')
+
+import numpy as np
+
+from deap import tools
+
+# Генетический алгоритм, в котором вся популяция - один двумерный массив (размер популяции, длина генома):
+# numpy.uint8 для бинарных задач или numpy.float64 для вещественных (операторы - в модуле realga),
+# а приспособленность - вектор. Отбор, кроссовер
+# и мутация выполняются векторными масками над всей популяцией сразу, без объектов Individual и Fitness.
+# Операторы регистрируются в обычном toolbox, журнал имеет ту же форму, что и у algorithms.eaSimple:
+#
+#     toolbox.register("populationCreator", matrixga.randomPopulation, length = ONE_MAX_LENGTH)
+#     toolbox.register("evaluate", matrixga.oneMaxFitness)
+#     toolbox.register("select", selection.tournament, tournsize = 3)  # отбор возвращает индексы строк
+#     toolbox.register("mate", matrixga.cxOnePoint)
+#     toolbox.register("mutate", matrixga.mutFlipBit, indpb = 1.0 / ONE_MAX_LENGTH)
+#
+#     stats = tools.Statistics()
+#     stats.register("max", np.max)  # функции статистики получают вектор приспособленности популяции
+#     population, logbook = matrixga.eaSimple(population, toolbox, cxpb = 0.9, mutpb = 0.1, ngen = 50, stats = stats)
+
+
+def randomPopulation(n, length, rng = None):
+    # Создаёт популяцию со случайными генами 0/1
+    # param n: размер популяции
+    # param length: длина генома
+    # param rng: генератор numpy.random.Generator
+    # return: массив numpy.uint8 размера (n, length)
+
+    rng = rng or np.random.default_rng()
+    return rng.integers(0, 2, size = (n, length), dtype = np.uint8)
+
+
+def oneMaxFitness(population):
+    # Приспособленность для OneMax - количество единиц в каждой строке
+    return population.sum(axis = 1, dtype = np.int64)
+
+
+def crossRows(population, first, mask):
+    # Обменивает гены строк first и first + 1 в позициях, где mask истинна
+
+    second = first + 1
+    difference = (population[first] ^ population[second]) & mask
+    population[first] ^= difference
+    population[second] ^= difference
+
+
+def cxOnePoint(population, first, rng):
+    # Одноточечный кроссовер для пар строк (first, first + 1)
+    # param population: массив популяции (изменяется на месте)
+    # param first: индексы первых строк скрещиваемых пар
+
+    length = population.shape[1]
+    points = rng.integers(1, length, size = len(first))
+    mask = np.arange(length) >= points[:, None]
+    crossRows(population, first, mask.astype(np.uint8))
+
+
+def cxTwoPoint(population, first, rng):
+    # Двухточечный кроссовер для пар строк (first, first + 1): точки выбираются так же, как в tools.cxTwoPoint
+
+    length = population.shape[1]
+    point1 = rng.integers(1, length + 1, size = len(first))
+    point2 = rng.integers(1, length, size = len(first))
+    point2 += point2 >= point1
+    low, high = np.minimum(point1, point2), np.maximum(point1, point2)
+
+    positions = np.arange(length)
+    mask = (positions >= low[:, None]) & (positions < high[:, None])
+    crossRows(population, first, mask.astype(np.uint8))
+
+
+def mutFlipBit(population, rows, indpb, rng):
+    # Побитовая мутация строк rows: каждый ген инвертируется с вероятностью indpb
+    # param population: массив популяции (изменяется на месте)
+    # param rows: индексы мутирующих строк
+
+    flips = rng.random((len(rows), population.shape[1])) < indpb
+    population[rows] ^= flips.astype(np.uint8)
+
+
+def varAnd(population, toolbox, cxpb, mutpb, rng):
+    # Аналог algorithms.varAnd: соседние пары строк скрещиваются с вероятностью cxpb,
+    # затем каждая строка мутирует с вероятностью mutpb
+    # param population: массив отобранных индивидов (изменяется на месте)
+    # return: булев вектор изменённых строк (их приспособленность нужно пересчитать)
+
+    n = len(population)
+    changed = np.zeros(n, dtype = bool)
+
+    first = np.arange(0, n - 1, 2)
+    first = first[rng.random(len(first)) < cxpb]
+    if len(first):
+        toolbox.mate(population, first, rng = rng)
+        changed[first] = changed[first + 1] = True
+
+    rows = np.flatnonzero(rng.random(n) < mutpb)
+    if len(rows):
+        toolbox.mutate(population, rows, rng = rng)
+        changed[rows] = True
+
+    return changed
+
+
+class HallOfFame:
+    # Зал славы для популяции-массива: лучшие различные геномы за всё время
+    # (аналог tools.HallOfFame; items - двумерный массив, values - их приспособленность)
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self.items = None
+        self.values = None
+        self.wvalues = None
+
+    def __len__(self):
+        return 0 if self.items is None else len(self.items)
+
+    def update(self, population, fitness, wvalues):
+        # Обновляет зал славы лучшими различными строками популяции
+
+        if self.items is not None:
+            population = np.concatenate((self.items, population))
+            fitness = np.concatenate((self.values, fitness))
+            wvalues = np.concatenate((self.wvalues, wvalues))
+
+        # сортировка по убыванию (при равенстве раньше идут прежние члены зала славы):
+        order = np.argsort(-wvalues, kind = 'stable')
+
+        # первые вхождения различных геномов - по байтам строк (бинарные строки упаковываются); просматривается
+        # растущий префикс лучших строк, пока в нём не наберётся maxsize различных геномов:
+        numOfCandidates = 4 * self.maxsize
+        while True:
+            candidates = order[:numOfCandidates]
+            rows = population[candidates]
+            packed = np.ascontiguousarray(np.packbits(rows, axis = 1) if rows.dtype == np.uint8 else rows)
+            packed = packed.view(np.uint8).reshape(len(rows), -1)
+            keys = packed.view(np.dtype((np.void, packed.shape[1]))).ravel()
+            _, firstIndices = np.unique(keys, return_index = True)
+            if len(firstIndices) >= self.maxsize or numOfCandidates >= len(order):
+                break
+            numOfCandidates *= 4
+
+        best = candidates[np.sort(firstIndices)[:self.maxsize]]
+
+        self.items = population[best]
+        self.values = fitness[best]
+        self.wvalues = wvalues[best]
+
+
+def compileStats(stats, fitness):
+    # Вычисляет статистику: функции объекта tools.Statistics применяются к вектору приспособленности
+    # (ключ объекта статистики не используется - у популяции-массива нет объектов индивидов);
+    # streamstats.FitnessStatistics сам принимает вектор приспособленности
+
+    if not stats:
+        return {}
+    if isinstance(stats, tools.Statistics):
+        return {name: function(fitness) for name, function in stats.functions.items()}
+    return stats.compile(fitness)
+
+
+def eaSimple(population, toolbox, cxpb, mutpb, ngen, stats = None, halloffame = None,
+             verbose = __debug__, weight = 1.0, elitism = False, rng = None, callback = None, hooks = (),
+             stopCondition = None, niching = None):
+    # Аналог algorithms.eaSimple для популяции-массива
+    # param population: массив (размер популяции, длина генома)
+    # param toolbox: набор операторов evaluate, mate, mutate из этого модуля и select из модуля selection
+    # param halloffame: объект HallOfFame
+    # param weight: вес цели, как в base.Fitness: 1.0 - максимизация, -1.0 - минимизация
+    # param elitism: члены halloffame напрямую переходят в следующее поколение (как в evolution.eaSimpleWithElitism)
+    # param rng: генератор numpy.random.Generator
+    # param callback: кортеж (функция, аргументы), вызываемый после каждого поколения
+    # param hooks: функции hook(gen, population, halloffame, logbook), вызываемые после каждого поколения
+    # (population - текущий массив популяции)
+    # param stopCondition: функция (gen, population, fitness, logbook) -> bool для ранней остановки
+    # (см. continuous.stopWhenFitnessReaches)
+    # param niching: функция (population, wvalues) -> взвешенная приспособленность для отбора
+    # (см. niching.sharedWvalues, niching.clearedWvalues)
+    # return: итоговая популяция и журнал
+
+    rng = rng or np.random.default_rng()
+
+    logbook = tools.Logbook()
+    logbook.header = ['gen', 'nevals'] + (stats.fields if stats else [])
+
+    fitness = np.asarray(toolbox.evaluate(population), dtype = float)
+    if halloffame is not None:
+        halloffame.update(population, fitness, fitness * weight)
+
+    record = compileStats(stats, fitness)
+    logbook.record(gen = 0, nevals = len(population), **record)
+    if verbose:
+        print(logbook.stream)
+
+    for gen in range(1, ngen + 1):
+        hof_size = len(halloffame) if elitism and halloffame is not None else 0
+
+        # отбор - индексы строк; потомки - копии отобранных строк вместе с их приспособленностью
+        wvalues = fitness * weight if niching is None else niching(population, fitness * weight)
+        chosen = toolbox.select(wvalues, len(population) - hof_size, rng = rng)
+        offspring = population[chosen]
+        offspringFitness = fitness[chosen]
+
+        # кроссовер и мутация, пересчёт приспособленности только у изменённых строк
+        changed = varAnd(offspring, toolbox, cxpb, mutpb, rng)
+        if changed.any():
+            offspringFitness[changed] = toolbox.evaluate(offspring[changed])
+
+        if hof_size:
+            offspring = np.concatenate((offspring, halloffame.items))
+            offspringFitness = np.concatenate((offspringFitness, halloffame.values))
+
+        population, fitness = offspring, offspringFitness
+
+        if halloffame is not None:
+            halloffame.update(population, fitness, fitness * weight)
+
+        record = compileStats(stats, fitness)
+        logbook.record(gen = gen, nevals = int(changed.sum()), **record)
+        if verbose:
+            print(logbook.stream)
+
+        if callback:
+            callback[0](*callback[1])
+
+        for hook in hooks:
+            hook(gen, population, halloffame, logbook)
+
+        if stopCondition is not None and stopCondition(gen, population, fitness, logbook):
+            break
+
+    return population, logbook
+
+
+def eaSimpleWithElitism(population, toolbox, cxpb, mutpb, ngen, stats = None, halloffame = None,
+                        verbose = __debug__, weight = 1.0, rng = None, callback = None, hooks = (),
+                        stopCondition = None, niching = None):
+    # Аналог evolution.eaSimpleWithElitism для популяции-массива
+    return eaSimple(population, toolbox, cxpb, mutpb, ngen, stats = stats, halloffame = halloffame,
+                    verbose = verbose, weight = weight, elitism = True, rng = rng, callback = callback, hooks = hooks,
+                    stopCondition = stopCondition, niching = niching)
@@ -25,25 +25,107 @@ class NQueensProblem:
         if len(positions) != self.numOfQueens:
             raise ValueError("размер списка позиций должен быть равен ", self.numOfQueens)
 
-        violations = 0
+        # вместо перебора всех пар ферзей (O(n²)) строим гистограммы занятости диагоналей:
+        # каждая диагональ с k ферзями даёт k*(k-1)/2 нарушений
+        sumCounts, diffCounts = self.getDiagonalCounters(positions)
 
-        # итерация по каждой паре ферзей и проверка, находятся ли они на одной диагонали:
-        for i in range(len(positions)):
-            for j in range(i + 1, len(positions)):
+        return int((sumCounts * (sumCounts - 1)).sum() + (diffCounts * (diffCounts - 1)).sum()) // 2
 
-                # первый ферзь в паре:
-                column1 = i
-                row1 = positions[i]
+    def getDiagonalCounters(self, positions):
+        # Строит гистограммы занятости диагоналей: ферзи (i, positions[i]) и (j, positions[j])
+        # находятся на одной диагонали, если у них совпадает сумма или разность индексов
+        # param positions: список индексов, соответствующих позициям ферзей в каждой строке
+        # return: кортеж (число ферзей на каждой диагонали i + positions[i],
+        #                 число ферзей на каждой диагонали i - positions[i] + numOfQueens - 1)
+
+        positions = np.asarray(positions, dtype = np.intp)
+        columns = np.arange(self.numOfQueens)
+
+        sumCounts = np.bincount(columns + positions, minlength = 2 * self.numOfQueens - 1)
+        diffCounts = np.bincount(columns - positions + self.numOfQueens - 1, minlength = 2 * self.numOfQueens - 1)
+
+        return sumCounts, diffCounts
+
+    def initDiagonalState(self, individual):
+        # Сохраняет в индивиде счётчики диагоналей и текущее количество нарушений,
+        # чтобы последующие перестановки можно было оценивать инкрементально
+        # param individual: индивид (объект с атрибутами, например creator.Individual)
+        # return: количество нарушений
+
+        individual.sumCounts, individual.diffCounts = self.getDiagonalCounters(individual)
+        individual.violations = int((individual.sumCounts * (individual.sumCounts - 1)).sum() +
+                                    (individual.diffCounts * (individual.diffCounts - 1)).sum()) // 2
+
+        return individual.violations
+
+    def getIncrementalViolationsCount(self, individual):
+        # Возвращает количество нарушений из сохранённых в индивиде счётчиков за O(1);
+        # при отсутствии счётчиков они вычисляются заново.
+        # Индивид должен изменяться только через swapQueens, иначе счётчики устареют.
+        # param individual: индивид (объект с атрибутами, например creator.Individual)
+        # return: количество нарушений
+
+        if not hasattr(individual, "violations"):
+            return self.initDiagonalState(individual)
+
+        return individual.violations
+
+    def swapQueens(self, individual, i, j):
+        # Меняет местами ферзей в строках i и j и обновляет счётчики диагоналей за O(1)
+        # param individual: индивид (объект с атрибутами, например creator.Individual)
+        # param i, j: индексы переставляемых позиций
+        # return: изменение количества нарушений
+
+        if not hasattr(individual, "sumCounts"):
+            self.initDiagonalState(individual)
+
+        if i == j:
+            return 0
+
+        sumCounts, diffCounts = individual.sumCounts, individual.diffCounts
+        offset = self.numOfQueens - 1
+        row1, row2 = individual[i], individual[j]
+        delta = 0
+
+        # убираем обоих ферзей с их диагоналей: ферзь на диагонали с k ферзями участвовал в k - 1 нарушениях
+        for column, row in ((i, row1), (j, row2)):
+            sumCounts[column + row] -= 1
+            diffCounts[column - row + offset] -= 1
+            delta -= sumCounts[column + row] + diffCounts[column - row + offset]
+
+        # ставим ферзей на новые места: каждый добавляет по нарушению на каждого ферзя своих диагоналей
+        for column, row in ((i, row2), (j, row1)):
+            delta += sumCounts[column + row] + diffCounts[column - row + offset]
+            sumCounts[column + row] += 1
+            diffCounts[column - row + offset] += 1
+
+        individual[i], individual[j] = row2, row1
+        individual.violations += int(delta)
+
+        return int(delta)
+
+    def getViolationsCountBatch(self, population):
+        # Вычисляет количество нарушений сразу для всей популяции одним вызовом NumPy
+        # param population: двумерный массив (или список индивидов) размера (размер популяции, numOfQueens)
+        # return: массив с количеством нарушений для каждого индивида
+
+        population = np.asarray(population, dtype = np.intp)
+        if population.ndim != 2 or population.shape[1] != self.numOfQueens:
+            raise ValueError("размер каждого индивида должен быть равен ", self.numOfQueens)
 
-                # второй ферзь в паре:
-                column2 = j
-                row2 = positions[j]
+        popSize = population.shape[0]
+        numOfDiagonals = 2 * self.numOfQueens - 1
+        columns = np.arange(self.numOfQueens)
 
-                # проверка на угрозу по диагонали для текущей пары:
-                if abs(column1 - column2) == abs(row1 - row2):
-                    violations += 1
+        # сдвигаем номера диагоналей каждого индивида в собственный диапазон корзин,
+        # чтобы посчитать гистограммы всей популяции одним bincount:
+        offsets = (np.arange(popSize) * numOfDiagonals)[:, np.newaxis]
+        sumCounts = np.bincount((columns + population + offsets).ravel(),
+                                minlength = popSize * numOfDiagonals).reshape(popSize, numOfDiagonals)
+        diffCounts = np.bincount((columns - population + self.numOfQueens - 1 + offsets).ravel(),
+                                 minlength = popSize * numOfDiagonals).reshape(popSize, numOfDiagonals)
 
-        return violations
+        return ((sumCounts * (sumCounts - 1)).sum(axis = 1) + (diffCounts * (diffCounts - 1)).sum(axis = 1)) // 2
 
     def plotBoard(self, positions):
         # Рисует позиции ферзей на доске согласно данному решению
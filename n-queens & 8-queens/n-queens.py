@@ -3,10 +3,14 @@ from deap import creator
 from deap import tools
 import random
 import array
-import numpy as np
 import matplotlib.pyplot as plt
 import seaborn as sns
-import elitism
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+import evolution
+import selection
+import streamstats
 import queens
 
 # константы задачи:
@@ -43,16 +47,68 @@ toolbox.register("individualCreator", tools.initIterate, creator.Individual, too
 # создание оператора для создания популяции:
 toolbox.register("populationCreator", tools.initRepeat, list, toolbox.individualCreator)
 
-# расчет приспособленности - вычисление количества нарушений:
+# расчет приспособленности - вычисление количества нарушений;
+# для индивидов, изменённых операторами ниже, значение берётся из счётчиков диагоналей за O(1):
 def getViolationsCount(individual):
-    return nQueens.getViolationsCount(individual),  # возвращает кортеж
+    return nQueens.getIncrementalViolationsCount(individual),  # возвращает кортеж
 
 toolbox.register("evaluate", getViolationsCount)
 
-# Генетические операторы:
-toolbox.register("select", tools.selTournament, tournsize = 2)
-toolbox.register("mate", tools.cxUniformPartialyMatched, indpb = 2.0 / len(nQueens))
-toolbox.register("mutate", tools.mutShuffleIndexes, indpb = 1.0 / len(nQueens))
+# пакетная оценка: подменяет toolbox.map, поэтому цикл eaSimpleWithElitism не меняется,
+# а все индивиды без счётчиков диагоналей оцениваются одним вызовом NumPy:
+def mapViolationsCount(evaluate, individuals):
+    if getattr(evaluate, "func", evaluate) is not getViolationsCount:
+        return list(map(evaluate, individuals))
+
+    fresh = [ind for ind in individuals if not hasattr(ind, "violations")]
+    if fresh:
+        for ind, violations in zip(fresh, nQueens.getViolationsCountBatch(fresh)):
+            ind.violations = int(violations)  # счётчики диагоналей построятся при первой перестановке
+
+    return [(ind.violations,) for ind in individuals]
+
+toolbox.register("map", mapViolationsCount)
+
+# Генетические операторы. Они повторяют tools.mutShuffleIndexes и tools.cxUniformPartialyMatched
+# (с той же последовательностью случайных чисел), но каждую перестановку пары позиций передают
+# в nQueens.swapQueens, который обновляет счётчики диагоналей и количество нарушений за O(1):
+def mutShuffleIndexes(individual, indpb):
+    size = len(individual)
+    for i in range(size):
+        if random.random() < indpb:
+            swapIndex = random.randint(0, size - 2)
+            if swapIndex >= i:
+                swapIndex += 1
+            nQueens.swapQueens(individual, i, swapIndex)
+
+    return individual,
+
+def cxUniformPartialyMatched(ind1, ind2, indpb):
+    size = min(len(ind1), len(ind2))
+
+    # позиции каждого значения в обоих индивидах:
+    p1, p2 = [0] * size, [0] * size
+    for i in range(size):
+        p1[ind1[i]] = i
+        p2[ind2[i]] = i
+
+    for i in range(size):
+        if random.random() < indpb:
+            temp1 = ind1[i]
+            temp2 = ind2[i]
+
+            # значение temp2 переезжает в позицию i первого индивида, temp1 - второго:
+            nQueens.swapQueens(ind1, i, p1[temp2])
+            nQueens.swapQueens(ind2, i, p2[temp1])
+
+            p1[temp1], p1[temp2] = p1[temp2], p1[temp1]
+            p2[temp1], p2[temp2] = p2[temp2], p2[temp1]
+
+    return ind1, ind2
+
+toolbox.register("select", selection.selTournament, tournsize = 2)
+toolbox.register("mate", cxUniformPartialyMatched, indpb = 2.0 / len(nQueens))
+toolbox.register("mutate", mutShuffleIndexes, indpb = 1.0 / len(nQueens))
 
 # Основной поток генетического алгоритма:
 def main():
@@ -61,15 +117,13 @@ def main():
     population = toolbox.populationCreator(n = POPULATION_SIZE)
 
     # подготовка объекта статистики:
-    stats = tools.Statistics(lambda ind: ind.fitness.values)
-    stats.register("min", np.min)
-    stats.register("avg", np.mean)
+    stats = streamstats.FitnessStatistics(("min", "avg"))
 
     # создание объекта hall-of-fame:
     hof = tools.HallOfFame(HALL_OF_FAME_SIZE)
 
     # выполнение потока генетического алгоритма с добавленным элитизмом:
-    population, logbook = elitism.eaSimpleWithElitism(population, toolbox, cxpb = P_CROSSOVER, mutpb = P_MUTATION,
+    population, logbook = evolution.eaSimpleWithElitism(population, toolbox, cxpb = P_CROSSOVER, mutpb = P_MUTATION,
                                               ngen = MAX_GENERATIONS, stats = stats, halloffame = hof, verbose = True)
 
     # вывод информации о лучших решениях:
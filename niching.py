@@ -0,0 +1,247 @@
+# Установите старую версию numpy (например, 1.21.0), где np.bool8 поддерживается:
+# pip install numpy==1.21.0
+
+import sys
+sys.stdout.reconfigure(encoding = 'utf-8')
+
+import time
+import numpy as np
+
+import continuous
+import matrixga
+
+# Нишевание для многоэкстремальных задач над популяцией-массивом (matrixga, realga): разделение
+# приспособленности, расчистка (clearing) и детерминированное вытеснение (deterministic crowding).
+# Соседи в радиусе ниши ищутся по KD-дереву, которое строится заново каждое поколение за O(N log N),
+# вместо O(N^2) попарных расстояний. Разделение и расчистка подключаются к matrixga.eaSimple как
+# преобразование взвешенной приспособленности перед отбором:
+#
+#     toolbox.register("niching", niching.clearedWvalues, radius = NICHE_RADIUS)
+#     population, logbook = matrixga.eaSimpleWithElitism(population, toolbox, ..., niching = toolbox.niching)
+#     population, logbook = niching.eaDeterministicCrowding(population, toolbox, cxpb, mutpb, ngen, ...)
+#     print(niching.coveredOptima(population, knownOptima, radius = 0.1))
+
+LEAF_SIZE = 16              # наименьший размер листа KD-дерева
+QUERY_CHUNK_SIZE = 4096     # количество точек-запросов, обходящих дерево за один шаг
+
+
+class KDTree:
+    # Сбалансированное KD-дерево в неявном виде (узел k - дети 2k + 1 и 2k + 2): узлы уровня l делят
+    # переставленные точки на 2^l равных отрезков, каждый узел делится по медиане вдоль самой широкой
+    # стороны своего ограничивающего прямоугольника. Уровень строится одной сортировкой lexsort,
+    # запросы обходят дерево сразу для многих точек, уровень за уровнем
+
+    def __init__(self, points, leafSize = LEAF_SIZE):
+        # param points: массив точек (количество, размерность)
+
+        self.points = np.asarray(points, dtype = float)
+        n, dimension = self.points.shape
+
+        self.depth = 0
+        while (n >> (self.depth + 1)) >= leafSize:
+            self.depth += 1
+
+        numOfNodes = (1 << (self.depth + 1)) - 1
+        self.lo = np.full((numOfNodes, dimension), np.inf)
+        self.hi = np.full((numOfNodes, dimension), -np.inf)
+        self.perm = np.arange(n)
+
+        for level in range(self.depth + 1):
+            count = 1 << level
+            first = count - 1
+            bounds = (np.arange(count + 1) * n) // count
+            if n == 0:
+                break
+
+            ordered = self.points[self.perm]
+            self.lo[first:first + count] = np.minimum.reduceat(ordered, bounds[:-1], axis = 0)
+            self.hi[first:first + count] = np.maximum.reduceat(ordered, bounds[:-1], axis = 0)
+            if level == self.depth:
+                break
+
+            # упорядочение точек внутри каждого узла по его оси деления: левая половина - левый ребёнок
+            nodeOf = np.repeat(np.arange(count), np.diff(bounds))
+            splitAxis = np.argmax(self.hi[first:first + count] - self.lo[first:first + count], axis = 1)
+            keys = ordered[np.arange(n), splitAxis[nodeOf]]
+            self.perm = self.perm[np.lexsort((keys, nodeOf))]
+
+        self.leafBounds = (np.arange((1 << self.depth) + 1) * n) // (1 << self.depth)
+
+    def __len__(self):
+        return len(self.points)
+
+    def queryPairs(self, queries, radius):
+        # Находит для каждой точки-запроса все точки дерева на расстоянии не больше radius
+        # param queries: массив точек-запросов (количество, размерность)
+        # return: (номера запросов, номера точек дерева, расстояния) - массивы одинаковой длины
+
+        queries = np.asarray(queries, dtype = float)
+        radius2 = radius * radius
+        firstLeaf = (1 << self.depth) - 1
+
+        queryIndices, pointIndices, distances = [], [], []
+        for start in range(0, len(queries) if len(self) else 0, QUERY_CHUNK_SIZE):
+            q = np.arange(start, min(start + QUERY_CHUNK_SIZE, len(queries)))
+            node = np.zeros(len(q), dtype = np.int64)
+
+            # спуск по уровням: пары (запрос, узел), у которых шар запроса пересекает прямоугольник узла
+            for level in range(self.depth + 1):
+                x = queries[q]
+                gap = np.maximum(self.lo[node] - x, 0) + np.maximum(x - self.hi[node], 0)
+                keep = (gap * gap).sum(axis = 1) <= radius2
+                q, node = q[keep], node[keep]
+                if level < self.depth:
+                    q = np.repeat(q, 2)
+                    node = (2 * node[:, None] + np.array([1, 2])).ravel()
+
+            # точки найденных листьев - точная проверка расстояния
+            leaf = node - firstLeaf
+            starts = self.leafBounds[leaf]
+            sizes = self.leafBounds[leaf + 1] - starts
+            q = np.repeat(q, sizes)
+            offsets = np.arange(len(q)) - np.repeat(np.cumsum(sizes) - sizes, sizes)
+            p = self.perm[np.repeat(starts, sizes) + offsets]
+
+            distance2 = ((queries[q] - self.points[p]) ** 2).sum(axis = 1)
+            keep = distance2 <= radius2
+            queryIndices.append(q[keep])
+            pointIndices.append(p[keep])
+            distances.append(np.sqrt(distance2[keep]))
+
+        if not queryIndices:
+            return np.empty(0, dtype = np.int64), np.empty(0, dtype = np.int64), np.empty(0)
+
+        return np.concatenate(queryIndices), np.concatenate(pointIndices), np.concatenate(distances)
+
+
+def sharedWvalues(population, wvalues, sigma, alpha = 1.0):
+    # Разделение приспособленности: приспособленность, сдвинутая к неотрицательной (худший - 0),
+    # делится на счётчик ниши m_i = сумма (1 - (d_ij / sigma)^alpha) по соседям ближе sigma (включая себя)
+    # param wvalues: вектор взвешенной приспособленности (больше - лучше)
+    # return: вектор разделённой приспособленности для отбора
+
+    wvalues = np.asarray(wvalues, dtype = float)
+    i, _, distance = KDTree(population).queryPairs(population, sigma)
+    nicheCounts = np.bincount(i, weights = 1.0 - (distance / sigma) ** alpha, minlength = len(wvalues))
+
+    return (wvalues - wvalues.min()) / nicheCounts
+
+
+def clearingWinners(population, wvalues, radius, capacity = 1):
+    # Расчистка: от лучшего к худшему каждый ещё не расчищенный индивид становится победителем ниши,
+    # в его радиусе сохраняются capacity лучших (включая его самого), остальные расчищаются
+    # return: булевы векторы (победители, расчищенные)
+
+    wvalues = np.asarray(wvalues, dtype = float)
+    n = len(wvalues)
+    i, j, _ = KDTree(population).queryPairs(population, radius)
+
+    # соседи каждого индивида в порядке убывания приспособленности (CSR по i)
+    rank = np.empty(n, dtype = np.int64)
+    rank[np.argsort(-wvalues, kind = 'stable')] = np.arange(n)
+    order = np.lexsort((rank[j], i))
+    neighbors = j[order]
+    indptr = np.concatenate(([0], np.cumsum(np.bincount(i, minlength = n))))
+
+    winners = np.zeros(n, dtype = bool)
+    cleared = np.zeros(n, dtype = bool)
+    for k in np.argsort(-wvalues, kind = 'stable').tolist():
+        if cleared[k] or winners[k]:
+            continue
+        winners[k] = True
+
+        niche = neighbors[indptr[k]:indptr[k + 1]]
+        niche = niche[(rank[niche] > rank[k]) & ~cleared[niche] & ~winners[niche]]
+        cleared[niche[capacity - 1:]] = True
+
+    return winners, cleared
+
+
+def clearedWvalues(population, wvalues, radius, capacity = 1):
+    # Расчистка (см. clearingWinners): расчищенные индивиды получают приспособленность ниже худшей
+    # return: вектор взвешенной приспособленности для отбора
+
+    wvalues = np.array(wvalues, dtype = float)
+    _, cleared = clearingWinners(population, wvalues, radius, capacity)
+    wvalues[cleared] = wvalues.min() - 1.0
+
+    return wvalues
+
+
+def countNiches(population, wvalues, radius, threshold):
+    # return: количество ниш радиуса radius, победители которых не хуже threshold (по взвешенной приспособленности)
+    winners, _ = clearingWinners(population, wvalues, radius)
+    return int((winners & (np.asarray(wvalues) >= threshold)).sum())
+
+
+def coveredOptima(population, optima, radius):
+    # return: количество известных оптимумов, в радиусе radius от которых есть хотя бы один индивид
+    queryIndices, _, _ = KDTree(population).queryPairs(optima, radius)
+    return len(np.unique(queryIndices))
+
+
+def eaDeterministicCrowding(population, toolbox, cxpb, mutpb, ngen, stats = None, halloffame = None,
+                            verbose = __debug__, weight = 1.0, rng = None, callback = None, hooks = (),
+                            stopCondition = None):
+    # Детерминированное вытеснение: популяция случайно разбивается на пары родителей, потомки получаются
+    # операторами toolbox.mate и toolbox.mutate (как в matrixga.varAnd), каждый потомок соревнуется с ближайшим
+    # из двух родителей пары (по сумме расстояний) и заменяет его, если не хуже. Отбора нет, поэтому ниши
+    # сохраняются без радиуса ниши. Параметры и результат - как у matrixga.eaSimple
+
+    rng = rng or np.random.default_rng()
+    population = np.array(population)
+    n = len(population)
+
+    generations = continuous.Generations(stats, halloffame, verbose, weight, callback, hooks, stopCondition)
+    fitness = np.asarray(toolbox.evaluate(population), dtype = float)
+    generations.record(0, population, fitness, n)
+
+    first = np.arange(0, n - 1, 2)
+    for gen in range(1, ngen + 1):
+        order = rng.permutation(n)
+        parents, parentFitness = population[order], fitness[order]
+
+        offspring = parents.copy()
+        offspringFitness = parentFitness.copy()
+        changed = matrixga.varAnd(offspring, toolbox, cxpb, mutpb, rng)
+        if changed.any():
+            offspringFitness[changed] = toolbox.evaluate(offspring[changed])
+
+        # соперник каждого родителя: свой потомок или потомок второго родителя пары
+        def distance(a, b):
+            return np.sqrt(((parents[a] - offspring[b]) ** 2).sum(axis = 1))
+
+        crossed = distance(first, first) + distance(first + 1, first + 1) > \
+                  distance(first, first + 1) + distance(first + 1, first)
+        rival = np.arange(n)
+        rival[first[crossed]] += 1
+        rival[first[crossed] + 1] -= 1
+
+        replaced = offspringFitness[rival] * weight >= parentFitness * weight
+        parents[replaced] = offspring[rival[replaced]]
+        parentFitness[replaced] = offspringFitness[rival[replaced]]
+
+        population, fitness = parents, parentFitness
+
+        if generations.record(gen, population, fitness, int(changed.sum())):
+            break
+
+    return population, generations.logbook
+
+
+# замер скорости поиска соседей:
+def main():
+    rng = np.random.default_rng(42)
+
+    for n in (1000, 10000, 100000):
+        points = rng.uniform(-5, 5, size = (n, 2))
+
+        start = time.perf_counter()
+        i, _, _ = KDTree(points).queryPairs(points, 0.1)
+        elapsed = time.perf_counter() - start
+
+        print("N = {}: {:.1f} мс, {:.1f} соседей на точку".format(n, 1000 * elapsed, len(i) / n))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+# Установите старую версию numpy (например, 1.21.0), где np.bool8 поддерживается:
+# pip install numpy==1.21.0
+
+import sys
+sys.stdout.reconfigure(encoding = 'utf-8')
+
+import math
+import multiprocessing
+
+# Объекты, созданные в рабочем процессе при его запуске (например, экземпляры задач или сред),
+# чтобы не передавать их вместе с каждой задачей:
+workerObjects = {}
+
+
+def initWorker(factories):
+    # Выполняется один раз в каждом рабочем процессе: создаёт объекты задачи на стороне процесса
+    # param factories: словарь имя -> (функция создания, аргументы)
+
+    for name, (factory, args) in factories.items():
+        workerObjects[name] = factory(*args)
+
+
+def getWorkerObject(name, default = None):
+    # Возвращает объект, созданный в текущем рабочем процессе функцией initWorker
+    # param name: имя объекта
+    # param default: значение, возвращаемое в основном процессе (где рабочие объекты не создаются)
+    # return: объект рабочего процесса или default
+
+    return workerObjects.get(name, default)
+
+
+class ParallelMap:
+    # Параллельная замена встроенного map для toolbox.map: оценивает индивидов в пуле процессов.
+    # Индивиды раздаются пачками (chunksize), результаты возвращаются в исходном порядке,
+    # поэтому присвоение приспособленности в циклах элитизма не меняется:
+    #
+    #     toolbox.register("map", parallel.ParallelMap(processes = 32))
+    #
+    # Функция оценки передаётся в процессы по имени, поэтому она должна быть определена на уровне модуля.
+    # Тяжёлые объекты (задачу, среду) лучше создавать в рабочих процессах через workerFactories
+    # и получать в функции оценки через getWorkerObject.
+
+    def __init__(self, processes = None, chunksize = None, workerFactories = None, startMethod = None):
+        # param processes: количество рабочих процессов (по умолчанию - количество ядер)
+        # param chunksize: размер пачки индивидов на одну задачу (по умолчанию - около 4 пачек на процесс)
+        # param workerFactories: словарь имя -> (функция создания, аргументы) для объектов рабочих процессов
+        # param startMethod: способ запуска процессов; по умолчанию 'fork', где он доступен, -
+        # тогда сценарии без блока if __name__ == "__main__" не выполняются повторно в рабочих процессах
+
+        if startMethod is None and "fork" in multiprocessing.get_all_start_methods():
+            startMethod = "fork"
+
+        self.processes = processes or multiprocessing.cpu_count()
+        self.chunksize = chunksize
+        self.pool = multiprocessing.get_context(startMethod).Pool(self.processes, initializer = initWorker,
+                                                                  initargs = (workerFactories or {},))
+
+    def __call__(self, function, iterable):
+        # Оценивает function для каждого элемента iterable в пуле процессов
+        # return: список результатов в порядке элементов iterable
+
+        items = list(iterable)
+        if not items:
+            return []
+
+        chunksize = self.chunksize or max(1, math.ceil(len(items) / (4 * self.processes)))
+        return self.pool.map(function, items, chunksize)
+
+    def close(self):
+        # Завершает рабочие процессы
+
+        self.pool.close()
+        self.pool.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *excInfo):
+        self.close()
@@ -0,0 +1,129 @@
+# Установите старую версию numpy (например, 1.21.0), где np.bool8 поддерживается:
+# pip install numpy==1.21.0
+
+import sys
+sys.stdout.reconfigure(encoding = 'utf-8')
+
+import time
+import numpy as np
+
+# Операторы для вещественных задач в движке matrixga: популяция - массив (размер популяции, размерность)
+# numpy.float64. Кроссовер SBX и полиномиальная мутация с границами повторяют tools.cxSimulatedBinaryBounded
+# и tools.mutPolynomialBounded, но выполняются векторными операциями над всеми выбранными строками сразу.
+# Целевые функции принимают массив точек любой формы (..., размерность) и считают по последней оси,
+# поэтому ими оценивается и вся популяция, и сетка для графика:
+#
+#     toolbox.register("populationCreator", realga.randomPopulation, dimension = 2, low = LOW, up = UP, rng = rng)
+#     toolbox.register("evaluate", realga.himmelblau)
+#     toolbox.register("select", selection.tournament, tournsize = 3)
+#     toolbox.register("mate", realga.cxSimulatedBinaryBounded, eta = ETA, low = LOW, up = UP)
+#     toolbox.register("mutate", realga.mutPolynomialBounded, eta = ETA, low = LOW, up = UP, indpb = 0.5)
+#     population, logbook = matrixga.eaSimpleWithElitism(population, toolbox, ..., weight = -1.0)
+
+
+def randomPopulation(n, dimension, low, up, rng = None):
+    # Создаёт популяцию с генами, равномерно распределёнными между границами
+    # param low, up: границы (числа или векторы длины dimension)
+    # return: массив numpy.float64 размера (n, dimension)
+
+    rng = rng or np.random.default_rng()
+    return rng.uniform(low, up, size = (n, dimension))
+
+
+def himmelblau(points):
+    # Функция Химмельблау (четыре минимума со значением 0)
+    x, y = points[..., 0], points[..., 1]
+    return (x ** 2 + y - 11) ** 2 + (x + y ** 2 - 7) ** 2
+
+
+def rastrigin(points):
+    # Функция Растригина (минимум 0 в начале координат)
+    return 10.0 * points.shape[-1] + (points ** 2 - 10.0 * np.cos(2.0 * np.pi * points)).sum(axis = -1)
+
+
+def rosenbrock(points):
+    # Функция Розенброка (минимум 0 в точке (1, ..., 1))
+    return (100.0 * (points[..., 1:] - points[..., :-1] ** 2) ** 2 + (1.0 - points[..., :-1]) ** 2).sum(axis = -1)
+
+
+def sbxSpread(rand, beta, eta):
+    # Коэффициент разброса потомка SBX с учётом расстояния beta до границы (как в tools.cxSimulatedBinaryBounded)
+
+    alpha = 2.0 - beta ** -(eta + 1)
+    return np.where(rand <= 1.0 / alpha,
+                    (rand * alpha) ** (1.0 / (eta + 1)),
+                    (1.0 / (2.0 - rand * alpha)) ** (1.0 / (eta + 1)))
+
+
+def cxSimulatedBinaryBounded(population, first, rng, eta, low, up):
+    # Кроссовер SBX с границами для пар строк (first, first + 1): каждый ген скрещивается с вероятностью 0.5,
+    # если значения родителей различаются
+    # param population: массив популяции (изменяется на месте)
+    # param eta: параметр распределения (больше - потомки ближе к родителям)
+    # param low, up: границы (числа или векторы длины размерности)
+
+    second = first + 1
+    parent1, parent2 = population[first], population[second]
+    low = np.broadcast_to(low, parent1.shape[1:])
+    up = np.broadcast_to(up, parent1.shape[1:])
+
+    x1, x2 = np.minimum(parent1, parent2), np.maximum(parent1, parent2)
+    crossed = (rng.random(parent1.shape) <= 0.5) & (x2 - x1 > 1e-14)
+    distance = np.where(crossed, x2 - x1, 1.0)  # без деления на ноль в нескрещиваемых генах
+
+    rand = rng.random(parent1.shape)
+    with np.errstate(over = 'ignore', invalid = 'ignore', divide = 'ignore'):
+        c1 = 0.5 * (x1 + x2 - sbxSpread(rand, 1.0 + 2.0 * (x1 - low) / distance, eta) * distance)
+        c2 = 0.5 * (x1 + x2 + sbxSpread(rand, 1.0 + 2.0 * (up - x2) / distance, eta) * distance)
+    c1 = np.clip(c1, low, up)
+    c2 = np.clip(c2, low, up)
+
+    # потомки распределяются между строками случайно
+    swap = rng.random(parent1.shape) <= 0.5
+    population[first] = np.where(crossed, np.where(swap, c2, c1), parent1)
+    population[second] = np.where(crossed, np.where(swap, c1, c2), parent2)
+
+
+def mutPolynomialBounded(population, rows, indpb, rng, eta, low, up):
+    # Полиномиальная мутация с границами строк rows: каждый ген мутирует с вероятностью indpb
+    # param population: массив популяции (изменяется на месте)
+    # param eta: параметр распределения (больше - мутанты ближе к исходным значениям)
+    # param low, up: границы (числа или векторы длины размерности)
+
+    x = population[rows]
+    low = np.broadcast_to(low, x.shape[1:])
+    up = np.broadcast_to(up, x.shape[1:])
+
+    mutated = rng.random(x.shape) < indpb
+    rand = rng.random(x.shape)
+    span = up - low
+    power = 1.0 / (eta + 1.0)
+
+    with np.errstate(invalid = 'ignore'):
+        lower = (2.0 * rand + (1.0 - 2.0 * rand) * (1.0 - (x - low) / span) ** (eta + 1)) ** power - 1.0
+        upper = 1.0 - (2.0 * (1.0 - rand) + 2.0 * (rand - 0.5) * (1.0 - (up - x) / span) ** (eta + 1)) ** power
+    delta = np.where(rand < 0.5, lower, upper)
+
+    population[rows] = np.where(mutated, np.clip(x + delta * span, low, up), x)
+
+
+# замер скорости оценки:
+def main():
+    rng = np.random.default_rng(42)
+
+    for name, function, dimension, low, up in (("Химмельблау", himmelblau, 2, -5, 5),
+                                               ("Растригин", rastrigin, 100, -5.12, 5.12),
+                                               ("Розенброк", rosenbrock, 100, -2.048, 2.048)):
+        population = randomPopulation(100000, dimension, low, up, rng)
+        repeats = 10
+
+        start = time.perf_counter()
+        for _ in range(repeats):
+            function(population)
+        elapsed = time.perf_counter() - start
+
+        print("{} (D = {}): {:.1f} млн оценок/с".format(name, dimension, repeats * len(population) / elapsed / 1e6))
+
+
+if __name__ == "__main__":
+    main()
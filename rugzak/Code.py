@@ -6,14 +6,26 @@ from deap import creator
 from deap import tools
 from deap import algorithms
 import random
-import numpy
 import matplotlib.pyplot as plt
 import seaborn as sns
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+import bitgenome
+import fitnesscache
+import selection
+import streamstats
 import knapsack
+import exact
 
 # Константы задачи:
+INSTANCE_FILE = None  # файл экземпляра задачи (.json или .npz); None - 22 предмета RosettaCode
+
 # создаем экземпляр задачи о рюкзаке для использования:
-knapsack = knapsack.Knapsack01Problem()
+if INSTANCE_FILE:
+    knapsack = knapsack.loadProblem(INSTANCE_FILE)
+else:
+    knapsack = knapsack.Knapsack01Problem()
 
 # Константы генетического алгоритма:
 POPULATION_SIZE = 50
@@ -21,6 +33,7 @@ P_CROSSOVER = 0.9  # вероятность кроссовера
 P_MUTATION = 0.1   # вероятность мутации индивида
 MAX_GENERATIONS = 50
 HALL_OF_FAME_SIZE = 1
+CACHE_SIZE = 10000  # количество запоминаемых значений приспособленности
 
 
 # Устанавливаем случайное зерно:
@@ -29,17 +42,14 @@ random.seed(RANDOM_SEED)
 
 toolbox = base.Toolbox()
 
-# создаем оператор, который случайным образом возвращает 0 или 1:
-toolbox.register("zeroOrOne", random.randint, 0, 1)
-
 # определяем стратегию для одной цели, максимизация приспособленности:
 creator.create("FitnessMax", base.Fitness, weights = (1.0,))
 
-# создаем класс Individual на основе списка:
-creator.create("Individual", list, fitness = creator.FitnessMax)
+# создаем класс Individual на основе битовой строки, упакованной по 64 гена в слово:
+creator.create("Individual", bitgenome.PackedBits, fitness = creator.FitnessMax)
 
-# создаем оператор для создания индивидуумов:
-toolbox.register("individualCreator", tools.initRepeat, creator.Individual, toolbox.zeroOrOne, len(knapsack))
+# создаем оператор для создания индивидуумов со случайными генами 0 или 1:
+toolbox.register("individualCreator", bitgenome.randomBits, creator.Individual, len(knapsack))
 
 # создаем оператор для генерации популяции (списка индивидов):
 toolbox.register("populationCreator", tools.initRepeat, list, toolbox.individualCreator)
@@ -52,17 +62,35 @@ def knapsackValue(individual):
 
 toolbox.register("evaluate", knapsackValue)
 
+# Пакетная оценка: подменяет toolbox.map, поэтому цикл eaSimple не меняется, а веса и стоимости
+# всех индивидов с недействительной приспособленностью считаются двумя произведениями матрицы на вектор
+# (решения с превышением веса оцениваются после жадного восстановления):
+def mapValue(evaluate, individuals):
+    if getattr(evaluate, "func", evaluate) is not knapsackValue:
+        return list(map(evaluate, individuals))
+
+    if not individuals:
+        return []
+
+    return [(int(value),) for value in knapsack.getValueBatch(bitgenome.unpackPopulation(individuals))]
+
+toolbox.register("map", mapValue)
+
 # генетические операторы: mutFlipBit
 
 # Турнирный отбор с размером турнира 3:
-toolbox.register("select", tools.selTournament, tournsize = 3)
+toolbox.register("select", selection.selTournament, tournsize = 3)
 
 # Кроссовер с одной точкой:
-toolbox.register("mate", tools.cxTwoPoint)
+toolbox.register("mate", bitgenome.cxTwoPoint)
 
 # Мутация с переворачиванием бита:
 # indpb: независимая вероятность переворота каждого атрибута
-toolbox.register("mutate", tools.mutFlipBit, indpb = 1.0 / len(knapsack))
+toolbox.register("mutate", bitgenome.mutFlipBit, indpb = 1.0 / len(knapsack))
+
+# Кэш приспособленности: потомки, совпадающие с уже оценёнными индивидами, не оцениваются повторно
+cache = fitnesscache.FitnessCache(CACHE_SIZE, toolbox.map, binary = True)
+toolbox.register("map", cache.map)
 
 
 # Поток генетического алгоритма:
@@ -72,9 +100,8 @@ def main():
     population = toolbox.populationCreator(n = POPULATION_SIZE)
 
     # подготавливаем объект статистики:
-    stats = tools.Statistics(lambda ind: ind.fitness.values)
-    stats.register("max", numpy.max)
-    stats.register("avg", numpy.mean)
+    stats = streamstats.FitnessStatistics(("max", "avg"))
+    cache.registerStats(stats)
 
     # определяем объект для зала славы:
     hof = tools.HallOfFame(HALL_OF_FAME_SIZE)
@@ -88,6 +115,11 @@ def main():
     print("-- Лучший индивид за все время = ", best)
     print("-- Лучшее приспособление за все время = ", best.fitness.values[0])
 
+    # сравниваем с точным решением:
+    optimum, _ = exact.solve(knapsack)
+    print("-- Оптимальная стоимость = {}, отклонение = {:.2f}%".format(
+        optimum, 100.0 * (optimum - best.fitness.values[0]) / optimum))
+
     print("-- Предметы для рюкзака = ")
     knapsack.printItems(best)
 
@@ -0,0 +1,116 @@
+# Установите старую версию numpy (например, 1.21.0), где np.bool8 поддерживается:
+# pip install numpy==1.21.0
+
+import sys
+sys.stdout.reconfigure(encoding = 'utf-8')
+
+from deap import base
+from deap import creator
+from deap import tools
+import random
+import time
+import os
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+import bitgenome
+import evolution
+import selection
+import knapsack
+import exact
+
+# Сравнение генетического алгоритма с точным решением: для экземпляров растущего размера
+# замеряется время точного решателя и время, за которое лучшая найденная ГА стоимость
+# впервые отличается от оптимальной не более чем на GAPS процентов
+
+# Размеры экземпляров (количество предметов; 0 - 22 предмета RosettaCode):
+SIZES = [0, 200, 1000, 5000]
+GAPS = [5.0, 1.0, 0.0]  # отклонения от оптимума в процентах
+
+# Константы генетического алгоритма:
+POPULATION_SIZE = 200
+MAX_GENERATIONS = 300
+HALL_OF_FAME_SIZE = 1
+P_CROSSOVER = 0.9
+P_MUTATION = 0.1
+
+RANDOM_SEED = 42
+
+creator.create("FitnessMax", base.Fitness, weights = (1.0,))
+creator.create("Individual", bitgenome.PackedBits, fitness = creator.FitnessMax)
+
+
+def createToolbox(problem):
+    # Создаёт набор операторов генетического алгоритма для данного экземпляра задачи,
+    # как в Code.py, с пакетной оценкой популяции
+
+    toolbox = base.Toolbox()
+    toolbox.register("individualCreator", bitgenome.randomBits, creator.Individual, len(problem))
+    toolbox.register("populationCreator", tools.initRepeat, list, toolbox.individualCreator)
+
+    def knapsackValue(individual):
+        return problem.getValue(individual),
+
+    def mapValue(evaluate, individuals):
+        if not individuals:
+            return []
+        return [(int(value),) for value in problem.getValueBatch(bitgenome.unpackPopulation(individuals))]
+
+    toolbox.register("evaluate", knapsackValue)
+    toolbox.register("map", mapValue)
+    toolbox.register("select", selection.selTournament, tournsize = 3)
+    toolbox.register("mate", bitgenome.cxTwoPoint)
+    toolbox.register("mutate", bitgenome.mutFlipBit, indpb = 1.0 / len(problem))
+
+    return toolbox
+
+
+def benchmark(numOfItems):
+    # Решает экземпляр точно и запускает генетический алгоритм до оптимума или MAX_GENERATIONS поколений
+    # return: словарь с результатами замера (время в секундах, None - отклонение не достигнуто)
+
+    random.seed(RANDOM_SEED)
+    if numOfItems:
+        problem = knapsack.generateProblem(numOfItems, seed = RANDOM_SEED)
+    else:
+        problem = knapsack.Knapsack01Problem()
+
+    start = time.perf_counter()
+    optimum, _ = exact.solve(problem)
+    exactTime = time.perf_counter() - start
+
+    toolbox = createToolbox(problem)
+    population = toolbox.populationCreator(n = POPULATION_SIZE)
+    hof = tools.HallOfFame(HALL_OF_FAME_SIZE)
+
+    # время первого достижения каждого отклонения от оптимума:
+    reached = {gap: None for gap in GAPS}
+
+    def recordGaps(gen, population, halloffame, logbook):
+        best = halloffame.items[0].fitness.values[0]
+        for gap in GAPS:
+            if reached[gap] is None and best >= optimum * (1.0 - gap / 100.0):
+                reached[gap] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    evolution.eaSimpleWithElitism(population, toolbox, cxpb = P_CROSSOVER, mutpb = P_MUTATION,
+                                  ngen = MAX_GENERATIONS, halloffame = hof, verbose = False, hooks = [recordGaps],
+                                  stopCondition = evolution.stopWhenFitnessReaches(optimum))
+    best = hof.items[0].fitness.values[0]
+
+    return {"items": len(problem), "optimum": optimum, "exact": exactTime,
+            "reached": reached, "gap": 100.0 * (optimum - best) / optimum}
+
+
+def main():
+    print("{:>8} {:>10} {:>12} ".format("предметы", "оптимум", "точно, мс") +
+          " ".join("{:>12}".format("ГА {:g}%, мс".format(gap)) for gap in GAPS) + " {:>14}".format("итог. откл., %"))
+
+    for numOfItems in SIZES:
+        result = benchmark(numOfItems)
+        times = " ".join("{:>12.1f}".format(1000 * result["reached"][gap]) if result["reached"][gap] is not None
+                         else "{:>12}".format("-") for gap in GAPS)
+        print("{:>8} {:>10} {:>12.1f} ".format(result["items"], result["optimum"], 1000 * result["exact"]) +
+              times + " {:>14.2f}".format(result["gap"]))
+
+
+if __name__ == "__main__":
+    main()
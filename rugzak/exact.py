@@ -0,0 +1,165 @@
+# Установите старую версию numpy (например, 1.21.0), где np.bool8 поддерживается:
+# pip install numpy==1.21.0
+
+import sys
+sys.stdout.reconfigure(encoding = 'utf-8')
+
+import numpy as np
+
+import knapsack
+
+# Точные решатели задачи о рюкзаке 0-1 (эталон для оценки генетического алгоритма):
+#   solveDP - динамическое программирование по вместимости, один векторный шаг numpy на предмет;
+#   solveBranchAndBound - метод ветвей и границ с оценкой Данцига (для большой вместимости);
+#   solve - выбирает один из них по размеру таблицы динамического программирования.
+# Все решатели возвращают (оптимальная стоимость, массив 0/1 выбранных предметов в исходном порядке).
+#
+#     optimum, selection = exact.solve(knapsack)
+
+MAX_DP_BYTES = 1 << 28  # наибольший размер битового набора решений (или таблицы) для solveDP в solve
+
+
+def dpTableBytes(problem, twoRows = True):
+    # return: объём памяти solveDP для экземпляра задачи в байтах (без двух строк стоимостей)
+    rowBytes = (problem.maxCapacity + 8) // 8 if twoRows else 8 * (problem.maxCapacity + 1)
+    return len(problem) * rowBytes
+
+
+def solveDP(problem, twoRows = True):
+    # Динамическое программирование: best[c] - наибольшая стоимость при весе не больше c.
+    # Для предмета (w, v) новая строка - max(best[c], best[c - w] + v) для всех c сразу.
+    # param twoRows: хранить только две строки стоимостей, а выбор "брать предмет" для каждой вместимости -
+    # битовым набором (1 бит на предмет и вместимость, восстановление ответа по нему);
+    # False - полная таблица стоимостей (8 байт на предмет и вместимость), ответ восстанавливается сравнением строк
+    # return: (оптимальная стоимость, массив 0/1 выбранных предметов)
+
+    capacity = problem.maxCapacity
+    previous = np.zeros(capacity + 1, dtype = np.int64)
+    best = np.zeros(capacity + 1, dtype = np.int64)
+    shifted = np.empty(capacity + 1, dtype = np.int64)
+
+    if twoRows:
+        taken = np.zeros((len(problem), (capacity + 8) // 8), dtype = np.uint8)
+    else:
+        table = np.zeros((len(problem) + 1, capacity + 1), dtype = np.int64)
+
+    for i, (weight, value) in enumerate(zip(problem.weights.tolist(), problem.values.tolist())):
+        previous, best = best, previous
+
+        # стоимость с предметом i: строка, сдвинутая на его вес (при меньшей вместимости предмет не помещается)
+        shifted[:weight] = -1
+        if weight <= capacity:
+            np.add(previous[:capacity + 1 - weight], value, out = shifted[weight:])
+        np.maximum(previous, shifted, out = best)
+
+        if twoRows:
+            taken[i] = np.packbits(shifted > previous, bitorder = 'little')
+        else:
+            table[i + 1] = best
+
+    # восстановление ответа от последнего предмета к первому
+    selection = np.zeros(len(problem), dtype = np.uint8)
+    c = capacity
+    for i in range(len(problem) - 1, -1, -1):
+        if twoRows:
+            isTaken = (taken[i, c >> 3] >> (c & 7)) & 1
+        else:
+            isTaken = table[i + 1, c] != table[i, c]
+        if isTaken:
+            selection[i] = 1
+            c -= int(problem.weights[i])
+
+    return int(best[capacity]), selection
+
+
+def solveBranchAndBound(problem, maxNodes = None):
+    # Метод ветвей и границ: обход в глубину по предметам, упорядоченным по убыванию отношения
+    # стоимости к весу ("брать" раньше "не брать"). Верхняя граница узла - оценка Данцига (дробный рюкзак),
+    # считается двоичным поиском по накопленным весам. Начальное решение - жадное.
+    # Память не зависит от вместимости, поэтому метод подходит для большой вместимости.
+    # param maxNodes: наибольшее количество узлов (None - без ограничения); при достижении
+    # возвращается лучшее найденное решение, оптимальность которого не гарантируется
+    # return: (стоимость, массив 0/1 выбранных предметов)
+
+    capacity = problem.maxCapacity
+    ratio = np.full(len(problem), np.inf)
+    np.divide(problem.values, problem.weights, out = ratio, where = problem.weights > 0)
+    order = np.argsort(-ratio, kind = 'stable')
+
+    weights = problem.weights[order].tolist()
+    values = problem.values[order].tolist()
+    prefixWeights = np.concatenate(([0], np.cumsum(problem.weights[order])))
+    prefixValues = np.concatenate(([0], np.cumsum(problem.values[order]))).tolist()
+    numOfItems = len(weights)
+
+    def upperBound(k, weight, value):
+        # предметы k..j-1 помещаются целиком, от предмета j берётся часть
+        remaining = capacity - weight
+        j = int(np.searchsorted(prefixWeights, prefixWeights[k] + remaining, side = 'right')) - 1
+        bound = value + prefixValues[j] - prefixValues[k]
+        if j < numOfItems:
+            bound += (remaining - int(prefixWeights[j] - prefixWeights[k])) * values[j] / weights[j]
+        return bound
+
+    # жадное начальное решение
+    path = np.zeros(numOfItems, dtype = np.uint8)
+    weight = 0
+    for k in range(numOfItems):
+        if weight + weights[k] <= capacity:
+            path[k] = 1
+            weight += weights[k]
+    bestValue = sum(value for value, isTaken in zip(values, path.tolist()) if isTaken)
+    bestPath = path.copy()
+
+    # узел: (следующий предмет, вес, стоимость, решение по предыдущему предмету);
+    # path[:k] - решения на пути к узлу (предки не изменяются, пока обходится поддерево брата)
+    stack = [(0, 0, 0, None)]
+    numOfNodes = 0
+    while stack and (maxNodes is None or numOfNodes < maxNodes):
+        k, weight, value, decision = stack.pop()
+        numOfNodes += 1
+        if decision is not None:
+            path[k - 1] = decision
+
+        if value > bestValue:
+            bestValue = value
+            bestPath[:k] = path[:k]
+            bestPath[k:] = 0
+
+        if k == numOfItems or upperBound(k, weight, value) <= bestValue:
+            continue
+
+        stack.append((k + 1, weight, value, 0))
+        if weight + weights[k] <= capacity:
+            stack.append((k + 1, weight + weights[k], value + values[k], 1))
+
+    selection = np.zeros(numOfItems, dtype = np.uint8)
+    selection[order] = bestPath
+
+    return int(bestValue), selection
+
+
+def solve(problem, maxDPBytes = MAX_DP_BYTES):
+    # Выбирает точный решатель: динамическое программирование в режиме двух строк, если битовый набор
+    # решений не превышает maxDPBytes, иначе метод ветвей и границ
+    # return: (оптимальная стоимость, массив 0/1 выбранных предметов)
+
+    if dpTableBytes(problem) <= maxDPBytes:
+        return solveDP(problem)
+    return solveBranchAndBound(problem)
+
+
+# тестирование модуля:
+def main():
+    problem = knapsack.Knapsack01Problem()
+
+    for name, solver in (("ДП (две строки)", solveDP), ("ДП (полная таблица)", lambda p: solveDP(p, twoRows = False)),
+                         ("ветви и границы", solveBranchAndBound)):
+        value, selection = solver(problem)
+        print("{}: стоимость = {}, вес = {}".format(name, value, int(selection @ problem.weights)))
+
+    problem.printItems(selection)
+
+
+if __name__ == "__main__":
+    main()
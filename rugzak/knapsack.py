@@ -4,84 +4,214 @@
 import sys
 sys.stdout.reconfigure(encoding = 'utf-8')
 
+import json
 import numpy as np
 
-class Knapsack01Problem:
-    # Этот класс инкапсулирует задачу о рюкзаке 0-1 с сайта RosettaCode.org
-    
-    def __init__(self):
-        # инициализация переменных экземпляра:
-        self.items = []
-        self.maxCapacity = 0
+# предметы задачи о рюкзаке 0-1 с сайта RosettaCode.org: (название, вес, стоимость)
+ROSETTA_ITEMS = [
+    ("map", 9, 150),
+    ("compass", 13, 35),
+    ("water", 153, 200),
+    ("sandwich", 50, 160),
+    ("glucose", 15, 60),
+    ("tin", 68, 45),
+    ("banana", 27, 60),
+    ("apple", 39, 40),
+    ("cheese", 23, 30),
+    ("beer", 52, 10),
+    ("suntan cream", 11, 70),
+    ("camera", 32, 30),
+    ("t-shirt", 24, 15),
+    ("trousers", 48, 10),
+    ("umbrella", 73, 40),
+    ("waterproof trousers", 42, 70),
+    ("waterproof overclothes", 43, 75),
+    ("note-case", 22, 80),
+    ("sunglasses", 7, 20),
+    ("towel", 18, 12),
+    ("socks", 4, 50),
+    ("book", 30, 10)
+]
+ROSETTA_CAPACITY = 400
+
+REPAIR_CHUNK_SIZE = 1 << 22  # количество элементов в одной части матрицы накопленных весов при восстановлении
+
 
-        # инициализация данных:
-        self.__initData()
+class Knapsack01Problem:
+    # Этот класс инкапсулирует задачу о рюкзаке 0-1 (по умолчанию - экземпляр с сайта RosettaCode.org)
+
+    def __init__(self, weights = None, values = None, maxCapacity = None, names = None):
+        # param weights, values: веса и стоимости предметов (по умолчанию - 22 предмета RosettaCode)
+        # param maxCapacity: максимальный суммарный вес
+        # param names: названия предметов (по умолчанию item0, item1, ...)
+        # Экземпляры большего размера можно загрузить из файла (loadProblem) или сгенерировать (generateProblem)
+
+        if weights is None:
+            names = [item for item, weight, value in ROSETTA_ITEMS]
+            weights = [weight for item, weight, value in ROSETTA_ITEMS]
+            values = [value for item, weight, value in ROSETTA_ITEMS]
+            maxCapacity = ROSETTA_CAPACITY if maxCapacity is None else maxCapacity
+
+        self.weights = np.asarray(weights, dtype = np.int64)
+        self.values = np.asarray(values, dtype = np.int64)
+        self.maxCapacity = int(maxCapacity)
+        self.names = list(names) if names is not None else ["item{}".format(i) for i in range(len(self.weights))]
+
+        if self.weights.ndim != 1 or self.weights.shape != self.values.shape or len(self.names) != len(self.weights):
+            raise ValueError("Веса, стоимости и названия должны быть заданы для каждого предмета")
+        if (self.weights < 0).any():
+            raise ValueError("Веса предметов должны быть неотрицательными")
+
+        # порядок удаления предметов при восстановлении: от худшего отношения стоимости к весу
+        # (предметы нулевого веса не удаляются - это не уменьшает вес)
+        ratio = np.full(len(self.weights), np.inf)
+        np.divide(self.values, self.weights, out = ratio, where = self.weights > 0)
+        self.repairOrder = np.argsort(ratio, kind = 'stable')
 
     def __len__(self):
         # return: общее количество предметов, определённых в задаче
-        
-        return len(self.items)
-
-    def __initData(self):
-        # инициализирует данные задачи о рюкзаке 0-1 с сайта RosettaCode.org
-        
-        self.items = [
-            ("map", 9, 150),
-            ("compass", 13, 35),
-            ("water", 153, 200),
-            ("sandwich", 50, 160),
-            ("glucose", 15, 60),
-            ("tin", 68, 45),
-            ("banana", 27, 60),
-            ("apple", 39, 40),
-            ("cheese", 23, 30),
-            ("beer", 52, 10),
-            ("suntan cream", 11, 70),
-            ("camera", 32, 30),
-            ("t-shirt", 24, 15),
-            ("trousers", 48, 10),
-            ("umbrella", 73, 40),
-            ("waterproof trousers", 42, 70),
-            ("waterproof overclothes", 43, 75),
-            ("note-case", 22, 80),
-            ("sunglasses", 7, 20),
-            ("towel", 18, 12),
-            ("socks", 4, 50),
-            ("book", 30, 10)
-        ]
-
-        self.maxCapacity = 400
+
+        return len(self.weights)
+
+    def getWeightsAndValues(self, population):
+        # Рассчитывает суммарный вес и стоимость выбранных предметов для всей популяции
+        # двумя произведениями матрицы на вектор
+        # param population: двумерный массив (или список решений) 0/1 размера (размер популяции, len(self))
+        # return: (массив весов, массив стоимостей)
+
+        population = np.asarray(population, dtype = np.uint8)
+        if population.ndim != 2 or population.shape[1] != len(self):
+            raise ValueError("Размер списка решения должен быть равен ", len(self))
+
+        return population @ self.weights, population @ self.values
+
+    def getRepairMask(self, population, totalWeights):
+        # Жадное восстановление: у решений с превышением максимального веса удаляются выбранные предметы
+        # с наименьшим отношением стоимости к весу, пока вес не станет допустимым. Для всех решений
+        # сразу: накопленный вес выбранных предметов в порядке удаления сравнивается с превышением веса
+        # param population: двумерный массив 0/1
+        # param totalWeights: суммарные веса решений
+        # return: (индексы недопустимых решений, маска удаляемых предметов для каждого из них)
+
+        rows = np.flatnonzero(totalWeights > self.maxCapacity)
+        drop = np.zeros((len(rows), len(self)), dtype = bool)
+
+        chunkSize = max(1, REPAIR_CHUNK_SIZE // max(len(self), 1))
+        for start in range(0, len(rows), chunkSize):
+            part = rows[start:start + chunkSize]
+            selectedWeights = population[part][:, self.repairOrder] * self.weights[self.repairOrder]
+            excess = totalWeights[part] - self.maxCapacity
+            weightBefore = np.cumsum(selectedWeights, axis = 1) - selectedWeights
+            drop[start:start + chunkSize, self.repairOrder] = (selectedWeights > 0) & (weightBefore < excess[:, np.newaxis])
+
+        return rows, drop
+
+    def getValueBatch(self, population):
+        # Рассчитывает стоимость сразу для всей популяции; решения с превышением максимального веса
+        # оцениваются после жадного восстановления (сами решения не изменяются)
+        # param population: двумерный массив (или список решений) 0/1 размера (размер популяции, len(self))
+        # return: массив с рассчитанной стоимостью для каждого решения
+
+        population = np.asarray(population, dtype = np.uint8)
+        totalWeights, totalValues = self.getWeightsAndValues(population)
+
+        rows, drop = self.getRepairMask(population, totalWeights)
+        if len(rows):
+            totalValues[rows] -= drop @ self.values
+
+        return totalValues
+
+    def repairBatch(self, population):
+        # Восстанавливает недопустимые решения на месте (тем же жадным удалением, что и в getValueBatch)
+        # param population: двумерный массив numpy 0/1
+        # return: та же популяция
+
+        totalWeights, _ = self.getWeightsAndValues(population)
+        rows, drop = self.getRepairMask(population, totalWeights)
+        if len(rows):
+            population[rows] &= ~drop
+
+        return population
 
     def getValue(self, zeroOneList):
-        # Рассчитывает стоимость выбранных предметов в списке, игнорируя предметы, которые приведут к превышению максимального веса
+        # Рассчитывает стоимость выбранных предметов в списке; если максимальный вес превышен,
+        # предметы с наименьшим отношением стоимости к весу не учитываются
         # param zeroOneList: список значений 0/1, соответствующих списку предметов задачи. '1' означает, что предмет выбран.
         # return: рассчитанная стоимость
-        
-        totalWeight = totalValue = 0
 
-        for i in range(len(zeroOneList)):
-            item, weight, value = self.items[i]
-            if totalWeight + weight <= self.maxCapacity:
-                totalWeight += zeroOneList[i] * weight
-                totalValue += zeroOneList[i] * value
-        return totalValue
+        return int(self.getValueBatch([zeroOneList])[0])
 
     def printItems(self, zeroOneList):
-        # Выводит выбранные предметы из списка, игнорируя предметы, которые приведут к превышению максимального веса
+        # Выводит выбранные предметы из списка, не учитывая предметы, удаляемые восстановлением
         # param zeroOneList: список значений 0/1, соответствующих списку предметов задачи. '1' означает, что предмет выбран.
-        
-        totalWeight = totalValue = 0
 
-        for i in range(len(zeroOneList)):
-            item, weight, value = self.items[i]
-            if totalWeight + weight <= self.maxCapacity:
-                if zeroOneList[i] > 0:
-                    totalWeight += weight
-                    totalValue += value
-                    print("- Добавление {}: вес = {}, стоимость = {}, накопленный вес = {}, накопленная стоимость = {}".format(item, weight, value, totalWeight, totalValue))
+        selection = self.repairBatch(np.array([zeroOneList], dtype = np.uint8))[0]
+
+        totalWeight = totalValue = 0
+        for i in np.flatnonzero(selection):
+            item, weight, value = self.names[i], int(self.weights[i]), int(self.values[i])
+            totalWeight += weight
+            totalValue += value
+            print("- Добавление {}: вес = {}, стоимость = {}, накопленный вес = {}, накопленная стоимость = {}".format(item, weight, value, totalWeight, totalValue))
         print("- Общий вес = {}, Общая стоимость = {}".format(totalWeight, totalValue))
 
 
+def loadProblem(path):
+    # Загружает экземпляр задачи из файла JSON или NPZ с ключами weights, values, maxCapacity
+    # и (необязательно) names
+    # param path: путь к файлу (.json или .npz)
+    # return: экземпляр Knapsack01Problem
+
+    if str(path).endswith(".npz"):
+        with np.load(path) as data:
+            instance = {key: data[key] for key in data.files}
+        instance["maxCapacity"] = int(instance["maxCapacity"])
+        if "names" in instance:
+            instance["names"] = instance["names"].tolist()
+    else:
+        with open(path, encoding = 'utf-8') as file:
+            instance = json.load(file)
+
+    return Knapsack01Problem(**instance)
+
+
+def saveProblem(problem, path):
+    # Сохраняет экземпляр задачи в файл JSON или NPZ (формат выбирается по расширению)
+    # param problem: экземпляр Knapsack01Problem
+    # param path: путь к файлу (.json или .npz)
+
+    if str(path).endswith(".npz"):
+        np.savez_compressed(path, weights = problem.weights, values = problem.values,
+                            maxCapacity = np.array(problem.maxCapacity), names = np.array(problem.names, dtype = str))
+    else:
+        instance = {
+            "weights": problem.weights.tolist(),
+            "values": problem.values.tolist(),
+            "maxCapacity": problem.maxCapacity,
+            "names": problem.names,
+        }
+        with open(path, "w", encoding = 'utf-8') as file:
+            json.dump(instance, file, ensure_ascii = False)
+
+
+def generateProblem(numOfItems, capacityRatio = 0.5, maxWeight = 100, seed = None):
+    # Генерирует синтетический экземпляр задачи произвольного размера: веса и стоимости случайны
+    # и слабо коррелированы, максимальный вес - доля capacityRatio от суммарного веса всех предметов
+    # param numOfItems: количество предметов
+    # param capacityRatio: доля суммарного веса, помещающаяся в рюкзак
+    # param maxWeight: наибольший вес (и базовая стоимость) предмета
+    # param seed: начальное значение генератора случайных чисел
+    # return: экземпляр Knapsack01Problem
+
+    rng = np.random.default_rng(seed)
+
+    weights = rng.integers(1, maxWeight + 1, size = numOfItems)
+    values = np.maximum(1, weights + rng.integers(-maxWeight // 10, maxWeight // 10 + 1, size = numOfItems))
+    maxCapacity = int(capacityRatio * weights.sum())
+
+    return Knapsack01Problem(weights, values, maxCapacity)
+
+
 # тестирование класса:
 def main():
     # создаем экземпляр задачи:
@@ -0,0 +1,112 @@
+# Установите старую версию numpy (например, 1.21.0), где np.bool8 поддерживается:
+# pip install numpy==1.21.0
+
+import sys
+sys.stdout.reconfigure(encoding = 'utf-8')
+
+import random
+import numpy as np
+
+# Операторы отбора над непрерывным вектором приспособленности. Функции tournament, roulette,
+# stochasticUniversal и truncation получают вектор взвешенной приспособленности wvalues
+# (значения, умноженные на вес цели, как Fitness.wvalues: больше - лучше и для FitnessMin, и для FitnessMax)
+# и возвращают массив индексов отобранных индивидов, поэтому потомки собираются одной выборкой
+# population[indices] (см. matrixga). Для популяций DEAP есть замены операторов tools.sel*:
+#
+#     toolbox.register("select", selection.selTournament, tournsize = 3)
+
+
+def tournament(wvalues, k, tournsize, rng):
+    # Турнирный отбор: для каждого из k мест выбирается лучший из tournsize случайных индивидов
+    # param wvalues: вектор взвешенной приспособленности
+    # param rng: генератор numpy.random.Generator
+    # return: массив индексов отобранных индивидов
+
+    aspirants = rng.integers(0, len(wvalues), size = (k, tournsize))
+    winners = np.argmax(wvalues[aspirants], axis = 1)
+    return aspirants[np.arange(k), winners]
+
+
+def selectionWeights(wvalues):
+    # Приводит взвешенную приспособленность к неотрицательным долям для пропорционального отбора.
+    # Неотрицательные значения (максимизация) используются как есть, как в tools.selRoulette;
+    # иначе (минимизация, wvalues = -значение) они сдвигаются на минимум: доля худшего равна нулю.
+    # return: вектор долей, сумма которых равна 1
+
+    weights = np.asarray(wvalues, dtype = float)
+    if weights.min() < 0:
+        weights = weights - weights.min()
+
+    total = weights.sum()
+    if total <= 0:  # все индивиды равны - равномерный отбор
+        return np.full(len(weights), 1.0 / len(weights))
+
+    return weights / total
+
+
+def roulette(wvalues, k, rng):
+    # Пропорциональный отбор (рулетка): k независимых вращений
+    # return: массив индексов отобранных индивидов
+
+    cumulative = np.cumsum(selectionWeights(wvalues))
+    indices = np.searchsorted(cumulative, rng.random(k) * cumulative[-1], side = 'right')
+    return np.minimum(indices, len(cumulative) - 1)
+
+
+def stochasticUniversal(wvalues, k, rng):
+    # Стохастическая универсальная выборка: k равноотстоящих указателей со случайным сдвигом,
+    # доли отобранных индивидов ближе к ожидаемым, чем у рулетки
+    # return: массив индексов отобранных индивидов
+
+    cumulative = np.cumsum(selectionWeights(wvalues))
+    pointers = (rng.random() + np.arange(k)) * (cumulative[-1] / k)
+    indices = np.searchsorted(cumulative, pointers, side = 'right')
+    return np.minimum(indices, len(cumulative) - 1)
+
+
+def truncation(wvalues, k, rng, fraction = 0.5):
+    # Отбор усечением: k индивидов выбираются случайно среди лучшей доли fraction популяции
+    # return: массив индексов отобранных индивидов
+
+    numOfParents = max(1, int(round(len(wvalues) * fraction)))
+    best = np.argpartition(-np.asarray(wvalues), numOfParents - 1)[:numOfParents]
+    return best[rng.integers(0, numOfParents, size = k)]
+
+
+def wvaluesArray(individuals, objective = 0):
+    # Собирает взвешенную приспособленность популяции DEAP в вектор
+    # param objective: номер цели
+    # return: массив numpy размера len(individuals)
+
+    return np.fromiter((ind.fitness.wvalues[objective] for ind in individuals), dtype = float,
+                       count = len(individuals))
+
+
+def randomGenerator():
+    # Генератор numpy, засеянный из модуля random: сценарии с random.seed() остаются воспроизводимыми
+    return np.random.default_rng(random.getrandbits(64))
+
+
+def gather(individuals, indices):
+    # Собирает отобранных индивидов по массиву индексов одной выборкой
+    return [individuals[i] for i in indices.tolist()]
+
+
+def selTournament(individuals, k, tournsize):
+    # Замена tools.selTournament: турнир проводится над вектором приспособленности
+    return gather(individuals, tournament(wvaluesArray(individuals), k, tournsize, randomGenerator()))
+
+
+def selRoulette(individuals, k):
+    # Замена tools.selRoulette, работающая и для минимизации
+    return gather(individuals, roulette(wvaluesArray(individuals), k, randomGenerator()))
+
+
+def selStochasticUniversalSampling(individuals, k):
+    # Замена tools.selStochasticUniversalSampling, работающая и для минимизации
+    return gather(individuals, stochasticUniversal(wvaluesArray(individuals), k, randomGenerator()))
+
+
+def selTruncation(individuals, k, fraction = 0.5):
+    # Отбор усечением для популяции DEAP
+    return gather(individuals, truncation(wvaluesArray(individuals), k, randomGenerator(), fraction))
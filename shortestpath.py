@@ -0,0 +1,226 @@
+# Установите старую версию numpy (например, 1.21.0), где np.bool8 поддерживается:
+# pip install numpy==1.21.0
+
+import sys
+sys.stdout.reconfigure(encoding = 'utf-8')
+
+import heapq
+import numpy as np
+
+# Задача о кратчайших путях из одной вершины для генетического алгоритма (Min S.py). Хромосома - массив
+# (V, V): строка n - перестановка вершин, путь к вершине n идёт из стартовой вершины по строке до первого
+# вхождения n. Стоимость хромосомы - сумма длин путей ко всем вершинам; для популяции она считается
+# выборкой длин рёбер (предыдущая вершина, следующая вершина) и маской "до позиции цели" сразу для всех строк.
+# Граф задаётся плотной матрицей расстояний или разреженной структурой CSRGraph (отсутствующее ребро - штраф).
+#
+#     problem = shortestpath.ShortestPathProblem(D, startVertex = 0)
+#     costs = problem.getCostBatch(population)            # population - массив (размер популяции, V, V)
+#     optimum = problem.getOptimalCost()                  # точное значение по алгоритму Дейкстры
+
+EVALUATION_CHUNK_SIZE = 1 << 24  # наибольшее количество рёбер, выбираемых за один шаг getCostBatch
+
+
+class CSRGraph:
+    # Разреженный взвешенный граф в формате CSR: рёбра вершины u - indices[indptr[u]:indptr[u + 1]]
+    # (по возрастанию) с длинами weights[indptr[u]:indptr[u + 1]]
+
+    def __init__(self, numOfVertices, indptr, indices, weights):
+        self.numOfVertices = numOfVertices
+        self.indptr = np.asarray(indptr, dtype = np.int64)
+        self.indices = np.asarray(indices, dtype = np.int64)
+        self.weights = np.asarray(weights, dtype = float)
+
+        # ключ ребра u * V + v; ключи отсортированы, поэтому длины рёбер находятся двоичным поиском
+        sources = np.repeat(np.arange(numOfVertices), np.diff(self.indptr))
+        self.edgeKeys = sources * numOfVertices + self.indices
+
+    def __len__(self):
+        # return: количество вершин
+        return self.numOfVertices
+
+    @classmethod
+    def fromEdges(cls, numOfVertices, sources, targets, weights, symmetric = True):
+        # Строит граф по спискам рёбер (при повторах ребра остаётся наименьшая длина)
+        # param symmetric: добавить обратное ребро для каждого ребра (неориентированный граф)
+
+        sources, targets = np.asarray(sources, dtype = np.int64), np.asarray(targets, dtype = np.int64)
+        weights = np.asarray(weights, dtype = float)
+        if symmetric:
+            sources, targets = np.concatenate((sources, targets)), np.concatenate((targets, sources))
+            weights = np.concatenate((weights, weights))
+
+        order = np.lexsort((weights, targets, sources))
+        sources, targets, weights = sources[order], targets[order], weights[order]
+        keys = sources * numOfVertices + targets
+        first = np.concatenate(([True], keys[1:] != keys[:-1]))  # для повторов - первое (самое короткое)
+        sources, targets, weights = sources[first], targets[first], weights[first]
+
+        indptr = np.concatenate(([0], np.cumsum(np.bincount(sources, minlength = numOfVertices))))
+        return cls(numOfVertices, indptr, targets, weights)
+
+    @classmethod
+    def fromDense(cls, matrix, missing = np.inf):
+        # Строит граф по плотной матрице расстояний
+        # param missing: значение матрицы, означающее отсутствие ребра (диагональ тоже не хранится)
+
+        matrix = np.asarray(matrix, dtype = float)
+        present = (matrix != missing) & ~np.eye(len(matrix), dtype = bool)
+        sources, targets = np.nonzero(present)
+        return cls.fromEdges(len(matrix), sources, targets, matrix[sources, targets], symmetric = False)
+
+    def getWeights(self, sources, targets, missingPenalty):
+        # Длины рёбер для массивов начал и концов (любой формы): ребро из вершины в неё саму - 0,
+        # отсутствующее ребро - missingPenalty
+
+        keys = sources * self.numOfVertices + targets
+        positions = np.minimum(np.searchsorted(self.edgeKeys, keys), max(len(self.edgeKeys) - 1, 0))
+        found = self.edgeKeys[positions] == keys if len(self.edgeKeys) else np.zeros(keys.shape, dtype = bool)
+
+        weights = np.where(found, self.weights[positions] if len(self.weights) else 0.0, missingPenalty)
+        weights[sources == targets] = 0.0
+
+        return weights
+
+
+def dijkstra(graph, startVertex):
+    # Алгоритм Дейкстры с двоичной кучей по графу CSRGraph
+    # return: массив кратчайших расстояний от startVertex (np.inf - вершина недостижима)
+
+    distances = np.full(len(graph), np.inf)
+    distances[startVertex] = 0.0
+    indptr, indices, weights = graph.indptr.tolist(), graph.indices.tolist(), graph.weights.tolist()
+
+    heap = [(0.0, startVertex)]
+    while heap:
+        distance, u = heapq.heappop(heap)
+        if distance > distances[u]:
+            continue
+        for k in range(indptr[u], indptr[u + 1]):
+            candidate = distance + weights[k]
+            if candidate < distances[indices[k]]:
+                distances[indices[k]] = candidate
+                heapq.heappush(heap, (candidate, indices[k]))
+
+    return distances
+
+
+class ShortestPathProblem:
+    # Этот класс инкапсулирует задачу о кратчайших путях из стартовой вершины до всех вершин графа
+
+    def __init__(self, graph, startVertex = 0, missingPenalty = None):
+        # param graph: плотная матрица расстояний (V, V) или CSRGraph
+        # param startVertex: стартовая вершина
+        # param missingPenalty: длина отсутствующего ребра. Для CSRGraph по умолчанию - сумма длин всех рёбер
+        # (больше длины любого простого пути); для плотной матрицы - значение её элементов, означающее
+        # отсутствие ребра (по умолчанию np.inf), алгоритм Дейкстры такие элементы не использует
+
+        self.startVertex = startVertex
+
+        if isinstance(graph, CSRGraph):
+            self.graph = graph
+            self.distances = None
+            self.missingPenalty = float(graph.weights.sum() + 1) if missingPenalty is None else missingPenalty
+        else:
+            self.distances = np.asarray(graph, dtype = float)
+            self.graph = None
+            self.missingPenalty = np.inf if missingPenalty is None else missingPenalty
+
+    def __len__(self):
+        # return: количество вершин
+        return len(self.graph) if self.graph is not None else len(self.distances)
+
+    def getEdgeWeights(self, sources, targets):
+        # Длины рёбер выборкой из матрицы расстояний или из CSRGraph
+        if self.graph is not None:
+            return self.graph.getWeights(sources, targets, self.missingPenalty)
+        return self.distances[sources, targets]
+
+    def getCostBatch(self, population):
+        # Рассчитывает стоимость сразу для всей популяции: для каждой строки - длины рёбер
+        # (стартовая вершина или предыдущая вершина строки, следующая вершина), сложенные до позиции цели строки
+        # param population: массив (или список хромосом) размера (размер популяции, V, V)
+        # return: массив с рассчитанной стоимостью для каждой хромосомы
+
+        population = np.asarray(population, dtype = np.int64)
+        numOfVertices = len(self)
+        if population.ndim != 3 or population.shape[1:] != (numOfVertices, numOfVertices):
+            raise ValueError("Размер хромосомы должен быть равен ", (numOfVertices, numOfVertices))
+
+        targets = np.arange(numOfVertices)
+        positions = np.arange(numOfVertices)
+        costs = np.empty(len(population))
+
+        chunkSize = max(1, EVALUATION_CHUNK_SIZE // (numOfVertices * numOfVertices))
+        for start in range(0, len(population), chunkSize):
+            paths = population[start:start + chunkSize]
+
+            previous = np.empty_like(paths)
+            previous[:, :, 0] = self.startVertex
+            previous[:, :, 1:] = paths[:, :, :-1]
+
+            # позиция цели n в строке n и маска рёбер пути до неё включительно:
+            targetPositions = np.argmax(paths == targets[None, :, None], axis = 2)
+            onPath = positions[None, None, :] <= targetPositions[:, :, None]
+
+            costs[start:start + chunkSize] = np.where(onPath, self.getEdgeWeights(previous, paths), 0).sum(axis = (1, 2))
+
+        return costs
+
+    def getCost(self, individual):
+        # Рассчитывает стоимость одной хромосомы
+        # param individual: массив (или список строк) размера (V, V)
+        # return: рассчитанная стоимость
+
+        return float(self.getCostBatch([individual])[0])
+
+    def getShortestDistances(self):
+        # return: кратчайшие расстояния от стартовой вершины (алгоритм Дейкстры)
+        graph = self.graph if self.graph is not None else CSRGraph.fromDense(self.distances, self.missingPenalty)
+        return dijkstra(graph, self.startVertex)
+
+    def getOptimalCost(self):
+        # return: наименьшая возможная стоимость хромосомы - сумма кратчайших расстояний до всех вершин
+        return float(self.getShortestDistances().sum())
+
+
+def randomGraph(numOfVertices, degree = 4, maxWeight = 10, seed = None):
+    # Генерирует связный неориентированный граф: цепочка через все вершины и случайные рёбра до средней степени
+    # degree (модель дорожной сети для замеров)
+    # return: CSRGraph
+
+    rng = np.random.default_rng(seed)
+    order = rng.permutation(numOfVertices)
+    numOfExtra = max(0, numOfVertices * degree // 2 - (numOfVertices - 1))
+
+    sources = np.concatenate((order[:-1], rng.integers(0, numOfVertices, size = numOfExtra)))
+    targets = np.concatenate((order[1:], rng.integers(0, numOfVertices, size = numOfExtra)))
+    keep = sources != targets
+    weights = rng.integers(1, maxWeight + 1, size = len(sources))
+
+    return CSRGraph.fromEdges(numOfVertices, sources[keep], targets[keep], weights[keep])
+
+
+# тестирование модуля:
+def main():
+    inf = 100
+    D = ((0, 3, 1, 3, inf, inf),
+         (3, 0, 4, inf, inf, inf),
+         (1, 4, 0, inf, 7, 5),
+         (3, inf, inf, 0, inf, 2),
+         (inf, inf, 7, inf, 0, 4),
+         (inf, inf, 5, 2, 4, 0))
+
+    dense = ShortestPathProblem(D, missingPenalty = inf)
+    sparse = ShortestPathProblem(CSRGraph.fromDense(D, missing = inf), missingPenalty = inf)
+
+    population = np.array([[np.random.permutation(len(D)) for _ in range(len(D))] for _ in range(1000)])
+    print("Стоимости совпадают = ", np.array_equal(dense.getCostBatch(population), sparse.getCostBatch(population)))
+    print("Кратчайшие расстояния = ", dense.getShortestDistances())
+    print("Оптимум = ", dense.getOptimalCost(), ", лучшая случайная хромосома = ", dense.getCostBatch(population).min())
+
+    road = ShortestPathProblem(randomGraph(2000, seed = 42))
+    print("Граф из 2000 вершин: оптимум = ", road.getOptimalCost())
+
+
+if __name__ == "__main__":
+    main()
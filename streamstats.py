@@ -0,0 +1,143 @@
+# Установите старую версию numpy (например, 1.21.0), где np.bool8 поддерживается:
+# pip install numpy==1.21.0
+
+import sys
+sys.stdout.reconfigure(encoding = 'utf-8')
+
+import numpy as np
+
+import selection
+
+# Статистика поколения по вектору приспособленности. Замена tools.Statistics(lambda ind: ind.fitness.values):
+# значения собираются сразу в массив numpy (без списка кортежей), min/max/avg/std считаются по нему,
+# а распределение хранится гистограммой с фиксированными интервалами - в журнале O(поколения x интервалы)
+# чисел, а не приспособленность каждого индивида. Квантили оцениваются по гистограмме.
+#
+#     stats = streamstats.FitnessStatistics(("min", "avg"), bins = 50, range = (0, 100), quantiles = (0.5,))
+#     population, logbook = evolution.eaSimpleWithElitism(population, toolbox, ..., stats = stats)
+#     histograms = np.array(logbook.select("hist"))  # (поколения, интервалы), границы - stats.edges
+#
+# Объект подключается везде, где ожидается tools.Statistics: eaSimple, eaSimpleWithElitism, matrixga
+# (там compile получает сам вектор приспособленности), FitnessCache.registerStats.
+
+MOMENTS = ("min", "max", "avg", "std")
+
+
+def fitnessArray(data, objective = 0):
+    # Приспособленность популяции в виде вектора
+    # param data: список индивидов DEAP или уже готовый вектор приспособленности (популяция-массив matrixga)
+    # return: массив numpy.float64
+
+    if isinstance(data, np.ndarray):
+        return data.astype(float, copy = False).reshape(len(data), -1)[:, objective]
+
+    # Fitness.values вычисляются делением wvalues на вес - делим один раз весь вектор
+    return selection.wvaluesArray(data, objective) / data[0].fitness.weights[objective]
+
+
+def quantileName(q):
+    # Имя поля журнала для квантили: 0.5 -> "q50", 0.05 -> "q5"
+    return "q{:g}".format(100 * q)
+
+
+class FitnessStatistics:
+    # Статистика приспособленности одной цели с гистограммой фиксированных интервалов
+
+    def __init__(self, fields = ("min", "avg"), bins = None, range = None, quantiles = (), objective = 0):
+        # param fields: вычисляемые моменты из MOMENTS (min, max, avg, std)
+        # param bins: количество интервалов гистограммы (None - без гистограммы и квантилей)
+        # param range: (нижняя, верхняя) граница гистограммы; None - по нулевому поколению.
+        # Значения за границами попадают в крайние интервалы
+        # param quantiles: оцениваемые по гистограмме квантили (доли от 0 до 1), поля журнала q50 и т.п.
+        # param objective: номер цели
+
+        unknown = [field for field in fields if field not in MOMENTS]
+        if unknown:
+            raise ValueError("неизвестные поля статистики: {}".format(unknown))
+        if quantiles and not bins:
+            raise ValueError("квантили оцениваются по гистограмме - задайте bins")
+
+        self.moments = tuple(fields)
+        self.bins = bins
+        self.range = range
+        self.quantiles = tuple(quantiles)
+        self.objective = objective
+        self.edges = None
+        self.functions = {}
+
+        # при заданных границах интервалы известны сразу (общие для всех копий объекта, например островов)
+        if bins and range is not None:
+            self.setEdges(*range)
+
+        # гистограмма записывается в журнал полем hist, но в заголовок (печатаемые столбцы) не входит
+        self.fields = list(self.moments) + [quantileName(q) for q in self.quantiles]
+
+    def register(self, name, function):
+        # Добавляет поле, вычисляемое функцией от вектора приспособленности (как tools.Statistics.register)
+        self.functions[name] = function
+        self.fields.append(name)
+
+    def setEdges(self, low, high):
+        # Задаёт границы bins равных интервалов от low до high
+        if high <= low:
+            high = low + 1.0
+        self.edges = np.linspace(low, high, self.bins + 1)
+
+    def histogram(self, values):
+        # Распределяет значения по фиксированным интервалам
+        # return: количество значений в каждом интервале
+
+        if self.edges is None:
+            self.setEdges(values.min(), values.max())
+
+        low, high = self.edges[0], self.edges[-1]
+        indices = ((values - low) * (self.bins / (high - low))).astype(np.int64)
+        np.clip(indices, 0, self.bins - 1, out = indices)
+
+        return np.bincount(indices, minlength = self.bins)
+
+    def estimateQuantiles(self, counts, low, high):
+        # Оценивает квантили по гистограмме линейной интерполяцией внутри интервала
+        # param low, high: наименьшее и наибольшее значения (оценки не выходят за них)
+
+        cumulative = np.cumsum(counts)
+        targets = np.asarray(self.quantiles) * cumulative[-1]
+        bins = np.minimum(np.searchsorted(cumulative, targets), self.bins - 1)
+        before = cumulative[bins] - counts[bins]
+        fraction = (targets - before) / np.maximum(counts[bins], 1)
+        estimates = self.edges[bins] + fraction * (self.edges[bins + 1] - self.edges[bins])
+
+        return np.clip(estimates, low, high)
+
+    def compile(self, data):
+        # Вычисляет запись журнала для одного поколения
+        # param data: список индивидов или вектор приспособленности
+        # return: словарь поле -> значение
+
+        values = fitnessArray(data, self.objective)
+        record = {}
+
+        low = values.min()
+        high = values.max()
+        mean = values.mean()
+        for field in self.moments:
+            if field == "min":
+                record[field] = low
+            elif field == "max":
+                record[field] = high
+            elif field == "avg":
+                record[field] = mean
+            else:
+                deviations = values - mean
+                record[field] = np.sqrt(np.dot(deviations, deviations) / len(values))
+
+        if self.bins:
+            counts = self.histogram(values)
+            record["hist"] = counts
+            for q, estimate in zip(self.quantiles, self.estimateQuantiles(counts, low, high)):
+                record[quantileName(q)] = estimate
+
+        for name, function in self.functions.items():
+            record[name] = function(values)
+
+        return record